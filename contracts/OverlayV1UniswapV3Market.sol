@@ -1,28 +1,17 @@
 // SPDX-License-Identifier: MIT
 pragma solidity ^0.8.7;
 
-import "./libraries/FixedPoint.sol";
 import "./libraries/UniswapV3OracleLibrary/UniswapV3OracleLibraryV2.sol";
 import "./interfaces/IUniswapV3Pool.sol";
-import "./market/OverlayV1Market.sol";
-import "./libraries/UniswapV3OracleLibrary/TickMath.sol";
+import "./market/OverlayV1UniswapV3BaseMarket.sol";
 
-contract OverlayV1UniswapV3Market is OverlayV1Market {
-
-    using FixedPoint for uint256;
-
-    uint256 internal X96 = 0x1000000000000000000000000;
-
-    uint256 public immutable macroWindow; // window size for main TWAP
-    uint256 public immutable microWindow; // window size for bid/ask TWAP
+contract OverlayV1UniswapV3Market is OverlayV1UniswapV3BaseMarket {
 
     address public immutable marketFeed;
-    address public immutable ovlFeed;
     address public immutable base;
     address public immutable quote;
     uint128 internal immutable baseAmount;
 
-    address internal immutable eth;
     bool internal immutable ethIs0;
 
     constructor(
@@ -35,25 +24,18 @@ contract OverlayV1UniswapV3Market is OverlayV1Market {
         uint256 _macroWindow,
         uint256 _microWindow,
         uint256 _priceFrameCap
-    ) OverlayV1Market (
-        _mothership
-    ) OverlayV1Comptroller (
-        _microWindow
-    ) OverlayV1OI (
-        _microWindow
-    ) OverlayV1PricePoint (
+    ) OverlayV1UniswapV3BaseMarket (
+        _mothership,
+        _ovlFeed,
+        _eth,
+        _macroWindow,
+        _microWindow,
         _priceFrameCap
     ) {
 
-        require(_microWindow < _macroWindow, "OVLV1:micro>=macro");
-
         // immutables
-        eth = _eth;
-        ovlFeed = _ovlFeed;
         marketFeed = _marketFeed;
         baseAmount = _baseAmount;
-        macroWindow = _macroWindow;
-        microWindow = _microWindow;
 
         address _token0 = IUniswapV3Pool(_marketFeed).token0();
         address _token1 = IUniswapV3Pool(_marketFeed).token1();
@@ -70,7 +52,7 @@ contract OverlayV1UniswapV3Market is OverlayV1Market {
             uint32(0)
         );
 
-        _pricePoints.push(PricePoint(
+        pushPricePoint(0, PricePoint(
             _tick,
             _tick,
             0
@@ -89,12 +71,18 @@ contract OverlayV1UniswapV3Market is OverlayV1Market {
 
 
     /// @notice Reads the current price and depth information
-    /// @dev Reads price and depth of market feed
+    /// @dev Reads price and depth of market feed. Depth is priced in OVL
+    /// with the cached OVL price until ovlPricePeriod has passed.
+    /// @param _feed Index of the feed, the market feed is feed 0
     /// @return price_ Price point
-    function fetchPricePoint () public view override returns (
+    function fetchPricePoint (
+        uint _feed
+    ) public view override returns (
         PricePoint memory price_
     ) {
 
+        require(_feed == 0, "OVLV1:!feed");
+
         int56[] memory _ticks;
         uint160[] memory _liqs;
 
@@ -116,33 +104,12 @@ contract OverlayV1UniswapV3Market is OverlayV1Market {
 
             _microTick = int24((_ticks[0] - _ticks[1]) / int56(int32(int(microWindow))));
 
-            uint _sqrtPrice = TickMath.getSqrtRatioAtTick(_microTick);
-
-            uint _liquidity = (uint160(microWindow) << 128) / ( _liqs[0] - _liqs[1] );
-
-            _marketLiquidity = ethIs0
-                ? ( uint256(_liquidity) << 96 ) / _sqrtPrice
-                : FullMath.mulDiv(uint256(_liquidity), _sqrtPrice, X96);
+            _marketLiquidity = liquidityInEth(_microTick, _liqs[0] - _liqs[1], ethIs0);
 
         }
 
 
-        {
-
-            uint32[] memory _secondsAgo = new uint32[](2);
-
-            _secondsAgo[1] = uint32(macroWindow);
-
-            ( _ticks, ) = IUniswapV3Pool(ovlFeed).observe(_secondsAgo);
-
-            _ovlPrice = OracleLibraryV2.getQuoteAtTick(
-                int24((_ticks[0] - _ticks[1]) / int56(int32(int(macroWindow)))),
-                1e18,
-                ovl,
-                eth
-            );
-
-        }
+        _ovlPrice = currentOvlPrice();
 
         price_ = PricePoint(
             _microTick,
@@ -153,52 +120,14 @@ contract OverlayV1UniswapV3Market is OverlayV1Market {
     }
 
 
-    /// @notice Arithmetic to get depth
-
-    /// @dev Derived from constant product formula X*Y=K and tailored
-    /// to Uniswap V3 selective liquidity provision.
-    /// @param _marketLiquidity Amount of liquidity in market in ETH terms.
-    /// @param _ovlPrice Price of OVL against ETH.
-    /// @return depth_ Depth criteria for market in OVL terms.
-    function computeDepth (
-        uint _marketLiquidity,
-        uint _ovlPrice
-    ) public override view returns (
-        uint depth_
-    ) {
-
-        depth_ = ((_marketLiquidity * 1e18) / _ovlPrice)
-            .mulUp(lmbda)
-            .divDown(2e18);
-
-    }
-
     function _tickToPrice (
+        uint,
         int24 _tick
     ) internal override view returns (
         uint quote_
     ) {
 
-        uint160 sqrtRatioX96 = TickMath.getSqrtRatioAtTick(_tick);
-
-        // better precision if no overflow when squared
-        if (sqrtRatioX96 <= type(uint128).max) {
-
-            uint256 ratioX192 = uint256(sqrtRatioX96) * sqrtRatioX96;
-
-            quote_ = base < quote
-                ? FullMath.mulDiv(ratioX192, baseAmount, 1 << 192)
-                : FullMath.mulDiv(1 << 192, baseAmount, ratioX192);
-
-        } else {
-
-            uint256 ratioX128 = FullMath.mulDiv(sqrtRatioX96, sqrtRatioX96, 1 << 64);
-
-            quote_ = base < quote
-                ? FullMath.mulDiv(ratioX128, baseAmount, 1 << 128)
-                : FullMath.mulDiv(1 << 128, baseAmount, ratioX128);
-
-        }
+        quote_ = quoteAtTick(_tick, baseAmount, base < quote);
 
     }
 
@@ -48,4 +48,57 @@ contract UniswapV3Listener {
 
     }
 
+    /// @notice TWAP ticks over each of several windows ending now
+    /// @dev Reads all the windows with a single observe of the pool
+    /// @param _windows Lengths of the windows in seconds
+    /// @return ticks_ Time-weighted average tick over each window
+    function see_ticks (
+        uint32[] memory _windows
+    ) public view returns (
+        int24[] memory ticks_
+    ) {
+
+        ticks_ = OracleLibraryV2.consultWindows(uniV3Pool, _windows);
+
+    }
+
+    /// @notice TWAP ticks and quotes over each of several windows ending now
+    /// @dev Reads all the windows with a single observe of the pool
+    /// @param _windows Lengths of the windows in seconds
+    /// @param _amountIn Amount of base to quote
+    /// @param _base Token quoted in the other token of the pool
+    /// @return ticks_ Time-weighted average tick over each window
+    /// @return quotes_ Quote of the amount in at each tick
+    function listen_windows (
+        uint32[] memory _windows,
+        uint _amountIn,
+        address _base
+    ) public view returns (
+        int24[] memory ticks_,
+        uint[] memory quotes_
+    ) {
+
+        ticks_ = OracleLibraryV2.consultWindows(uniV3Pool, _windows);
+
+        bool _baseIs0 = _base == token0;
+
+        address _baseToken = _baseIs0 ? token0 : token1;
+        address _quoteToken = _baseIs0 ? token1 : token0;
+
+        uint len = _windows.length;
+        quotes_ = new uint[](len);
+
+        for (uint i = 0; i < len; i++) {
+
+            quotes_[i] = OracleLibraryV2.getQuoteAtTick(
+                ticks_[i],
+                uint128(_amountIn),
+                _baseToken,
+                _quoteToken
+            );
+
+        }
+
+    }
+
 }
@@ -11,24 +11,21 @@ import "../interfaces/IOverlayToken.sol";
 
 contract OverlayV1OVLCollateral is ERC1155Supply {
 
-    event log(string k, uint v);
-    event log_addr(string k, address v);
-
     using Position for Position.Info;
     using FixedPoint for uint256;
 
     bytes32 constant private GOVERNOR = keccak256("GOVERNOR");
 
-    mapping (address => mapping(uint => uint)) internal currentBlockPositionsLong;
-    mapping (address => mapping(uint => uint)) internal currentBlockPositionsShort;
-    mapping (address => MarketInfo) public marketInfo;
+    // market info by market and feed index
+    mapping (address => mapping (uint => MarketInfo)) public marketInfo;
     struct MarketInfo {
         uint marginMaintenance;
         uint marginRewardRate;
         uint maxLeverage;
     }
 
-    Position.Info[] public positions;
+    // positions by id, see positionId
+    mapping (uint => Position.Info) public positions;
 
     IOverlayV1Mothership public immutable mothership;
     IOverlayToken immutable public ovl;
@@ -38,6 +35,7 @@ contract OverlayV1OVLCollateral is ERC1155Supply {
 
     event Build(
         address market,
+        uint256 feed,
         uint256 positionId,
         uint256 oi,
         uint256 debt
@@ -45,6 +43,7 @@ contract OverlayV1OVLCollateral is ERC1155Supply {
 
     event Unwind(
         address market,
+        uint256 feed,
         uint256 positionId,
         uint256 oi,
         uint256 debt
@@ -71,7 +70,6 @@ contract OverlayV1OVLCollateral is ERC1155Supply {
 
     /**
       @notice Constructor method
-      @dev  Creates a `Position.Info` struct and appends it to `positions` array to track them
       @param _uri Unique Resource Identifier of a token
       @param _mothership OverlayV1Mothership contract address
      */
@@ -84,70 +82,65 @@ contract OverlayV1OVLCollateral is ERC1155Supply {
 
         ovl = IOverlayV1Mothership(_mothership).ovl();
 
-        positions.push(Position.Info({
-            market: address(0),
-            isLong: false,
-            leverage: 0,
-            pricePoint: 0,
-            oiShares: 0,
-            debt: 0,
-            cost: 0
-        }));
-
     }
 
     /**
-      @notice Sets market information
+      @notice Sets market information for a market feed
       @dev Only the Governor can set market info
       @dev Adds market information to the `marketInfo` mapping
       @param _market Overlay Market contract address
+      @param _feed Index of the market feed, 0 for single feed markets
       @param _marginMaintenance maintenance margin
       @param _marginRewardRate margin reward rate
       @param _maxLeverage maximum leverage amount
       */
     function setMarketInfo (
         address _market,
+        uint _feed,
         uint _marginMaintenance,
         uint _marginRewardRate,
         uint _maxLeverage
     ) external onlyGovernor {
 
 
-        marketInfo[_market].marginMaintenance = _marginMaintenance;
-        marketInfo[_market].marginRewardRate = _marginRewardRate;
-        marketInfo[_market].maxLeverage = _maxLeverage;
+        marketInfo[_market][_feed].marginMaintenance = _marginMaintenance;
+        marketInfo[_market][_feed].marginRewardRate = _marginRewardRate;
+        marketInfo[_market][_feed].maxLeverage = _maxLeverage;
 
         // TODO: Fire and event when new market info is set - yes
 
     }
 
     function marginMaintenance(
-        address _market
+        address _market,
+        uint _feed
     ) external view returns (
         uint marginMaintenance_
     ) {
 
-        marginMaintenance_ = marketInfo[_market].marginMaintenance;
+        marginMaintenance_ = marketInfo[_market][_feed].marginMaintenance;
 
     }
 
     function maxLeverage(
-        address _market
+        address _market,
+        uint _feed
     ) external view returns (
         uint maxLeverage_
     ) {
 
-        maxLeverage_ = marketInfo[_market].maxLeverage;
+        maxLeverage_ = marketInfo[_market][_feed].maxLeverage;
 
     }
 
     function marginRewardRate(
-        address _market
+        address _market,
+        uint _feed
     ) external view returns (
         uint marginRewardRate_
     ) {
 
-        marginRewardRate_ = marketInfo[_market].marginRewardRate;
+        marginRewardRate_ = marketInfo[_market][_feed].marginRewardRate;
 
     }
 
@@ -182,8 +175,41 @@ contract OverlayV1OVLCollateral is ERC1155Supply {
 
     }
 
+    /**
+      @notice Id of the position for a market feed, side, leverage and price
+      @notice point
+      @dev Positions built on the same price point of a market feed with the
+      @dev same side and leverage share an id.
+      @param _market The market of the position
+      @param _feed Index of the market feed of the position
+      @param _isLong Whether the position is long or short
+      @param _leverage The leverage of the position
+      @param _pricePoint Index of the entry price point
+      @return positionId_ Id of the position
+     */
+    function positionId (
+        address _market,
+        uint _feed,
+        bool _isLong,
+        uint _leverage,
+        uint _pricePoint
+    ) public pure returns (
+        uint positionId_
+    ) {
+
+        positionId_ = uint(keccak256(abi.encode(
+            _market,
+            _feed,
+            _isLong,
+            _leverage,
+            _pricePoint
+        )));
+
+    }
+
     function getCurrentBlockPositionId (
         address _market,
+        uint _feed,
         bool _isLong,
         uint _leverage,
         uint _pricePointNext
@@ -191,54 +217,63 @@ contract OverlayV1OVLCollateral is ERC1155Supply {
         uint positionId_
     ) {
 
-        mapping(uint=>uint) storage _currentBlockPositions = _isLong
-            ? currentBlockPositionsLong[_market]
-            : currentBlockPositionsShort[_market];
-
-        positionId_ = _currentBlockPositions[_leverage];
+        positionId_ = positionId(_market, _feed, _isLong, _leverage, _pricePointNext);
 
         Position.Info storage position = positions[positionId_];
 
-        // In a block, which is now the update period (past it was longer)
-        // (related to not making 1155 sharable)
-        // Looks into mapping to see what the position ID of the current
-        // leverage is. Given this leverage and market, is there a current
-        // position being built in the course of this block because that is the
-        // only scenario where the price point would be equal to what we
-        // currently have for the price point
-        // False: if there is a position being built in the same update period
-        // (current block only)
-        // price point of that position would be the price point that has
-        // already been updated and will be updated no more on the market
-        // not smae block then pricepointNext will be greater than prior
-        // position price point - > push new one onto stack
-        if  (position.pricePoint < _pricePointNext) {
-
-            positions.push(Position.Info({
-                market: _market,
-                isLong: _isLong,
-                leverage: _leverage,
-                pricePoint: _pricePointNext,
-                oiShares: 0,
-                debt: 0,
-                cost: 0
-            }));
-
-            positionId_ = positions.length - 1;
-
-            _currentBlockPositions[_leverage] = positionId_;
+        // the first build on this price point initializes the position,
+        // later builds in the same block add to it
+        if (position.market == address(0)) {
+
+            position.market = _market;
+            position.feed = _feed;
+            position.isLong = _isLong;
+            position.leverage = _leverage;
+            position.pricePoint = _pricePointNext;
 
         }
 
     }
 
 
+    /**
+      @notice Build a position on feed 0 of a market, the only feed of
+      @notice single feed markets
+      @dev See build on a market feed
+      @param _market The address of the desired market to interact with
+      @param _collateral The amount of OVL to use as collateral in the position
+      @param _leverage The amount of leverage to use in the position
+      @param _isLong Whether to take out a position on the long or short side
+      @return positionId_ Id of the built position for on chain convenience
+     */
+    function build (
+        address _market,
+        uint256 _collateral,
+        uint256 _leverage,
+        bool _isLong,
+        uint256 _oiMinimum
+    ) external returns (
+        uint positionId_
+    ) {
+
+        positionId_ = build(
+            _market,
+            0,
+            _collateral,
+            _leverage,
+            _isLong,
+            _oiMinimum
+        );
+
+    }
+
     /**
       @notice Build a position on Overlay with OVL collateral
       @dev This interacts with an Overlay Market to register oi and hold
       positions on behalf of users.
       @dev Build event emitted
       @param _market The address of the desired market to interact with
+      @param _feed Index of the market feed to build on
       @param _collateral The amount of OVL to use as collateral in the position
       @param _leverage The amount of leverage to use in the position
       @param _isLong Whether to take out a position on the long or short side
@@ -246,18 +281,21 @@ contract OverlayV1OVLCollateral is ERC1155Supply {
      */
     function build (
         address _market,
+        uint256 _feed,
         uint256 _collateral,
         uint256 _leverage,
         bool _isLong,
         uint256 _oiMinimum
-    ) external returns (
+    ) public returns (
         uint positionId_
     ) {
 
         require(mothership.marketActive(_market), "OVLV1:!market");
-        require(_leverage <= marketInfo[_market].maxLeverage, "OVLV1:lev>max");
+        require(_leverage <= marketInfo[_market][_feed].maxLeverage, "OVLV1:lev>max");
         require(_leverage != 0, "OVLV1:lev==0");
 
+        // @checkpoint build.start
+
         (   uint _oiAdjusted,
             uint _collateralAdjusted,
             uint _debtAdjusted,
@@ -265,21 +303,25 @@ contract OverlayV1OVLCollateral is ERC1155Supply {
             uint _impact,
             uint _pricePointNext ) = IOverlayV1Market(_market)
                 .enterOI(
+                    _feed,
                     _isLong,
                     _collateral,
                     _leverage
                 );
 
+        // @checkpoint build.enterOI
+
         require(_oiAdjusted >= _oiMinimum, "OVLV1:oi<min");
 
-        uint _positionId = getCurrentBlockPositionId(
+        positionId_ = getCurrentBlockPositionId(
             _market,
+            _feed,
             _isLong,
             _leverage,
             _pricePointNext
         );
 
-        Position.Info storage pos = positions[_positionId];
+        Position.Info storage pos = positions[positionId_];
 
         pos.oiShares += _oiAdjusted;
         pos.cost += _collateralAdjusted;
@@ -287,15 +329,15 @@ contract OverlayV1OVLCollateral is ERC1155Supply {
 
         fees += _fee;
 
-        emit Build(_market, _positionId, _oiAdjusted, _debtAdjusted);
+        emit Build(_market, _feed, positionId_, _oiAdjusted, _debtAdjusted);
 
         ovl.transferFrom(msg.sender, address(this), _collateralAdjusted + _impact + _fee);
 
         ovl.burn(_impact);
 
-        _mint(msg.sender, _positionId, _oiAdjusted, ""); // WARNING: last b/c erc1155 callback
+        _mint(msg.sender, positionId_, _oiAdjusted, ""); // WARNING: last b/c erc1155 callback
 
-        positionId_ = _positionId;
+        // @checkpoint build.mint
 
     }
 
@@ -316,29 +358,39 @@ contract OverlayV1OVLCollateral is ERC1155Supply {
 
         require(0 < pos.oiShares, "OVLV1:liquidated");
 
+        // @checkpoint unwind.start
+
         {
 
         (   uint _oi,
             uint _oiShares,
             uint _priceFrame ) = IOverlayV1Market(pos.market)
                 .exitData(
+                    pos.feed,
                     pos.isLong,
                     pos.pricePoint
                 );
 
+        // @checkpoint unwind.exitData
+
         uint _totalPosShares = pos.oiShares;
 
-        uint _userOiShares = _shares;
-        uint _userNotional = _shares * pos.notional(_oi, _oiShares, _priceFrame) / _totalPosShares;
         uint _userDebt = _shares * pos.debt / _totalPosShares;
         uint _userCost = _shares * pos.cost / _totalPosShares;
         uint _userOi = _shares * pos.oi(_oi, _oiShares) / _totalPosShares;
 
-        emit Unwind(pos.market, _positionId, _userOi, _userDebt);
+        emit Unwind(pos.market, pos.feed, _positionId, _userOi, _userDebt);
+
+        uint _feeAmount;
+        uint _userValueAdjusted;
+
+        {
+
+        uint _userNotional = _shares * pos.notional(_oi, _oiShares, _priceFrame) / _totalPosShares;
 
-        uint _feeAmount = _userNotional.mulUp(mothership.fee());
+        _feeAmount = _userNotional.mulUp(mothership.fee());
 
-        uint _userValueAdjusted = _userNotional - _feeAmount;
+        _userValueAdjusted = _userNotional - _feeAmount;
         if (_userValueAdjusted > _userDebt) {
             _userValueAdjusted -= _userDebt;
         } else {
@@ -347,30 +399,37 @@ contract OverlayV1OVLCollateral is ERC1155Supply {
             _feeAmount = _userNotional > _userDebt ? _userNotional - _userDebt : 0;
         }
 
+        }
+
         fees += _feeAmount; // adds to fee pot, which is transferred on disburse
 
         pos.debt -= _userDebt;
         pos.cost -= _userCost;
-        pos.oiShares -= _userOiShares;
+        pos.oiShares -= _shares;
 
 
         IOverlayV1Market(pos.market).exitOI(
+            pos.feed,
             pos.isLong,
             _userOi,
-            _userOiShares,
+            _shares,
+            pos.pricePoint,
             _userCost < _userValueAdjusted ? _userValueAdjusted - _userCost : 0,
             _userCost < _userValueAdjusted ? 0 : _userCost - _userValueAdjusted
         );
 
-        // mint/burn excess PnL = valueAdjusted - cost
-        if (_userCost < _userValueAdjusted) {
+        // @checkpoint unwind.exitOI
 
+        // mint/burn excess PnL = valueAdjusted - cost, plus the fee so the
+        // fee pot is backed
+        if (_userCost < _userValueAdjusted + _feeAmount) {
 
-            ovl.mint(address(this), _userValueAdjusted - _userCost);
+
+            ovl.mint(address(this), _userValueAdjusted + _feeAmount - _userCost);
 
         } else {
 
-            ovl.burn(_userCost - _userValueAdjusted);
+            ovl.burn(_userCost - _userValueAdjusted - _feeAmount);
 
         }
 
@@ -380,6 +439,8 @@ contract OverlayV1OVLCollateral is ERC1155Supply {
 
         _burn(msg.sender, _positionId, _shares);
 
+        // @checkpoint unwind.settle
+
     }
 
     /**
@@ -398,17 +459,22 @@ contract OverlayV1OVLCollateral is ERC1155Supply {
 
         require(0 < pos.oiShares, "OVLV1:liquidated");
 
+        // @checkpoint liquidate.start
+
         bool _isLong = pos.isLong;
 
         (   uint _oi,
             uint _oiShares,
             uint _priceFrame ) = IOverlayV1Market(pos.market)
                 .exitData(
+                    pos.feed,
                     _isLong,
                     pos.pricePoint
                 );
 
-        MarketInfo memory _marketInfo = marketInfo[pos.market];
+        // @checkpoint liquidate.exitData
+
+        MarketInfo memory _marketInfo = marketInfo[pos.market][pos.feed];
 
         require(pos.isLiquidatable(
             _oi,
@@ -420,13 +486,17 @@ contract OverlayV1OVLCollateral is ERC1155Supply {
         uint _value = pos.value(_oi, _oiShares, _priceFrame);
 
         IOverlayV1Market(pos.market).exitOI(
+            pos.feed,
             _isLong,
             pos.oi(_oi, _oiShares),
             pos.oiShares,
+            pos.pricePoint,
             0,
             pos.cost - _value
         );
 
+        // @checkpoint liquidate.exitOI
+
         pos.oiShares = 0;
         pos.debt = 0;
 
@@ -444,6 +514,8 @@ contract OverlayV1OVLCollateral is ERC1155Supply {
         ovl.burn(pos.cost - _value);
         ovl.transfer(_rewardsTo, _toReward);
 
+        // @checkpoint liquidate.settle
+
     }
 
 
@@ -471,6 +543,7 @@ contract OverlayV1OVLCollateral is ERC1155Supply {
             uint _oiShares,
             uint _priceFrame ) = _market
             .positionInfo(
+                pos.feed,
                 pos.isLong,
                 pos.pricePoint
             );
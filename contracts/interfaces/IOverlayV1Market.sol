@@ -6,8 +6,6 @@ import "../libraries/Position.sol";
 
 interface IOverlayV1Market is IERC1155 {
 
-    event log(string k, uint v);
-
     struct PricePoint {
         uint256 bid;
         uint256 ask;
@@ -21,6 +19,8 @@ interface IOverlayV1Market is IERC1155 {
     function factory () external view returns (address);
 
     function feed () external view returns (address);
+    function ovlFeed () external view returns (address);
+    function marketFeed () external view returns (address);
     function impactWindow () external view returns (uint256);
     function updated () external view returns (uint256);
     function update () external;
@@ -31,6 +31,8 @@ interface IOverlayV1Market is IERC1155 {
 
     function k() external view returns (uint256);
 
+    function feedsLength () external view returns (uint256);
+
     function oi () external view returns (
         uint oiLong_,
         uint oiShort_,
@@ -38,12 +40,35 @@ interface IOverlayV1Market is IERC1155 {
         uint oiShortShares_
     );
 
+    function oi (
+        uint _feed
+    ) external view returns (
+        uint oiLong_,
+        uint oiShort_,
+        uint oiLongShares_,
+        uint oiShortShares_
+    );
+
     function oiLong() external view returns (uint256);
     function oiShort() external view returns (uint256);
     function oiLongShares() external view returns (uint256);
     function oiShortShares() external view returns (uint256);
 
+    function oiLong(uint _feed) external view returns (uint256);
+    function oiShort(uint _feed) external view returns (uint256);
+    function oiLongShares(uint _feed) external view returns (uint256);
+    function oiShortShares(uint _feed) external view returns (uint256);
+
     function oiCap () external view returns (uint256);
+    function depth () external view returns (uint256);
+
+    function oiCap (uint _feed) external view returns (uint256);
+    function depth (uint _feed) external view returns (uint256);
+
+    function ovlPrice () external view returns (uint256);
+    function ovlPriceUpdated () external view returns (uint256);
+    function ovlPricePeriod () external view returns (uint256);
+    function fetchOvlPrice () external view returns (uint256);
 
     function brrrrd () external view returns (int256);
     function pressure (
@@ -67,6 +92,11 @@ interface IOverlayV1Market is IERC1155 {
     function brrrrdWindowMicro() external view returns (uint256);
 
     function getBrrrrd() external view returns (uint256);
+    function brrrrdThen() external view returns (
+        uint time_,
+        uint ying_,
+        uint yang_
+    );
 
     function epochs() external view returns (
         uint compoundings_,
@@ -83,6 +113,11 @@ interface IOverlayV1Market is IERC1155 {
 
     function pricePointNextIndex() external view returns (uint256);
 
+    function pricePointRing() external view returns (uint128);
+    function pricePointRingFrom() external view returns (uint128);
+    function isPricePointReferenced(uint256 _index) external view returns (bool);
+    function isPricePointReferenced(uint256 _feed, uint256 _index) external view returns (bool);
+
     function pricePoints (
         uint256 index
     ) external view returns (
@@ -91,6 +126,15 @@ interface IOverlayV1Market is IERC1155 {
         uint depth_
     );
 
+    function pricePoints (
+        uint256 _feed,
+        uint256 index
+    ) external view returns (
+        uint bid_,
+        uint ask_,
+        uint depth_
+    );
+
     function MAX_FUNDING_COMPOUND() external view returns (uint16);
 
     function addCollateral (
@@ -106,6 +150,7 @@ interface IOverlayV1Market is IERC1155 {
     ) external;
 
     function enterOI (
+        uint _feed,
         bool _isLong,
         uint _collateral,
         uint _leverage
@@ -119,6 +164,7 @@ interface IOverlayV1Market is IERC1155 {
     );
 
     function exitData (
+        uint _feed,
         bool _isLong,
         uint256 _pricePoint
     ) external returns (
@@ -128,14 +174,17 @@ interface IOverlayV1Market is IERC1155 {
     );
 
     function exitOI (
+        uint _feed,
         bool _isLong,
         uint _oi,
         uint _oiShares,
+        uint _pricePoint,
         uint _brrrr,
         uint _antibrrrr
     ) external;
 
     function positionInfo (
+        uint _feed,
         bool _isLong,
         uint _entryIndex
     ) external view returns (
@@ -167,6 +216,14 @@ interface IOverlayV1Market is IERC1155 {
         uint256 _compoundingPeriod
     ) external;
 
+    function setPricePointRing (
+        uint256 _pricePointRing
+    ) external;
+
+    function setOvlPricePeriod (
+        uint256 _ovlPricePeriod
+    ) external;
+
     function setComptrollerParams (
         uint256 _lmbda,
         uint256 _staticCap,
@@ -10,17 +10,16 @@ import "./IOverlayToken.sol";
 
 interface IOverlayV1OVLCollateral is IERC1155 {
 
-    event log(string k, uint v);
-    event log(string k, address v);
-
     event Build(
         address market,
+        uint256 feed,
         uint256 positionId,
         uint256 oi,
         uint256 debt
     );
     event Unwind(
         address market,
+        uint256 feed,
         uint256 positionId,
         uint256 oi,
         uint256 debt
@@ -49,48 +48,48 @@ interface IOverlayV1OVLCollateral is IERC1155 {
     function marginAdjustments (address market) external view returns (uint256 marginAdjustment);
     function supportedMarket (address market) external view returns (bool supported);
 
-    function currentBlockPositionsLong (
-        address market,
-        uint leverage
-    ) external view returns (
-        uint positionId
-    );
-
-    function currentBlockPositionsShort (
+    function positionId (
         address market,
-        uint leverage
-    ) external view returns (
-        uint positionId
+        uint feed,
+        bool isLong,
+        uint leverage,
+        uint pricePoint
+    ) external pure returns (
+        uint positionId_
     );
 
     function positions (uint positionId) external view returns (Position.Info memory);
     function ovl () external view returns (IOverlayToken);
     function mothership () external view returns (IOverlayV1Mothership);
-    function marketInfo(address) external view returns (MarketInfo memory);
+    function marketInfo(address, uint) external view returns (MarketInfo memory);
     function fees () external view returns (uint);
     function liquidations () external view returns (uint);
 
     function setMarketInfo(
         address _market,
+        uint _feed,
         uint _marginMaintenance,
         uint _marginRewardRate,
         uint _maxLeverage
     ) external;
 
     function marginMaintenance(
-        address _market
+        address _market,
+        uint _feed
     ) external view returns (
         uint marginMaintenance_
     );
 
     function marginRewardRate(
-        address _market
+        address _market,
+        uint _feed
     ) external view returns (
         uint marginRewardRate_
     );
 
     function maxLeverage(
-        address _market
+        address _market,
+        uint _feed
     ) external view returns (
         uint maxLeverage_
     );
@@ -112,6 +111,17 @@ interface IOverlayV1OVLCollateral is IERC1155 {
         uint positionId_
     );
 
+    function build(
+        address _market,
+        uint256 _feed,
+        uint256 _collateral,
+        uint256 _leverage,
+        bool _isLong,
+        uint256 _oiAdjustedMinimum
+    ) external returns (
+        uint positionId_
+    );
+
     function unwind(
         uint256 _positionId,
         uint256 _shares
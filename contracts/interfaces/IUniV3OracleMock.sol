@@ -4,7 +4,7 @@ pragma solidity ^0.8.7;
 interface IUniswapV3OracleMock {
 
     struct Shim {
-        uint timestamp;
+        uint32 timestamp;
         uint128 liquidity;
         int24 tick;
         uint16 cardinality;
@@ -20,6 +20,11 @@ interface IUniswapV3OracleMock {
     function token1() external view returns (address);
     function observationsLength() external view returns (uint);
     function loadObservations(Observation[] calldata, Shim[] calldata) external;
+    function loadObservationsPacked(uint[] calldata) external;
+    function indexObservations(uint32) external;
+    function indexStart() external view returns (uint32);
+    function indexInterval() external view returns (uint32);
+    function buckets(uint) external view returns (uint16);
     function shims(uint) external view returns (Shim memory);
     function observations(uint) external view returns (Observation memory);
     function observe(uint32[] calldata) external view returns (int56[] memory, uint160[] memory);
@@ -131,6 +131,26 @@ library FixedPoint {
 
     }
 
+    /**
+     * @dev Returns x^n for a fixed point x and an integer n, rounding up. Computed by repeated squaring, so the
+     * result is exact up to one rounding per multiplication and never below the true value.
+     */
+    function powUpInt(uint256 x, uint256 n) internal pure returns (uint256 z) {
+
+        z = ONE;
+
+        while (n != 0) {
+
+            if (n & 1 != 0) z = mulUp(z, x);
+
+            n >>= 1;
+
+            if (n != 0) x = mulUp(x, x);
+
+        }
+
+    }
+
     /**
      * @dev Returns the complement of a value (1 - x), capped to 0 if x is larger than 1.
      *
@@ -10,6 +10,7 @@ library Position {
 
     struct Info {
         address market; // the market for the position
+        uint feed; // index of the market feed the position is on
         bool isLong; // whether long or short
         uint leverage; // discrete initial leverage amount
         uint pricePoint; // pricePointIndex
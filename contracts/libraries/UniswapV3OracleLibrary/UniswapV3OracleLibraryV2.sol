@@ -41,6 +41,39 @@ library OracleLibraryV2 {
 
     }
 
+    /// @notice Fetches time-weighted average ticks over several windows ending now with a single observe
+    /// @param pool Address of Uniswap V3 pool that we want to observe
+    /// @param windows Lengths of the twap windows in seconds
+    /// @return timeWeightedAverageTicks The time-weighted average tick from (block.timestamp - window) to block.timestamp for each window
+    function consultWindows(
+        address pool,
+        uint32[] memory windows
+    ) internal view returns (int24[] memory timeWeightedAverageTicks) {
+        uint len = windows.length;
+
+        uint32[] memory secondAgos = new uint32[](len + 1);
+        for (uint i = 0; i < len; i++) {
+            require(windows[i] != 0, 'BP');
+            secondAgos[i + 1] = windows[i];
+        }
+
+        (int56[] memory tickCumulatives, ) = IUniswapV3Pool(pool).observe(secondAgos);
+
+        timeWeightedAverageTicks = new int24[](len);
+        for (uint i = 0; i < len; i++) {
+            int56 period = int56(int32(windows[i]));
+            int56 tickCumulativesDelta = tickCumulatives[0] - tickCumulatives[i + 1];
+
+            int24 timeWeightedAverageTick = int24(tickCumulativesDelta / period);
+
+            // Always round to negative infinity
+            if (tickCumulativesDelta < 0 && (tickCumulativesDelta % period != 0)) timeWeightedAverageTick--;
+
+            timeWeightedAverageTicks[i] = timeWeightedAverageTick;
+        }
+
+    }
+
     /// @notice Given a tick and a token amount, calculates the amount of token received in exchange
     /// @param tick Tick value used to calculate the quote
     /// @param baseAmount Amount of token to be converted
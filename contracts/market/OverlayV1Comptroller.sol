@@ -51,6 +51,10 @@ abstract contract OverlayV1Comptroller {
     uint256 public brrrrdExpected;
     uint256 public brrrrdFiling;
 
+    // brrrrd roller at the start of the macro window, memoized for the
+    // block in its time field so the cap skips the roller search
+    Roller public brrrrdThen;
+
     constructor (
         uint256 _impactWindow
     ) {
@@ -96,6 +100,12 @@ abstract contract OverlayV1Comptroller {
             _roller.ying += brrrrdAccumulator[0];
             _roller.yang += brrrrdAccumulator[1];
 
+            if (brrrrdThen.time == _now && movesBrrrrdThen(_roller.time, _lastMoment, _brrrrdCycloid)) {
+
+                brrrrdThen.time = 0;
+
+            }
+
             brrrrdCycloid = roll(brrrrdRollers, _roller, _lastMoment, _brrrrdCycloid);
 
             brrrrdAccumulator[0] = _brrrr;
@@ -115,6 +125,41 @@ abstract contract OverlayV1Comptroller {
 
     }
 
+  /**
+    @notice Whether rolling in a brrrrd roller changes the roller at the
+    @notice start of the macro window
+    @dev The new roller is the window start if it is at or before it. It
+    @dev also changes it if it overwrites the oldest roller while that is
+    @dev the window start, i.e. the next oldest is after the window start.
+    @dev Called by internal contract function: brrrr
+    @param _time Time of the roller being rolled in
+    @param _lastMoment Time of the newest roller
+    @param _cycloid Current brrrrd cycloid
+    @return moves_ Whether the memoized window start roller is stale
+   */
+    function movesBrrrrdThen (
+        uint _time,
+        uint _lastMoment,
+        uint _cycloid
+    ) internal view returns (
+        bool moves_
+    ) {
+
+        uint _now = block.timestamp;
+        uint _window = brrrrdWindowMacro;
+
+        if (_time + _window <= _now) return true;
+
+        uint _slot = _time != _lastMoment ? ( _cycloid + 1 ) % CHORD : _cycloid;
+
+        if (brrrrdRollers[_slot].time <= 1) return false;
+
+        uint _next = brrrrdRollers[( _slot + 1 ) % CHORD].time;
+
+        moves_ = _next <= 1 || _now < _next + _window;
+
+    }
+
   /**
     @dev Called by internal contract function: _oiCap
     @dev Calls internal contract function: scry
@@ -126,12 +171,23 @@ abstract contract OverlayV1Comptroller {
         uint antiBrrrrd_
     ) {
 
-        (  ,Roller memory _rollerNow,
-            Roller memory _rollerThen ) = scry(
-                brrrrdRollers,
-                brrrrdCycloid,
-                brrrrdWindowMacro
-            );
+        Roller memory _rollerNow;
+        Roller memory _rollerThen = brrrrdThen;
+
+        if (_rollerThen.time == block.timestamp) {
+
+            _rollerNow = brrrrdRollers[brrrrdCycloid];
+
+        } else {
+
+            (  ,_rollerNow,
+                _rollerThen ) = scry(
+                    brrrrdRollers,
+                    brrrrdCycloid,
+                    brrrrdWindowMacro
+                );
+
+        }
 
         brrrrd_ = brrrrdAccumulator[0] + _rollerNow.ying - _rollerThen.ying;
 
@@ -140,6 +196,31 @@ abstract contract OverlayV1Comptroller {
     }
 
 
+  /**
+    @notice Memoizes the brrrrd roller at the start of the macro window
+    @dev Later cap reads in the block take it from storage instead of
+    @dev searching the rollers. Invalidated when brrrr rolls in a roller
+    @dev that moves the start of the macro window.
+    @dev Called by OverlayV1Market contract function: enterOI
+    @dev Calls internal contract function: scry
+   */
+    function memoizeBrrrrd () internal {
+
+        if (brrrrdThen.time == block.timestamp) return;
+
+        (  ,,Roller memory _rollerThen ) = scry(
+            brrrrdRollers,
+            brrrrdCycloid,
+            brrrrdWindowMacro
+        );
+
+        _rollerThen.time = block.timestamp;
+
+        brrrrdThen = _rollerThen;
+
+    }
+
+
     /**
       @notice Public function that takes in the open interest and applies
       @notice Overlay's monetary policy.
@@ -164,11 +245,15 @@ abstract contract OverlayV1Comptroller {
         uint impact_
     ) {
 
+        // @checkpoint intake.start
+
         // Call to internal contract function
         (   Roller memory _rollerImpact,
             uint _lastMoment,
             uint _impact ) = _intake(_isLong, _oi, _cap);
 
+        // @checkpoint intake.scry
+
         // Call to internal contract function
         impactCycloid = roll(
             impactRollers,
@@ -177,12 +262,16 @@ abstract contract OverlayV1Comptroller {
             impactCycloid
         );
 
+        // @checkpoint intake.roll
+
         // Call to Math contract function
         impact_ = _oi.mulUp(_impact);
 
         // Call to internal contract function
         brrrr( 0, impact_ );
 
+        // @checkpoint intake.brrrr
+
     }
 
 
@@ -284,13 +373,16 @@ abstract contract OverlayV1Comptroller {
 
 
   /**
-    @notice Public function to compute open interest cap for the market.
+    @notice Public function to compute open interest cap for a feed.
     @dev Calls internal function _oiCap to determine the cap relative to depth
     @dev and dynamic or static
     @dev Calls internal contract function: getBrrrrd, _oiCap
-    @return cap_ The open interest cap for the market
+    @param _feed Index of the feed
+    @return cap_ The open interest cap for the feed
    */
-    function oiCap () public virtual view returns (
+    function oiCap (
+        uint _feed
+    ) public virtual view returns (
         uint cap_
     ) {
 
@@ -314,17 +406,45 @@ abstract contract OverlayV1Comptroller {
 
         // Calls internal contract function
         cap_ = _surpassed ? 0 : _burnt || _expected
-            ? _oiCap(false, depth(), staticCap, 0, 0)
-            : _oiCap(true, depth(), staticCap, _brrrrd, _brrrrdExpected);
+            ? _oiCap(false, depth(_feed), staticCap, 0, 0)
+            : _oiCap(true, depth(_feed), staticCap, _brrrrd, _brrrrdExpected);
 
     }
 
 
   /**
-    @notice The time weighted liquidity of the market feed in OVL terms.
+    @notice Open interest cap for feed 0, the only feed of single feed
+    @notice markets.
+    @return cap_ The open interest cap for the market
+   */
+    function oiCap () public view returns (
+        uint cap_
+    ) {
+
+        cap_ = oiCap(0);
+
+    }
+
+
+  /**
+    @notice The time weighted liquidity of a market feed in OVL terms.
+    @param _feed Index of the feed
     @return depth_ The amount of liquidity in the market feed in OVL terms.
    */
-    function depth () public virtual view returns (uint depth_);
+    function depth (uint _feed) public virtual view returns (uint depth_);
+
+
+  /**
+    @notice The time weighted liquidity of feed 0 in OVL terms.
+    @return depth_ The amount of liquidity in the market feed in OVL terms.
+   */
+    function depth () public view returns (
+        uint depth_
+    ) {
+
+        depth_ = depth(0);
+
+    }
 
   /**
     @notice Performs arithmetic to turn market liquidity into OVL terms.
@@ -112,6 +112,14 @@ abstract contract OverlayV1Governance is
 
     }
 
+    function setPricePointRing (
+        uint256 _pricePointRing
+    ) public onlyGovernor {
+
+        startPricePointRing(_pricePointRing);
+
+    }
+
     function setComptrollerParams (
         uint256 _lmbda,
         uint256 _staticCap,
@@ -126,6 +134,8 @@ abstract contract OverlayV1Governance is
         brrrrdWindowMacro = _brrrrdWindowMacro;
         brrrrdWindowMicro = _brrrrdWindowMicro;
 
+        brrrrdThen.time = 0;
+
     }
 
 }
@@ -21,6 +21,17 @@ abstract contract OverlayV1Market is OverlayV1Governance {
 
     constructor(address _mothership) OverlayV1Governance( _mothership) { }
 
+    /// @notice Number of feeds the market prices
+    /// @dev Each feed keeps its own price points and open interest. Single
+    /// feed markets price on feed 0.
+    function feedsLength () public view virtual returns (
+        uint length_
+    ) {
+
+        length_ = 1;
+
+    }
+
     /**
       @notice Adds open interest to the market
       @dev This is invoked by Overlay collateral manager contracts, which dev
@@ -29,6 +40,7 @@ abstract contract OverlayV1Market is OverlayV1Governance {
       @dev Calls OverlayV1Comptroller contract function: intake
       @dev Calls FixedPoint contract function: mulDown
       @dev Calls OverlayV1OI contract function: addOi
+      @param _feed Index of the feed to enter open interest on
       @param _isLong The side of the market to enter open interest on
       @param _collateral The amount of collateral in OVL terms to take the position out with
       @param _leverage The leverage with which to take out the position
@@ -40,6 +52,7 @@ abstract contract OverlayV1Market is OverlayV1Governance {
       @return pricePointNext_ The index of the price point for the position
      */
     function enterOI (
+        uint _feed,
         bool _isLong,
         uint _collateral,
         uint _leverage
@@ -52,11 +65,24 @@ abstract contract OverlayV1Market is OverlayV1Governance {
         uint pricePointNext_
     ) {
 
+        require(_feed < feedsLength(), "OVLV1:!feed");
+
+        // @checkpoint enterOI.start
+
         // Call to internal function
-        // Updates the market with the latest price, cap, and pay funding
-        uint _cap = update();
+        // Updates the market with the latest price and pay funding
+        update();
 
-        pricePointNext_ = _pricePoints.length - 1;
+        // @checkpoint enterOI.update
+
+        // Call to `OverlayV1Comptroller` contract
+        memoizeBrrrrd();
+
+        uint _cap = oiCap(_feed);
+
+        pricePointNext_ = pricePointNextIndex() - 1;
+
+        // @checkpoint enterOI.cap
 
         // Calculate open interest
         uint _oi = _collateral * _leverage;
@@ -65,6 +91,8 @@ abstract contract OverlayV1Market is OverlayV1Governance {
         // Takes in the OI and applies Overlay's monetary policy
         uint _impact = intake(_isLong, _oi, _cap);
 
+        // @checkpoint enterOI.intake
+
         // Call to `FixedPoint` contract
         fee_ = _oi.mulDown(mothership.fee());
 
@@ -79,7 +107,12 @@ abstract contract OverlayV1Market is OverlayV1Governance {
         debtAdjusted_ = oiAdjusted_ - collateralAdjusted_;
 
         // Call to `OverlayV1OI` contract
-        addOi(_isLong, oiAdjusted_, _cap);
+        addOi(_feed, _isLong, oiAdjusted_, _cap);
+
+        // Call to `OverlayV1PricePoint` contract
+        referencePricePoint(_feed, pricePointNext_, oiAdjusted_);
+
+        // @checkpoint enterOI.addOi
 
     }
 
@@ -89,6 +122,7 @@ abstract contract OverlayV1Market is OverlayV1Governance {
       @dev This is called by the collateral managers to retrieve the necessary
       @dev information to calculate the specifics of each position, for
       @dev instance the PnL or if it is liquidatable.
+      @param _feed Index of the feed the position is on
       @param _isLong Whether the data is being retrieved for a long or short
       @param _pricePoint Index of the initial price point
       @param oi_ Total outstanding open interest on that side of the market
@@ -98,6 +132,7 @@ abstract contract OverlayV1Market is OverlayV1Governance {
       receive the bid on exit and the ask on entry shorts the opposite
      */
     function exitData (
+        uint _feed,
         bool _isLong,
         uint256 _pricePoint
     ) public onlyCollateral returns (
@@ -106,12 +141,18 @@ abstract contract OverlayV1Market is OverlayV1Governance {
         uint priceFrame_
     ) {
 
+        // @checkpoint exitData.start
+
         update();
 
-        if (_isLong) ( oi_ = __oiLong__, oiShares_ = oiLongShares );
-        else ( oi_ = __oiShort__, oiShares_ = oiShortShares );
+        // @checkpoint exitData.update
+
+        if (_isLong) ( oi_ = __oiLong__[_feed], oiShares_ = __oiLongShares__[_feed] );
+        else ( oi_ = __oiShort__[_feed], oiShares_ = __oiShortShares__[_feed] );
+
+        priceFrame_ = priceFrame(_feed, _isLong, _pricePoint);
 
-        priceFrame_ = priceFrame(_isLong, _pricePoint);
+        // @checkpoint exitData.priceFrame
 
     }
 
@@ -121,98 +162,120 @@ abstract contract OverlayV1Market is OverlayV1Governance {
       @dev open interest in OVL terms to remove as well as open interest shares
       @dev to remove. It also registers printing or burning of OVL in the
       @dev process.
+      @param _feed Index of the feed from which to remove open interest
       @param _isLong The side from which to remove open interest
       @param _oi The open interest to remove in OVL terms
       @param _oiShares The open interest shares to remove
+      @param _pricePoint Index of the price point the shares entered at
       @param _brrrr How much was printed on closing the position
       @param _antiBrrrr How much was burnt on closing the position
      */
     function exitOI (
+        uint _feed,
         bool _isLong,
         uint _oi,
         uint _oiShares,
+        uint _pricePoint,
         uint _brrrr,
         uint _antiBrrrr
     ) external onlyCollateral {
 
         brrrr( _brrrr, _antiBrrrr );
 
-        if (_isLong) ( __oiLong__ -= _oi, oiLongShares -= _oiShares );
-        else ( __oiShort__ -= _oi, oiShortShares -= _oiShares );
+        if (_isLong) ( __oiLong__[_feed] -= _oi, __oiLongShares__[_feed] -= _oiShares );
+        else ( __oiShort__[_feed] -= _oi, __oiShortShares__[_feed] -= _oiShares );
+
+        // Call to `OverlayV1PricePoint` contract
+        releasePricePoint(_feed, _pricePoint, _oiShares);
 
     }
 
     /**
-      @notice Updates price, cap, and pay funding.
-      @dev This function updates the market with the latest price and
-      @dev conditionally reads the depth of the market feed. The market needs
-      @dev an update on the first call of any block.
+      @notice Updates price and pays funding.
+      @dev This function updates every feed of the market with its latest
+      @dev price and depth, and pays funding on each feed's open interest on
+      @dev the one funding clock the feeds share. The market needs
+      @dev an update on the first call of any block. Later calls in the
+      @dev block return after reading the updated timestamp, since price and
+      @dev funding are already current. The open interest cap is left to the
+      @dev callers that need it.
       @dev Calls OverlayV1PricePoint contract function: fetchPricePoint
       @dev Calls OverlayV1PricePoint contract function: setPricePointNext
-      @dev Calls OverlayV1PricePoint contract function: pricePointCurrent
       @dev Calls OverlayV1OI contract function: epochs
       @dev Calls OverlayV1OI contract function: payFunding
-      @dev Calls OverlayV1Comptroller contract function: oiCap
-      @return cap_ TODO
      */
-    function update () public virtual returns (
-        uint cap_
-    ) {
+    function update () public virtual {
 
         uint _now = block.timestamp;
-        uint _updated = updated;
 
-        if (_now != _updated) {
+        if (_now == updated) return;
+
+        uint _feeds = feedsLength();
+
+        for (uint _feed = 0; _feed < _feeds; _feed++) {
 
             // Call to `OverlayV1PricePoint` contract
-            PricePoint memory _pricePoint = fetchPricePoint();
+            PricePoint memory _pricePoint = fetchPricePoint(_feed);
+
+            // @checkpoint update.fetchPricePoint
 
             // Call to `OverlayV1PricePoint` contract
-            setPricePointNext(_pricePoint);
+            setPricePointNext(_feed, _pricePoint);
 
-            updated = _now;
+            // @checkpoint update.setPricePointNext
 
         }
 
+        advancePricePoints();
+
+        updated = _now;
+
         // Call to `OverlayV1OI` contract
         (   uint _compoundings,
             uint _tCompounding  ) = epochs(_now, compounded);
 
         if (0 < _compoundings) {
 
+            uint _k = k;
+
             // Call to `OverlayV1OI` contract
-            payFunding(k, _compoundings);
+            for (uint _feed = 0; _feed < _feeds; _feed++) payFunding(_feed, _k, _compoundings);
+
             compounded = _tCompounding;
 
         }
 
-        // Call to `OverlayV1Comptroller` contract
-        cap_ = oiCap();
+        // @checkpoint update.payFunding
 
     }
 
     /**
-      @notice The depth of the market feed in OVL terms at the current block.
+      @notice The depth of a market feed in OVL terms at the current block.
       @dev Returns the time weighted liquidity of the market feed in OVL terms
       @dev at the current block.
+      @param _feed Index of the feed
       @return depth_ The time weighted liquidity in OVL terms.
      */
-    function depth () public view override returns (
+    function depth (
+        uint _feed
+    ) public view override returns (
         uint depth_
     ) {
 
-        ( ,,depth_ )= pricePointCurrent();
+        ( ,,depth_ )= pricePointCurrent(_feed);
 
     }
 
     /// @notice Exposes important info for calculating position metrics.
     /// @dev These values are required to feed to the position calculations.
+    /// @param _feed Index of the feed the position is on.
     /// @param _isLong Whether position is on short or long side of market.
     /// @param _priceEntry Index of entry price
     /// @return oi_ The current open interest on the chosen side.
     /// @return oiShares_ The current open interest shares on the chosen side.
     /// @return priceFrame_ Price frame resulting from e entry and exit prices.
     function positionInfo (
+        uint _feed,
         bool _isLong,
         uint _priceEntry
     ) external view returns (
@@ -226,12 +289,13 @@ abstract contract OverlayV1Market is OverlayV1Governance {
         (   uint _oiLong,
             uint _oiShort,
             uint _oiLongShares,
-            uint _oiShortShares ) = _oi(_compoundings);
+            uint _oiShortShares ) = _oi(_feed, _compoundings);
 
         if (_isLong) ( oi_ = _oiLong, oiShares_ = _oiLongShares );
         else ( oi_ = _oiShort, oiShares_ = _oiShortShares );
 
         priceFrame_ = priceFrame(
+            _feed,
             _isLong,
             _priceEntry
         );
@@ -243,19 +307,21 @@ abstract contract OverlayV1Market is OverlayV1Governance {
     /// @dev Computes the price frame conditionally giving shorts the bid
     /// on entry and ask on exit and longs the bid on exit and short on
     /// entry. Capped at the priceFrameCap for longs.
+    /// @param _feed Index of the feed.
     /// @param _isLong If price frame is for a long or a short.
     /// @param _pricePoint The index of the entry price.
     /// @return priceFrame_ The exit price divided by the entry price.
     function priceFrame (
+        uint _feed,
         bool _isLong,
         uint _pricePoint
     ) internal view returns (
         uint256 priceFrame_
     ) {
 
-        ( uint _entryBid, uint _entryAsk, ) = readPricePoint(_pricePoint);
+        ( uint _entryBid, uint _entryAsk, ) = readPricePoint(_feed, _pricePoint);
 
-        ( uint _exitBid, uint _exitAsk, ) = pricePointCurrent();
+        ( uint _exitBid, uint _exitAsk, ) = pricePointCurrent(_feed);
 
         priceFrame_ = _isLong
             ? Math.min(_exitBid.divDown(_entryAsk), priceFrameCap)
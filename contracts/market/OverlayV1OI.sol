@@ -5,8 +5,6 @@ import "../libraries/FixedPoint.sol";
 
 contract OverlayV1OI {
 
-    event log(string k , uint v);
-
     using FixedPoint for uint256;
 
     uint256 private constant ONE = 1e18;
@@ -14,11 +12,12 @@ contract OverlayV1OI {
     uint256 public compoundingPeriod;
     uint256 public compounded;
 
-    uint256 internal __oiLong__; // total long open interest
-    uint256 internal __oiShort__; // total short open interest
+    // open interest books by feed index, single feed markets book on feed 0
+    mapping(uint256 => uint256) internal __oiLong__; // total long open interest
+    mapping(uint256 => uint256) internal __oiShort__; // total short open interest
 
-    uint256 public oiLongShares; // total shares of long open interest outstanding
-    uint256 public oiShortShares; // total shares of short open interest outstanding
+    mapping(uint256 => uint256) internal __oiLongShares__; // total shares of long open interest outstanding
+    mapping(uint256 => uint256) internal __oiShortShares__; // total shares of short open interest outstanding
 
     uint256 public k;
 
@@ -67,8 +66,10 @@ contract OverlayV1OI {
       @dev Pure function accepting current open interest, compoundings
       @dev to perform, and funding constant.
       @dev oiImbalance(period_m) = oiImbalance(period_now)*(1-2k)**period_m
+      @dev The open interest per share of each side is the funding index
+      @dev positions settle against on exit.
       @dev Called by internal function: payFunding
-      @dev Calls by FixedPoint contract function: mulDown
+      @dev Calls by FixedPoint contract function: mulDown, powUpInt
       @param _oiLong Current open interest on the long side
       @param _oiShort Current open interest on the short side
       @param _epochs The number of compounding periods to compute for
@@ -95,7 +96,7 @@ contract OverlayV1OI {
 
         uint _fundingFactor = ONE.sub(_k.mulUp(ONE*2));
 
-        _fundingFactor = _fundingFactor.powUp(ONE*_epochs);
+        _fundingFactor = _fundingFactor.powUpInt(_epochs);
 
         uint _funder = _oiLong;
         uint _funded = _oiShort;
@@ -127,7 +128,8 @@ contract OverlayV1OI {
 
 
     /**
-      @notice Pays funding.
+      @notice Pays funding on a feed.
+      @param _feed Index of the feed to pay funding on
       @param _k The funding constant
       @param _epochs The number of compounding periods to compute
       @dev Invokes internal computeFunding and sets oiLong and oiShort
@@ -137,6 +139,7 @@ contract OverlayV1OI {
       @return fundingPaid_ Signed integer of how much funding was paid
      */
     function payFunding (
+        uint256 _feed,
         uint256 _k,
         uint256 _epochs
     ) internal returns (
@@ -147,26 +150,28 @@ contract OverlayV1OI {
         uint _oiShort;
 
         ( _oiLong, _oiShort, fundingPaid_ ) = computeFunding(
-            __oiLong__,
-            __oiShort__,
+            __oiLong__[_feed],
+            __oiShort__[_feed],
             _epochs,
             _k
         );
 
-        __oiLong__ = _oiLong;
-        __oiShort__ = _oiShort;
+        __oiLong__[_feed] = _oiLong;
+        __oiShort__[_feed] = _oiShort;
 
         emit FundingPaid(_oiLong, _oiShort, fundingPaid_);
 
     }
 
-    /// @notice Adds open interest to one side
+    /// @notice Adds open interest to one side of a feed
     /// @dev Adds open interest to one side, asserting the cap is not breached.
     /// @dev Called by `OverlayV1Market` function: `enterOI`
+    /// @param _feed Index of the feed to add open interest on.
     /// @param _isLong If open interest is adding to the long or short side.
     /// @param _openInterest Open interest to add.
     /// @param _oiCap Open interest cap to require not to be breached.
     function addOi(
+        uint256 _feed,
         bool _isLong,
         uint256 _openInterest,
         uint256 _oiCap
@@ -174,23 +179,23 @@ contract OverlayV1OI {
 
         if (_isLong) {
 
-            oiLongShares += _openInterest;
+            __oiLongShares__[_feed] += _openInterest;
 
-            uint _oiLong = __oiLong__ + _openInterest;
+            uint _oiLong = __oiLong__[_feed] + _openInterest;
 
             require(_oiLong <= _oiCap, "OVLV1:>cap");
 
-            __oiLong__ = _oiLong;
+            __oiLong__[_feed] = _oiLong;
 
         } else {
 
-            oiShortShares += _openInterest;
+            __oiShortShares__[_feed] += _openInterest;
 
-            uint _oiShort = __oiShort__ + _openInterest;
+            uint _oiShort = __oiShort__[_feed] + _openInterest;
 
             require(_oiShort <= _oiCap, "OVLV1:>cap");
 
-            __oiShort__ = _oiShort;
+            __oiShort__[_feed] = _oiShort;
 
         }
 
@@ -198,12 +203,14 @@ contract OverlayV1OI {
 
     /// @notice Internal function to retrieve up to date open interest.
     /// @dev Computes the current open interest values and returns them.
+    /// @param _feed Index of the feed.
     /// @param _compoundings Number of compoundings yet to be paid in funding.
     /// @return oiLong_ Current open interest on the long side.
     /// @return oiShort_ Current open interest on the short side.
     /// @return oiLongShares_ Current open interest shares on the long side.
     /// @return oiShortShares_ Current open interest shares on the short side.
     function _oi (
+        uint _feed,
         uint _compoundings
     ) internal view returns (
         uint oiLong_,
@@ -212,10 +219,10 @@ contract OverlayV1OI {
         uint oiShortShares_
     ) {
 
-        oiLong_ = __oiLong__;
-        oiShort_ = __oiShort__;
-        oiLongShares_ = oiLongShares;
-        oiShortShares_ = oiShortShares;
+        oiLong_ = __oiLong__[_feed];
+        oiShort_ = __oiShort__[_feed];
+        oiLongShares_ = __oiLongShares__[_feed];
+        oiShortShares_ = __oiShortShares__[_feed];
 
         if (0 < _compoundings) {
 
@@ -230,13 +237,16 @@ contract OverlayV1OI {
 
     }
 
-    /// @notice The current open interest on both sides of the market.
-    /// @dev Returns all up to date open interest data for the market.
+    /// @notice The current open interest on both sides of a feed.
+    /// @dev Returns all up to date open interest data for the feed.
+    /// @param _feed Index of the feed.
     /// @return oiLong_ Current open interest on long side.
     /// @return oiShort_ Current open interest on short side.
     /// @return oiLongShares_ Current open interest shares on the long side.
     /// @return oiShortShares_ Current open interest shares on the short side.
-    function oi () public view returns (
+    function oi (
+        uint _feed
+    ) public view returns (
         uint oiLong_,
         uint oiShort_,
         uint oiLongShares_,
@@ -248,22 +258,85 @@ contract OverlayV1OI {
         (   oiLong_,
             oiShort_,
             oiLongShares_,
-            oiShortShares_ ) = _oi(_compoundings);
+            oiShortShares_ ) = _oi(_feed, _compoundings);
 
     }
 
 
+    /// @notice The current open interest on both sides of the market.
+    /// @dev Open interest of feed 0, the only feed of single feed markets.
+    /// @return oiLong_ Current open interest on long side.
+    /// @return oiShort_ Current open interest on short side.
+    /// @return oiLongShares_ Current open interest shares on the long side.
+    /// @return oiShortShares_ Current open interest shares on the short side.
+    function oi () public view returns (
+        uint oiLong_,
+        uint oiShort_,
+        uint oiLongShares_,
+        uint oiShortShares_
+    ) {
+
+        (   oiLong_,
+            oiShort_,
+            oiLongShares_,
+            oiShortShares_ ) = oi(0);
+
+    }
+
+
+    /// @notice The current open interest on the long side of a feed.
+    /// @param _feed Index of the feed.
+    /// @return oiLong_ The current open interest on the long side.
+    function oiLong (uint _feed) public view returns (uint oiLong_) {
+        (   oiLong_,,, ) = oi(_feed);
+    }
+
+
     /// @notice The current open interest on the long side.
     /// @return oiLong_ The current open interest on the long side.
     function oiLong () external view returns (uint oiLong_) {
-        (   oiLong_,,, ) = oi();
+        oiLong_ = oiLong(0);
+    }
+
+
+    /// @notice The current open interest on the short side of a feed.
+    /// @param _feed Index of the feed.
+    /// @return oiShort_ The current open interest on the short side.
+    function oiShort (uint _feed) public view returns (uint oiShort_) {
+        (  ,oiShort_,, ) = oi(_feed);
     }
 
 
     /// @notice The current open interest on the short side.
     /// @return oiShort_ The current open interest on the short side.
     function oiShort () external view returns (uint oiShort_) {
-        (  ,oiShort_,, ) = oi();
+        oiShort_ = oiShort(0);
+    }
+
+
+    /// @notice Total shares of long open interest outstanding on a feed.
+    /// @param _feed Index of the feed.
+    function oiLongShares (uint _feed) public view returns (uint oiLongShares_) {
+        oiLongShares_ = __oiLongShares__[_feed];
+    }
+
+
+    /// @notice Total shares of long open interest outstanding.
+    function oiLongShares () external view returns (uint oiLongShares_) {
+        oiLongShares_ = __oiLongShares__[0];
+    }
+
+
+    /// @notice Total shares of short open interest outstanding on a feed.
+    /// @param _feed Index of the feed.
+    function oiShortShares (uint _feed) public view returns (uint oiShortShares_) {
+        oiShortShares_ = __oiShortShares__[_feed];
+    }
+
+
+    /// @notice Total shares of short open interest outstanding.
+    function oiShortShares () external view returns (uint oiShortShares_) {
+        oiShortShares_ = __oiShortShares__[0];
     }
 
 }
@@ -23,8 +23,22 @@ abstract contract OverlayV1PricePoint {
 
     uint256 immutable public priceFrameCap;
 
-    // mapping from price point index to realized historical prices
-    PricePoint[] internal _pricePoints;
+    // mapping from feed index to realized historical prices by price point
+    // index, single feed markets price on feed 0. Every feed realizes a
+    // price point on each update, so all series share their indexes.
+    mapping(uint256 => PricePoint[]) internal _pricePoints;
+
+    // ring mode: once pricePointRing is set, price points from index
+    // pricePointRingFrom on are kept in a ring of that many slots
+    uint128 public pricePointRing;
+    uint128 public pricePointRingFrom;
+    uint256 internal _pricePointRingLength;
+
+    // open interest shares entered on each price point of a feed in the
+    // ring, which is checkpointed before the ring overwrites it and freed
+    // once no position holds it
+    mapping(uint256 => mapping(uint256 => uint256)) internal _pricePointReferences;
+    mapping(uint256 => mapping(uint256 => PricePoint)) internal _pricePointCheckpoints;
 
     event NewPricePoint(uint bid, uint ask, uint depth);
 
@@ -41,10 +55,20 @@ abstract contract OverlayV1PricePoint {
 
     }
 
+    /// @notice Reads the current price and depth information of a feed
     /// @dev Called by `OverlayV1Market` contract function: `update`
-    function fetchPricePoint () public view virtual returns (PricePoint memory);
+    function fetchPricePoint (uint _feed) public view virtual returns (PricePoint memory);
 
-    function _tickToPrice (int24 _tick) internal virtual view returns (uint quote_);
+    /// @notice Reads the current price and depth information of feed 0
+    function fetchPricePoint () public view returns (
+        PricePoint memory price_
+    ) {
+
+        price_ = fetchPricePoint(0);
+
+    }
+
+    function _tickToPrice (uint _feed, int24 _tick) internal virtual view returns (uint quote_);
 
 
     /// @notice Get the index of the next price to be realized
@@ -54,29 +78,33 @@ abstract contract OverlayV1PricePoint {
         uint nextIndex_
     ) {
 
-        nextIndex_ = _pricePoints.length;
+        nextIndex_ = pricePointRing == 0
+            ? _pricePoints[0].length
+            : pricePointRingFrom + _pricePointRingLength;
 
     }
 
 
     /**
-      @notice All past price points.
+      @notice All past price points of a feed.
       @dev Returns the price point if it exists.
       @dev Calls internal contract function: readPricePoint
+      @param _feed Index of the feed
       @param _pricePointIndex Index of the price point being queried
       @return bid_ Bid
       @return ask_ Ask
       @return depth_ Market liquidity in OVL terms
      */
     function pricePoints(
+        uint256 _feed,
         uint256 _pricePointIndex
-    ) external view returns (
+    ) public view returns (
         uint256 bid_,
         uint256 ask_,
         uint256 depth_
     ) {
 
-        uint _len = _pricePoints.length;
+        uint _len = pricePointNextIndex();
 
         require(_pricePointIndex <  _len ||
                (_pricePointIndex == _len && updated != block.timestamp),
@@ -84,27 +112,44 @@ abstract contract OverlayV1PricePoint {
 
         if (_pricePointIndex == _len) {
 
-            ( bid_, ask_, depth_ ) = readPricePoint(fetchPricePoint());
+            ( bid_, ask_, depth_ ) = readPricePoint(_feed, fetchPricePoint(_feed));
 
         } else {
 
-            ( bid_, ask_, depth_ ) = readPricePoint(_pricePointIndex);
+            ( bid_, ask_, depth_ ) = readPricePoint(_feed, _pricePointIndex);
 
         }
 
     }
 
 
+    /// @notice All past price points of feed 0
+    function pricePoints(
+        uint256 _pricePointIndex
+    ) external view returns (
+        uint256 bid_,
+        uint256 ask_,
+        uint256 depth_
+    ) {
+
+        ( bid_, ask_, depth_ ) = pricePoints(0, _pricePointIndex);
+
+    }
+
+
     /**
-      @notice Current price point.
+      @notice Current price point of a feed.
       @dev Returns the price point if it exists.
       @dev Called by OverlayV1Market function: _update
       @dev Calls internal contract function: readPricePoint
+      @param _feed Index of the feed
       @return bid_ Bid
       @return ask_ Ask
       @return depth_ Market liquidity in OVL terms
      */
-    function pricePointCurrent () public view returns (
+    function pricePointCurrent (
+        uint _feed
+    ) public view returns (
         uint bid_,
         uint ask_,
         uint depth_
@@ -115,31 +160,47 @@ abstract contract OverlayV1PricePoint {
 
         if (_now != _updated) {
 
-            ( bid_, ask_, depth_ ) = readPricePoint(fetchPricePoint());
+            ( bid_, ask_, depth_ ) = readPricePoint(_feed, fetchPricePoint(_feed));
 
         } else {
 
-            ( bid_, ask_, depth_ ) = readPricePoint(_pricePoints.length - 1);
+            ( bid_, ask_, depth_ ) = readPricePoint(_feed, pricePointNextIndex() - 1);
 
         }
 
     }
 
+
+    /// @notice Current price point of feed 0
+    function pricePointCurrent () public view returns (
+        uint bid_,
+        uint ask_,
+        uint depth_
+    ){
+
+        ( bid_, ask_, depth_ ) = pricePointCurrent(0);
+
+    }
+
     /**
       @notice Allows inheriting contracts to add the latest realized price
+      @notice of a feed
+      @dev Every feed sets its next price point on each update, in feed
+      @dev order, before the series is advanced with advancePricePoints.
       @dev Called by OverlayV1Market contract function: update
       @dev Calls internal contract function: readPricePoint
       @dev Emits NewPricePoint event
      */
     function setPricePointNext(
+        uint _feed,
         PricePoint memory _pricePoint
     ) internal {
 
-        _pricePoints.push(_pricePoint);
+        pushPricePoint(_feed, _pricePoint);
 
         (   uint _bid,
             uint _ask,
-            uint _depth ) = readPricePoint(_pricePoint);
+            uint _depth ) = readPricePoint(_feed, _pricePoint);
 
         emit NewPricePoint(
             _bid,
@@ -150,6 +211,7 @@ abstract contract OverlayV1PricePoint {
     }
 
     function readPricePoint (
+        uint _feed,
         uint _pricePoint
     ) public view returns (
         uint256 bid_,
@@ -157,11 +219,236 @@ abstract contract OverlayV1PricePoint {
         uint256 depth_
     ) {
 
-        return readPricePoint(_pricePoints[_pricePoint]);
+        return readPricePoint(_feed, pricePointAt(_feed, _pricePoint));
+
+    }
+
+    function readPricePoint (
+        uint _pricePoint
+    ) public view returns (
+        uint256 bid_,
+        uint256 ask_,
+        uint256 depth_
+    ) {
+
+        return readPricePoint(0, _pricePoint);
+
+    }
+
+
+    /**
+      @notice Appends a price point to the price point series of a feed
+      @dev In ring mode the oldest price point in the ring is overwritten,
+      @dev after checkpointing it if a position references it.
+      @dev Called by internal contract function: setPricePointNext
+     */
+    function pushPricePoint (
+        uint _feed,
+        PricePoint memory _pricePoint
+    ) internal {
+
+        uint _ring = pricePointRing;
+
+        PricePoint[] storage _series = _pricePoints[_feed];
+
+        if (_ring == 0) {
+
+            _series.push(_pricePoint);
+
+            return;
+
+        }
+
+        uint _from = pricePointRingFrom;
+        uint _length = _pricePointRingLength;
+
+        if (_length < _ring) {
+
+            _series.push(_pricePoint);
+
+        } else {
+
+            uint _slot = _from + _length % _ring;
+            uint _evicted = _from + _length - _ring;
+
+            if (isPricePointReferenced(_feed, _evicted)) {
+
+                _pricePointCheckpoints[_feed][_evicted] = _series[_slot];
+
+            }
+
+            _series[_slot] = _pricePoint;
+
+        }
+
+    }
+
+
+    /**
+      @notice Advances the ring past the price points just pushed
+      @dev Called once per update, after every feed has pushed its price
+      @dev point, so the ring length counts price point indexes.
+      @dev Called by OverlayV1Market contract function: update
+     */
+    function advancePricePoints () internal {
+
+        if (pricePointRing != 0) _pricePointRingLength += 1;
+
+    }
+
+
+    /**
+      @notice Price point at an index of the price point series of a feed
+      @dev Ring mode keeps the latest pricePointRing price points and the
+      @dev checkpoints of ones positions still hold. Other pruned indexes
+      @dev revert.
+      @dev Called by internal contract function: readPricePoint
+      @param _feed Index of the feed
+      @param _index Index of the price point
+      @return pricePoint_ The price point
+     */
+    function pricePointAt (
+        uint _feed,
+        uint _index
+    ) internal view returns (
+        PricePoint memory pricePoint_
+    ) {
+
+        uint _ring = pricePointRing;
+        uint _from = pricePointRingFrom;
+
+        if (_ring == 0 || _index < _from) return _pricePoints[_feed][_index];
+
+        uint _next = _from + _pricePointRingLength;
+
+        require(_index < _next, "OVLV1:!price");
+
+        if (_next - _index <= _ring) {
+
+            pricePoint_ = _pricePoints[_feed][_from + ( _index - _from ) % _ring];
+
+        } else {
+
+            require(isPricePointReferenced(_feed, _index), "OVLV1:pruned");
+
+            pricePoint_ = _pricePointCheckpoints[_feed][_index];
+
+        }
+
+    }
+
+
+    /**
+      @notice Adds the open interest shares of a position entering at a
+      @notice price point to its references
+      @dev Only tracked for price points in the ring, where references keep
+      @dev the price point from being pruned.
+      @dev Called by OverlayV1Market contract function: enterOI
+      @param _feed Index of the feed
+      @param _index Index of the price point
+      @param _oiShares Open interest shares entered at the price point
+     */
+    function referencePricePoint (
+        uint _feed,
+        uint _index,
+        uint _oiShares
+    ) internal {
+
+        if (pricePointRing == 0 || _index < pricePointRingFrom) return;
+
+        _pricePointReferences[_feed][_index] += _oiShares;
+
+    }
+
+
+    /**
+      @notice Removes the open interest shares of a position exiting from
+      @notice its entry price point's references
+      @dev Deletes the price point's checkpoint once the last of them exits.
+      @dev Called by OverlayV1Market contract function: exitOI
+      @param _feed Index of the feed
+      @param _index Index of the price point
+      @param _oiShares Open interest shares exiting from the price point
+     */
+    function releasePricePoint (
+        uint _feed,
+        uint _index,
+        uint _oiShares
+    ) internal {
+
+        uint _ring = pricePointRing;
+        uint _from = pricePointRingFrom;
+
+        if (_ring == 0 || _index < _from) return;
+
+        uint _references = _pricePointReferences[_feed][_index] - _oiShares;
+
+        _pricePointReferences[_feed][_index] = _references;
+
+        if (_references == 0 && _ring < _from + _pricePointRingLength - _index) {
+
+            delete _pricePointCheckpoints[_feed][_index];
+
+        }
+
+    }
+
+
+    function isPricePointReferenced (
+        uint _feed,
+        uint _index
+    ) public view returns (
+        bool referenced_
+    ) {
+
+        referenced_ = _pricePointReferences[_feed][_index] != 0;
+
+    }
+
+
+    function isPricePointReferenced (
+        uint _index
+    ) external view returns (
+        bool referenced_
+    ) {
+
+        referenced_ = isPricePointReferenced(0, _index);
+
+    }
+
+
+    /**
+      @notice Switches the price point series to ring mode
+      @dev Price points before the switch are kept as they are.
+      @dev Called by OverlayV1Governance contract function: setPricePointRing
+      @param _ring Number of price points kept in the ring
+     */
+    function startPricePointRing (
+        uint _ring
+    ) internal {
+
+        require(pricePointRing == 0, "OVLV1:ring");
+        require(0 < _ring && _ring <= type(uint128).max, "OVLV1:!ring");
+
+        pricePointRing = uint128(_ring);
+        pricePointRingFrom = uint128(_pricePoints[0].length);
+
+    }
+
+    function readPricePoint(
+        PricePoint memory _pricePoint
+    ) public view returns (
+        uint256 bid_,
+        uint256 ask_,
+        uint256 depth_
+    ) {
+
+        return readPricePoint(0, _pricePoint);
 
     }
 
     function readPricePoint(
+        uint _feed,
         PricePoint memory _pricePoint
     ) public view returns (
         uint256 bid_,
@@ -169,9 +456,9 @@ abstract contract OverlayV1PricePoint {
         uint256 depth_
     ) {
 
-        uint _microPrice = _tickToPrice(_pricePoint.microTick);
+        uint _microPrice = _tickToPrice(_feed, _pricePoint.microTick);
 
-        uint _macroPrice = _tickToPrice(_pricePoint.macroTick);
+        uint _macroPrice = _tickToPrice(_feed, _pricePoint.macroTick);
 
         uint _spread = pbnj;
 
@@ -0,0 +1,221 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.7;
+
+import "../libraries/FixedPoint.sol";
+import "../libraries/UniswapV3OracleLibrary/UniswapV3OracleLibraryV2.sol";
+import "../interfaces/IUniswapV3Pool.sol";
+import "../libraries/UniswapV3OracleLibrary/TickMath.sol";
+import "./OverlayV1Market.sol";
+
+/// @notice Market on Uniswap V3 feeds with depth priced in OVL
+/// @dev Caches the OVL/ETH price read from the OVL feed for ovlPricePeriod
+/// and holds the tick and liquidity arithmetic the Uniswap V3 markets share.
+abstract contract OverlayV1UniswapV3BaseMarket is OverlayV1Market {
+
+    using FixedPoint for uint256;
+
+    uint256 internal X96 = 0x1000000000000000000000000;
+
+    uint256 public immutable macroWindow; // window size for main TWAP
+    uint256 public immutable microWindow; // window size for bid/ask TWAP
+
+    address public immutable ovlFeed;
+
+    address internal immutable eth;
+
+    uint256 public ovlPricePeriod; // seconds between OVL price reads, zero reads every update
+    uint256 public ovlPriceUpdated; // last time the OVL price was read
+    uint256 public ovlPrice; // OVL/ETH price as of ovlPriceUpdated
+
+    constructor(
+        address _mothership,
+        address _ovlFeed,
+        address _eth,
+        uint256 _macroWindow,
+        uint256 _microWindow,
+        uint256 _priceFrameCap
+    ) OverlayV1Market (
+        _mothership
+    ) OverlayV1Comptroller (
+        _microWindow
+    ) OverlayV1OI (
+        _microWindow
+    ) OverlayV1PricePoint (
+        _priceFrameCap
+    ) {
+
+        require(_microWindow < _macroWindow, "OVLV1:micro>=macro");
+
+        // immutables
+        eth = _eth;
+        ovlFeed = _ovlFeed;
+        macroWindow = _macroWindow;
+        microWindow = _microWindow;
+
+    }
+
+
+    /// @notice Reads the OVL/ETH price from the OVL feed
+    /// @dev Macro window TWAP of the OVL feed
+    /// @return ovlPrice_ Price of one OVL in ETH
+    function fetchOvlPrice () public view returns (
+        uint ovlPrice_
+    ) {
+
+        uint32[] memory _secondsAgo = new uint32[](2);
+
+        _secondsAgo[1] = uint32(macroWindow);
+
+        ( int56[] memory _ticks, ) = IUniswapV3Pool(ovlFeed).observe(_secondsAgo);
+
+        ovlPrice_ = OracleLibraryV2.getQuoteAtTick(
+            int24((_ticks[0] - _ticks[1]) / int56(int32(int(macroWindow)))),
+            1e18,
+            ovl,
+            eth
+        );
+
+    }
+
+
+    /// @notice OVL/ETH price to price depth with
+    /// @dev The cached OVL price until ovlPricePeriod has passed, then the
+    /// OVL feed's.
+    /// @return ovlPrice_ Price of one OVL in ETH
+    function currentOvlPrice () internal view returns (
+        uint ovlPrice_
+    ) {
+
+        ovlPrice_ = ovlPriceUpdated + ovlPricePeriod > block.timestamp
+            ? ovlPrice
+            : fetchOvlPrice();
+
+    }
+
+
+    /// @notice Updates the market, refreshing the cached OVL price first
+    /// @dev The OVL price is read on the first update of a block once
+    /// ovlPricePeriod has passed, and reused by fetchPricePoint until then.
+    function update () public virtual override {
+
+        uint _now = block.timestamp;
+
+        if (_now == updated) return;
+
+        // @checkpoint update.start
+
+        uint _ovlPricePeriod = ovlPricePeriod;
+
+        if (_ovlPricePeriod != 0
+            && ovlPriceUpdated + _ovlPricePeriod <= _now) {
+
+            ovlPrice = fetchOvlPrice();
+            ovlPriceUpdated = _now;
+
+        }
+
+        // @checkpoint update.fetchOvlPrice
+
+        super.update();
+
+    }
+
+
+    /// @notice Sets how often the OVL price is read for depth
+    /// @dev Zero reads the OVL feed on every update
+    /// @param _ovlPricePeriod Seconds between OVL price reads
+    function setOvlPricePeriod (
+        uint256 _ovlPricePeriod
+    ) public onlyGovernor {
+
+        ovlPricePeriod = _ovlPricePeriod;
+
+    }
+
+
+    /// @notice Arithmetic to get depth
+
+    /// @dev Derived from constant product formula X*Y=K and tailored
+    /// to Uniswap V3 selective liquidity provision.
+    /// @param _marketLiquidity Amount of liquidity in market in ETH terms.
+    /// @param _ovlPrice Price of OVL against ETH.
+    /// @return depth_ Depth criteria for market in OVL terms.
+    function computeDepth (
+        uint _marketLiquidity,
+        uint _ovlPrice
+    ) public override view returns (
+        uint depth_
+    ) {
+
+        depth_ = ((_marketLiquidity * 1e18) / _ovlPrice)
+            .mulUp(lmbda)
+            .divDown(2e18);
+
+    }
+
+
+    /// @notice Liquidity of a WETH feed over the micro window in ETH terms
+    /// @param _microTick Micro window TWAP tick of the feed
+    /// @param _secondsPerLiquidity Change of the feed's seconds per
+    /// liquidity cumulative over the micro window
+    /// @param _ethIs0 Whether WETH is token0 of the feed
+    /// @return liquidity_ Feed liquidity in ETH terms
+    function liquidityInEth (
+        int24 _microTick,
+        uint160 _secondsPerLiquidity,
+        bool _ethIs0
+    ) internal view returns (
+        uint liquidity_
+    ) {
+
+        uint _sqrtPrice = TickMath.getSqrtRatioAtTick(_microTick);
+
+        uint _liquidity = (uint160(microWindow) << 128) / _secondsPerLiquidity;
+
+        liquidity_ = _ethIs0
+            ? ( uint256(_liquidity) << 96 ) / _sqrtPrice
+            : FullMath.mulDiv(uint256(_liquidity), _sqrtPrice, X96);
+
+    }
+
+
+    /// @notice Amount of quote for an amount of base at a tick
+    /// @dev Ticks price token1 in token0, so the price is inverted when the
+    /// base is token1.
+    /// @param _tick Tick to price at
+    /// @param _baseAmount Amount of base
+    /// @param _baseIs0 Whether the base is token0, i.e. the tick prices the
+    /// quote in the base
+    /// @return quote_ Amount of quote
+    function quoteAtTick (
+        int24 _tick,
+        uint128 _baseAmount,
+        bool _baseIs0
+    ) internal pure returns (
+        uint quote_
+    ) {
+
+        uint160 sqrtRatioX96 = TickMath.getSqrtRatioAtTick(_tick);
+
+        // better precision if no overflow when squared
+        if (sqrtRatioX96 <= type(uint128).max) {
+
+            uint256 ratioX192 = uint256(sqrtRatioX96) * sqrtRatioX96;
+
+            quote_ = _baseIs0
+                ? FullMath.mulDiv(ratioX192, _baseAmount, 1 << 192)
+                : FullMath.mulDiv(1 << 192, _baseAmount, ratioX192);
+
+        } else {
+
+            uint256 ratioX128 = FullMath.mulDiv(sqrtRatioX96, sqrtRatioX96, 1 << 64);
+
+            quote_ = _baseIs0
+                ? FullMath.mulDiv(ratioX128, _baseAmount, 1 << 128)
+                : FullMath.mulDiv(1 << 128, _baseAmount, ratioX128);
+
+        }
+
+    }
+
+}
@@ -39,4 +39,12 @@ contract UniswapV3FactoryMock {
         require(isPool[pool], "!pool");
         UniswapV3OracleMock(pool).loadObservations(_observations, _shims);
     }
+
+    function loadObservationsPacked(
+        address pool,
+        uint[] calldata _packed
+    ) external {
+        require(isPool[pool], "!pool");
+        UniswapV3OracleMock(pool).loadObservationsPacked(_packed);
+    }
 }
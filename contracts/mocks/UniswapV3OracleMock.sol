@@ -5,7 +5,7 @@ contract UniswapV3OracleMock {
 
     using OracleMock for OracleMock.Observation[65535];
     struct Shim {
-        uint timestamp;
+        uint32 timestamp;
         uint128 liquidity;
         int24 tick;
         uint16 cardinality;
@@ -19,6 +19,13 @@ contract UniswapV3OracleMock {
     Shim[65535] public shims;
     OracleMock.Observation[65535] public observations;
 
+    // uniform time index over the loaded observations, off when zero
+    uint32 public indexStart;
+    uint32 public indexInterval;
+
+    // newest observation at or before each index bucket's start
+    uint16[] public buckets;
+
     /**
       @notice TODO
       @dev Inherited by UniswapV3FactoryMock contract
@@ -43,6 +50,8 @@ contract UniswapV3OracleMock {
 
         uint target = block.timestamp;
 
+        if (indexInterval != 0) return observeIndexed(uint32(target), secondsAgos);
+
         ( Shim memory beforeOrAt, Shim memory atOrAfter ) = binarySearch(
             shims,
             target,
@@ -80,24 +89,211 @@ contract UniswapV3OracleMock {
     }
 
 
+    /**
+      @notice Loads observations and their shims onto the end of the mock
+      @dev Cardinality is read and written once for the whole batch
+      @param _observations Observations in chronological order
+      @param _shims Tick, liquidity and cardinality at each observation
+     */
     function loadObservations(
         OracleMock.Observation[] calldata _observations,
         Shim[] calldata _shims
     ) external {
 
+        uint _card = cardinality;
         uint len = _observations.length;
 
         for (uint i = 0; i < len; i++) {
 
-            uint _card = cardinality;
+            observations[_card + i] = _observations[i];
+            shims[_card + i] = _shims[i];
+
+            indexObservation(_card + i, _observations[i].blockTimestamp);
+
+        }
+
+        cardinality = uint16(_card + len);
+
+    }
+
+    /**
+      @notice Loads observations and their shims from packed words
+      @dev Two words per observation. The first is laid out as the
+      @dev observation is in storage: blockTimestamp in the low 32 bits,
+      @dev then tickCumulative (56), secondsPerLiquidityCumulativeX128 (160)
+      @dev and initialized (8). The second holds the shim: liquidity in the
+      @dev low 128 bits, then tick (24) and cardinality (16). The shim takes
+      @dev its timestamp from the observation.
+      @param _packed Observation and shim words, interleaved
+     */
+    function loadObservationsPacked(
+        uint[] calldata _packed
+    ) external {
+
+        require(_packed.length % 2 == 0, "!packed");
+
+        uint _card = cardinality;
+        uint len = _packed.length / 2;
+
+        for (uint i = 0; i < len; i++) {
+
+            uint _observation = _packed[2 * i];
+            uint _shim = _packed[2 * i + 1];
 
-            observations[_card] = _observations[i];
-            shims[_card] = _shims[i];
+            uint32 _timestamp = uint32(_observation);
 
-            cardinality += 1;
+            observations[_card + i] = OracleMock.Observation({
+                blockTimestamp: _timestamp,
+                tickCumulative: int56(uint56(_observation >> 32)),
+                secondsPerLiquidityCumulativeX128: uint160(_observation >> 88),
+                initialized: uint8(_observation >> 248) != 0
+            });
+
+            shims[_card + i] = Shim({
+                timestamp: _timestamp,
+                liquidity: uint128(_shim),
+                tick: int24(uint24(_shim >> 128)),
+                cardinality: uint16(_shim >> 152)
+            });
+
+            indexObservation(_card + i, _timestamp);
 
         }
 
+        cardinality = uint16(_card + len);
+
+    }
+
+    /**
+      @notice Turns on the uniform time index for observations loaded next
+      @dev Observations are bucketed by `_interval` seconds from the first
+      @dev one as they load, so observe can jump to the right bucket instead
+      @dev of searching. Feeds arrive at near fixed intervals, so the mean
+      @dev spacing leaves about one observation per bucket.
+      @param _interval Bucket width in seconds
+     */
+    function indexObservations(
+        uint32 _interval
+    ) external {
+
+        require(cardinality == 0, "!empty");
+        require(_interval != 0, "!interval");
+
+        indexInterval = _interval;
+
+    }
+
+    /**
+      @dev Pushes the buckets that start before `_timestamp`, all of which
+      @dev begin at or after the previous observation
+     */
+    function indexObservation(
+        uint _position,
+        uint32 _timestamp
+    ) private {
+
+        uint _interval = indexInterval;
+
+        if (_interval == 0) return;
+
+        if (_position == 0) {
+
+            indexStart = _timestamp;
+            return;
+
+        }
+
+        uint _start = indexStart;
+        uint _buckets = buckets.length;
+
+        while (_start + _buckets * _interval < _timestamp) {
+
+            buckets.push(uint16(_position - 1));
+            _buckets += 1;
+
+        }
+
+    }
+
+    /**
+      @dev Newest observation at or before `_target`, no later than `_newest`.
+      @dev Reads the bucket and walks forward over the few observations in it.
+     */
+    function locate(
+        uint _target,
+        uint _newest
+    ) private view returns (uint position_) {
+
+        require(indexStart <= _target, "OLD");
+
+        uint _buckets = buckets.length;
+        uint _bucket = ( _target - indexStart ) / indexInterval;
+
+        if (_buckets != 0) position_ = buckets[_bucket < _buckets ? _bucket : _buckets - 1];
+
+        while (position_ < _newest && shims[position_ + 1].timestamp <= _target) position_ += 1;
+
+    }
+
+    function observeIndexed(
+        uint32 _time,
+        uint32[] calldata _secondsAgos
+    ) private view returns (
+        int56[] memory tickCumulatives_,
+        uint160[] memory secondsPerLiquidityCumulativeX128s_
+    ) {
+
+        Shim memory _shim = shims[locate(_time, cardinality - 1)];
+
+        tickCumulatives_ = new int56[](_secondsAgos.length);
+        secondsPerLiquidityCumulativeX128s_ = new uint160[](_secondsAgos.length);
+
+        for (uint i = 0; i < _secondsAgos.length; i++) {
+
+            (   tickCumulatives_[i],
+                secondsPerLiquidityCumulativeX128s_[i] ) = observeIndexedSingle(
+                    _time,
+                    _secondsAgos[i],
+                    _shim
+                );
+
+        }
+
+    }
+
+    function observeIndexedSingle(
+        uint32 _time,
+        uint32 _secondsAgo,
+        Shim memory _shim
+    ) private view returns (
+        int56 tickCumulative_,
+        uint160 secondsPerLiquidityCumulativeX128_
+    ) {
+
+        uint32 _target = _time - _secondsAgo;
+
+        // at or after the newest observation there is nothing to search
+        if (observations[_shim.cardinality - 1].blockTimestamp <= _target) {
+
+            return observations.observeSingle(
+                _time,
+                _secondsAgo,
+                _shim.tick,
+                _shim.cardinality - 1,
+                _shim.liquidity,
+                _shim.cardinality
+            );
+
+        }
+
+        uint _position = locate(_target, _shim.cardinality - 1);
+
+        return OracleMock.interpolate(
+            observations[_position],
+            observations[_position + 1],
+            _target
+        );
+
     }
 
     function binarySearch(
@@ -335,6 +531,25 @@ library OracleMock {
             getSurroundingObservations(self, time, target, tick, index, liquidity, cardinality);
         
 
+        return interpolate(beforeOrAt, atOrAfter, target);
+    }
+
+    /// @notice Accumulator values at `target` from the observations surrounding it
+    /// @dev Split out of observeSingle so callers that already know the surrounding
+    /// observations can skip the search
+    /// @param beforeOrAt The observation which occurred at, or before, the target
+    /// @param atOrAfter The observation which occurred at, or after, the target
+    /// @param target The timestamp to compute the accumulator values for
+    /// @return tickCumulative The tick * time elapsed since the pool was first initialized, as of `target`
+    /// @return secondsPerLiquidityCumulativeX128 The time elapsed / max(1, liquidity) since the pool was first initialized, as of `target`
+    function interpolate(
+        Observation memory beforeOrAt,
+        Observation memory atOrAfter,
+        uint32 target
+    )   internal pure returns (
+        int56 tickCumulative,
+        uint160 secondsPerLiquidityCumulativeX128
+    ) {
         if (target == beforeOrAt.blockTimestamp) {
             // we're at the left boundary
             return (beforeOrAt.tickCumulative, beforeOrAt.secondsPerLiquidityCumulativeX128);
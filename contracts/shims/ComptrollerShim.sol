@@ -69,7 +69,7 @@ contract ComptrollerShim is OverlayV1Comptroller {
     }
 
 
-    function depth () public view override returns (uint depth_) {
+    function depth (uint) public view override returns (uint depth_) {
 
         depth_ = staticCap;
 
@@ -31,22 +31,46 @@ contract OverlayV1UniswapV3MarketZeroLambdaShim is OverlayV1UniswapV3Market {
     ) { }
 
 
-    function update () public virtual override returns (uint cap_) {
+    function oiCap (
+        uint _feed
+    ) public override view returns ( 
+        uint cap_ 
+    ) {
 
-        cap_ = super.update();
+        cap_ = super.oiCap(_feed);
         cap_ = lmbda == 0 ? staticCap : cap_;
 
     }
 
-    function oiCap () public override view returns ( 
-        uint cap_ 
+    function viewFunding (
+        uint _oiLong,
+        uint _oiShort,
+        uint _epochs,
+        uint _k
+    ) public pure returns (
+        uint oiLong_,
+        uint oiShort_,
+        int fundingPaid_
     ) {
 
-        cap_ = super.oiCap();
-        cap_ = lmbda == 0 ? staticCap : cap_;
+        ( oiLong_, oiShort_, fundingPaid_ ) = computeFunding(
+            _oiLong,
+            _oiShort,
+            _epochs,
+            _k
+        );
 
     }
 
+    function viewPowUpInt (
+        uint _x,
+        uint _n
+    ) public pure returns (
+        uint pow_
+    ) {
+
+        pow_ = _x.powUpInt(_n);
 
+    }
 
-}
\ No newline at end of file
+}
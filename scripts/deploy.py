@@ -7,6 +7,7 @@ from brownie import \
     OverlayToken, \
     chain, \
     accounts
+from scripts.mock_feeds import load_observations
 import os
 import json
 
@@ -95,10 +96,11 @@ def deploy_uni_pool(factory, token0, token1, path):
 
     uniswapv3_pool = IUniswapV3OracleMock(factory.allPools(0))
 
-    uniswapv3_pool.loadObservations(
+    load_observations(
+        uniswapv3_pool,
         data['observations'],
         data['shims'],
-        {'from': FEED_OWNER}
+        FEED_OWNER
     )
 
     chain.mine(timestamp=beginning)
@@ -176,6 +178,7 @@ def deploy_ovl_collateral(mothership, market, ovl):
 
     ovl_collateral.setMarketInfo(
         market,
+        0,
         MARGIN_MAINTENANCE,
         MARGIN_REWARD_RATE,
         MAX_LEVERAGE,
@@ -0,0 +1,241 @@
+'''
+Streams the events of Overlay markets and collateral managers to asyncio
+consumers.
+
+New heads come from an eth_subscribe newHeads websocket, or by polling the
+block number where no websocket is served, e.g. ganache over http. For
+each new head the logs of every contract since the last head are read with
+a single eth_getLogs, off the event loop, and decoded with ABI decoders
+built once per event. Each decoded event is put on the bounded queue of
+every subscription to it.
+
+A consumer that falls behind does not hold up the pipeline or the other
+consumers: once its queue is full the oldest event on it is dropped for
+the new one and counted in Subscription.dropped.
+
+    async def main():
+        pipeline = EventPipeline([market, ovl_collateral])
+        builds = pipeline.subscribe(['Build'])
+
+        async def consume():
+            while True:
+                event = await builds.queue.get()
+                ...
+
+        await asyncio.gather(pipeline.run(), consume())
+
+Subscriptions hold asyncio queues, so are made inside the running loop.
+'''
+import asyncio
+import json
+from collections import namedtuple
+
+import websockets
+from brownie import web3
+from eth_abi.decoding import ContextFramesBytesIO, TupleDecoder
+from eth_abi.registry import registry
+from eth_utils import event_abi_to_log_topic, to_checksum_address
+from hexbytes import HexBytes
+
+Event = namedtuple('Event', ['name', 'address', 'block_number',
+                             'transaction_hash', 'log_index', 'args'])
+
+# an event decoder: its name, the indexed and data inputs, the address
+# inputs to checksum like brownie does, and decoders
+EventDecoder = namedtuple('EventDecoder', ['name', 'indexed', 'inputs',
+                                           'addresses', 'topic_decoders',
+                                           'data_decoder'])
+
+
+def is_dynamic(type_str):
+    return type_str in ('string', 'bytes') or type_str.endswith(']') \
+        or type_str.startswith('(')
+
+
+def event_decoders(abis):
+    '''
+    Inputs:
+      abis [list]: Contract ABIs
+
+    Output:
+      [dict]: EventDecoder of each event by its topic
+    '''
+    decoders = {}
+
+    for abi in abis:
+        for entry in abi:
+            if entry['type'] != 'event' or entry.get('anonymous'):
+                continue
+
+            indexed = [i for i in entry['inputs'] if i['indexed']]
+            inputs = [i for i in entry['inputs'] if not i['indexed']]
+
+            decoders[HexBytes(event_abi_to_log_topic(entry))] = EventDecoder(
+                name=entry['name'],
+                indexed=[i['name'] for i in indexed],
+                inputs=[i['name'] for i in inputs],
+                addresses={i['name'] for i in entry['inputs']
+                           if i['type'] == 'address'},
+                # a dynamic indexed input is only its hash
+                topic_decoders=[
+                    None if is_dynamic(i['type'])
+                    else registry.get_decoder(i['type'])
+                    for i in indexed
+                ],
+                data_decoder=TupleDecoder(decoders=[
+                    registry.get_decoder(i['type']) for i in inputs
+                ]),
+            )
+
+    return decoders
+
+
+class Subscription:
+    '''
+    Bounded queue of events of the given names, all events if None.
+    '''
+    def __init__(self, names=None, maxsize=1024):
+        self.names = None if names is None else set(names)
+        self.queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    def put(self, event):
+        if self.names is not None and event.name not in self.names:
+            return
+
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+
+        self.queue.put_nowait(event)
+
+
+class EventPipeline:
+    '''
+    Inputs:
+      contracts     [list]:  Contracts with the address and abi to stream
+                             events of
+      poll          [float]: Seconds between block number polls
+      ws_uri        [str]:   Websocket to subscribe to new heads on, polling
+                             if None
+      confirmations [int]:   Blocks to trail the head by
+      max_range     [int]:   Most blocks read by one eth_getLogs
+    '''
+    def __init__(self, contracts, poll=1., ws_uri=None, confirmations=0,
+                 max_range=2000):
+        self.addresses = [c.address for c in contracts]
+        self.decoders = event_decoders([c.abi for c in contracts])
+
+        self.poll = poll
+        self.ws_uri = ws_uri
+        self.confirmations = confirmations
+        self.max_range = max_range
+
+        self.subscriptions = []
+
+        # last block whose logs were published
+        self.block = None
+
+    def subscribe(self, names=None, maxsize=1024):
+        subscription = Subscription(names, maxsize)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def decode(self, log):
+        '''
+        Output:
+          [Event]: Decoded log, None if no contract has its event
+        '''
+        topics = [HexBytes(t) for t in log['topics']]
+        decoder = self.decoders.get(topics[0]) if topics else None
+        if decoder is None:
+            return None
+
+        args = {}
+
+        for name, topic_decoder, topic in zip(
+                decoder.indexed, decoder.topic_decoders, topics[1:]):
+            args[name] = topic if topic_decoder is None \
+                else topic_decoder(ContextFramesBytesIO(topic))
+
+        values = decoder.data_decoder(
+            ContextFramesBytesIO(HexBytes(log['data'])))
+        args.update(zip(decoder.inputs, values))
+
+        for name in decoder.addresses:
+            args[name] = to_checksum_address(args[name])
+
+        return Event(decoder.name, log['address'], log['blockNumber'],
+                     HexBytes(log['transactionHash']), log['logIndex'], args)
+
+    def publish(self, event):
+        for subscription in self.subscriptions:
+            subscription.put(event)
+
+    def get_logs(self, from_block, to_block):
+        return web3.eth.get_logs({
+            'fromBlock': from_block,
+            'toBlock': to_block,
+            'address': self.addresses,
+            'topics': [[t.hex() for t in self.decoders]],
+        })
+
+    async def poll_heads(self):
+        loop = asyncio.get_running_loop()
+        head = None
+
+        while True:
+            number = await loop.run_in_executor(
+                None, lambda: web3.eth.block_number)
+            if number != head:
+                head = number
+                yield head
+            await asyncio.sleep(self.poll)
+
+    async def subscribe_heads(self):
+        async with websockets.connect(self.ws_uri) as ws:
+            await ws.send(json.dumps({
+                'jsonrpc': '2.0', 'id': 1,
+                'method': 'eth_subscribe', 'params': ['newHeads'],
+            }))
+            await ws.recv()
+
+            async for message in ws:
+                head = json.loads(message)['params']['result']
+                yield int(head['number'], 16)
+
+    def heads(self):
+        return self.subscribe_heads() if self.ws_uri else self.poll_heads()
+
+    async def run(self, from_block=None, to_block=None):
+        '''
+        Publishes events from from_block, or the first new head, through
+        to_block, or forever.
+        '''
+        loop = asyncio.get_running_loop()
+        start = from_block
+
+        async for head in self.heads():
+            head -= self.confirmations
+
+            if start is None:
+                start = head
+            if to_block is not None:
+                head = min(head, to_block)
+
+            while start <= head:
+                end = min(head, start + self.max_range - 1)
+
+                logs = await loop.run_in_executor(
+                    None, self.get_logs, start, end)
+
+                for log in logs:
+                    event = self.decode(log)
+                    if event is not None:
+                        self.publish(event)
+
+                self.block = end
+                start = end + 1
+
+            if to_block is not None and start > to_block:
+                return
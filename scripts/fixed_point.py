@@ -0,0 +1,335 @@
+'''
+Exact port of the FixedPoint and LogExpMath libraries.
+
+Each function returns what the library returns for the same uint256 or
+int256 inputs, to the wei, and raises Revert where the library reverts:
+with its BAL# reason, or None for the arithmetic panics of checked math
+and division by zero. Inputs are taken to be in range of their solidity
+types.
+
+LogExpMath is unchecked and divides signed values, which solidity rounds
+toward zero where python floors, so the signed divisions go through
+_tdiv. Off-chain pricing then agrees with the contracts, e.g. the spread
+of a price point
+
+    ask = mul_up(max(macro, micro), pow_up(E, pbnj))
+    bid = mul_down(min(macro, micro), pow_up(INVERSE_E, pbnj))
+
+For batches, scripts.fixed_point_arrays evaluates the same functions over
+numpy object arrays.
+'''
+from functools import lru_cache
+
+ONE = 10**18
+MAX_UINT256 = 2**256 - 1
+
+MAX_POW_RELATIVE_ERROR = 10000
+
+# Euler's number and its inverse, as OverlayV1PricePoint and
+# OverlayV1Comptroller hold them
+E = 0x25B946EBC0B36351
+INVERSE_E = 0x51AF86713316A9A
+
+ONE_18 = 10**18
+ONE_20 = 10**20
+ONE_36 = 10**36
+
+MAX_NATURAL_EXPONENT = 130 * ONE_18
+MIN_NATURAL_EXPONENT = -41 * ONE_18
+
+LN_36_LOWER_BOUND = ONE_18 - 10**17
+LN_36_UPPER_BOUND = ONE_18 + 10**17
+
+MILD_EXPONENT_BOUND = 2**254 // ONE_20
+
+x0 = 128000000000000000000
+a0 = 38877084059945950922200000000000000000000000000000000000
+x1 = 64000000000000000000
+a1 = 6235149080811616882910000000
+
+# (x_n, a_n) for n = 2..11, with 20 decimals
+TERMS = (
+    (3200000000000000000000, 7896296018268069516100000000000000),
+    (1600000000000000000000, 888611052050787263676000000),
+    (800000000000000000000, 298095798704172827474000),
+    (400000000000000000000, 5459815003314423907810),
+    (200000000000000000000, 738905609893065022723),
+    (100000000000000000000, 271828182845904523536),
+    (50000000000000000000, 164872127070012814685),
+    (25000000000000000000, 128402541668774148407),
+    (12500000000000000000, 113314845306682631683),
+    (6250000000000000000, 106449445891785942956),
+)
+
+# exp reduces by x2..x9, _ln by x2..x11
+EXP_TERMS = TERMS[:8]
+
+# divisors of the terms of the exp series, (term * x / ONE_20) / n being
+# term * x / (ONE_20 * n) for the non negative terms
+EXP_SERIES = tuple(ONE_20 * n for n in range(2, 13))
+
+
+class Revert(Exception):
+    '''
+    Raised where the contracts would revert. Carries the revert reason, or
+    None for arithmetic panics.
+    '''
+    def __init__(self, reason=None):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def _tdiv(a, b):
+    '''
+    Signed division rounding toward zero, for b > 0.
+    '''
+    return a // b if a >= 0 else -(-a // b)
+
+
+def _sdiv(a, b):
+    '''
+    Signed division rounding toward zero.
+    '''
+    if b == 0:
+        raise Revert()
+    q = abs(a) // abs(b)
+    return q if (a < 0) == (b < 0) else -q
+
+
+def add(a, b):
+    c = a + b
+    if c > MAX_UINT256:
+        raise Revert()
+    return c
+
+
+def sub(a, b):
+    if b > a:
+        raise Revert('BAL#001')
+    return a - b
+
+
+def mul_down(a, b):
+    product = a * b
+    if product > MAX_UINT256:
+        raise Revert()
+    return product // ONE
+
+
+def mul_up(a, b):
+    product = a * b
+    if product > MAX_UINT256:
+        raise Revert()
+    return 0 if product == 0 else (product - 1) // ONE + 1
+
+
+def div_down(a, b):
+    if b == 0:
+        raise Revert('BAL#004')
+    if a == 0:
+        return 0
+    inflated = a * ONE
+    if inflated > MAX_UINT256:
+        raise Revert()
+    return inflated // b
+
+
+def div_up(a, b):
+    if b == 0:
+        raise Revert('BAL#004')
+    if a == 0:
+        return 0
+    inflated = a * ONE
+    if inflated > MAX_UINT256:
+        raise Revert()
+    return (inflated - 1) // b + 1
+
+
+def pow_down(x, y):
+    '''
+    FixedPoint.powDown: x^y rounded down by the relative error bound.
+    '''
+    if y == 0 or x == ONE:
+        return ONE
+
+    raw = pow(x, y)
+    max_error = add(mul_up(raw, MAX_POW_RELATIVE_ERROR), 1)
+
+    return 0 if raw < max_error else raw - max_error
+
+
+def pow_up(x, y):
+    '''
+    FixedPoint.powUp: x^y rounded up by the relative error bound.
+    '''
+    if x == ONE or y == 0:
+        return ONE
+
+    raw = pow(x, y)
+    return add(raw, add(mul_up(raw, MAX_POW_RELATIVE_ERROR), 1))
+
+
+def pow_up_int(x, n):
+    '''
+    FixedPoint.powUpInt: x^n for a fixed point x and an integer n.
+    '''
+    z = ONE
+    while n != 0:
+        if n & 1:
+            z = mul_up(z, x)
+        n >>= 1
+        if n != 0:
+            x = mul_up(x, x)
+    return z
+
+
+def complement(x):
+    return ONE - x if x < ONE else 0
+
+
+@lru_cache(maxsize=65536)
+def pow(x, y):
+    '''
+    LogExpMath.pow: x^y for fixed point x and y, as an exp of a log.
+
+    Cached, since simulations raise the same constants, e.g. E and
+    INVERSE_E to pbnj, over and over.
+    '''
+    if x >= 2**255:
+        raise Revert('BAL#006')
+    if y >= MILD_EXPONENT_BOUND:
+        raise Revert('BAL#007')
+
+    if LN_36_LOWER_BOUND < x < LN_36_UPPER_BOUND:
+        ln_36_x = _ln_36(x)
+        whole = _tdiv(ln_36_x, ONE_18)
+        logx_times_y = whole * y + _tdiv((ln_36_x - whole * ONE_18) * y,
+                                         ONE_18)
+    else:
+        logx_times_y = _ln(x) * y
+
+    logx_times_y = _tdiv(logx_times_y, ONE_18)
+
+    if not MIN_NATURAL_EXPONENT <= logx_times_y <= MAX_NATURAL_EXPONENT:
+        raise Revert('BAL#008')
+
+    return exp(logx_times_y)
+
+
+def exp(x):
+    '''
+    LogExpMath.exp: e^x for a signed fixed point x.
+    '''
+    if not MIN_NATURAL_EXPONENT <= x <= MAX_NATURAL_EXPONENT:
+        raise Revert('BAL#009')
+
+    if x < 0:
+        return ONE_36 // exp(-x)
+
+    if x >= x0:
+        x -= x0
+        first_an = a0
+    elif x >= x1:
+        x -= x1
+        first_an = a1
+    else:
+        first_an = 1
+
+    x *= 100
+
+    product = ONE_20
+    for x_n, a_n in EXP_TERMS:
+        if x >= x_n:
+            x -= x_n
+            product = product * a_n // ONE_20
+
+    series_sum = ONE_20
+    term = x
+    series_sum += term
+    for divisor in EXP_SERIES:
+        term = term * x // divisor
+        series_sum += term
+
+    return product * series_sum // ONE_20 * first_an // 100
+
+
+def ln(a):
+    '''
+    LogExpMath.ln: natural log of a positive fixed point a.
+    '''
+    if a <= 0:
+        raise Revert('BAL#100')
+
+    if LN_36_LOWER_BOUND < a < LN_36_UPPER_BOUND:
+        return _tdiv(_ln_36(a), ONE_18)
+
+    return _ln(a)
+
+
+def log(arg, base):
+    '''
+    LogExpMath.log: log of arg in base, both fixed point.
+    '''
+    if LN_36_LOWER_BOUND < base < LN_36_UPPER_BOUND:
+        log_base = _ln_36(base)
+    else:
+        log_base = _ln(base) * ONE_18
+
+    if LN_36_LOWER_BOUND < arg < LN_36_UPPER_BOUND:
+        log_arg = _ln_36(arg)
+    else:
+        log_arg = _ln(arg) * ONE_18
+
+    return _sdiv(log_arg * ONE_18, log_base)
+
+
+def _ln(a):
+    if a <= 0:
+        # division by zero in the inversion below
+        raise Revert()
+
+    if a < ONE_18:
+        return -_ln(ONE_36 // a)
+
+    total = 0
+    if a >= a0 * ONE_18:
+        a //= a0
+        total += x0
+
+    if a >= a1 * ONE_18:
+        a //= a1
+        total += x1
+
+    total *= 100
+    a *= 100
+
+    for x_n, a_n in TERMS:
+        if a >= a_n:
+            a = a * ONE_20 // a_n
+            total += x_n
+
+    z = (a - ONE_20) * ONE_20 // (a + ONE_20)
+    z_squared = z * z // ONE_20
+
+    num = z
+    series_sum = num
+    for n in range(3, 12, 2):
+        num = num * z_squared // ONE_20
+        series_sum += num // n
+
+    return (total + 2 * series_sum) // 100
+
+
+def _ln_36(x):
+    x *= ONE_18
+
+    z = _tdiv((x - ONE_36) * ONE_36, x + ONE_36)
+    z_squared = z * z // ONE_36
+
+    num = z
+    series_sum = num
+    for n in range(3, 16, 2):
+        num = _tdiv(num * z_squared, ONE_36)
+        series_sum += _tdiv(num, n)
+
+    return series_sum * 2
@@ -0,0 +1,280 @@
+'''
+The functions of scripts.fixed_point over numpy object arrays.
+
+Elements are python ints, so each is as exact as the scalar function, and
+the arithmetic loops over them in numpy rather than the interpreter. The
+branches of the libraries are taken with masks: a branch is computed for
+the elements taking it, or for all of them where it is cheaper to select
+after. Arguments broadcast against each other like numpy ufuncs.
+
+A batch raises Revert if any of its elements would revert, with the
+reason of the first check failing for some element.
+
+    bids = mul_down(prices, pow_up(INVERSE_E, spreads))
+'''
+import numpy as np
+
+from scripts.fixed_point import (
+    EXP_SERIES,
+    EXP_TERMS,
+    LN_36_LOWER_BOUND,
+    LN_36_UPPER_BOUND,
+    MAX_NATURAL_EXPONENT,
+    MAX_POW_RELATIVE_ERROR,
+    MAX_UINT256,
+    MILD_EXPONENT_BOUND,
+    MIN_NATURAL_EXPONENT,
+    ONE,
+    ONE_18,
+    ONE_20,
+    ONE_36,
+    TERMS,
+    Revert,
+    a0,
+    a1,
+    x0,
+    x1,
+)
+
+
+def array(*values):
+    '''
+    Output:
+      [list]: Values as object arrays of python ints, broadcast together
+    '''
+    arrays = [np.array(v, dtype=object) for v in values]
+    return [a.copy() for a in np.broadcast_arrays(*arrays)]
+
+
+def _tdiv(a, b):
+    '''
+    Signed division rounding toward zero, for b > 0.
+    '''
+    q = abs(a) // b
+    return np.where(a < 0, -q, q)
+
+
+def _full(shape, value):
+    return np.full(shape, value, dtype=object)
+
+
+def _check(value):
+    if (value > MAX_UINT256).any():
+        raise Revert()
+    return value
+
+
+def add(a, b):
+    a, b = array(a, b)
+    return _check(a + b)
+
+
+def sub(a, b):
+    a, b = array(a, b)
+    if (b > a).any():
+        raise Revert('BAL#001')
+    return a - b
+
+
+def mul_down(a, b):
+    a, b = array(a, b)
+    return _check(a * b) // ONE
+
+
+def mul_up(a, b):
+    a, b = array(a, b)
+    product = _check(a * b)
+    return np.where(product == 0, 0, (product - 1) // ONE + 1)
+
+
+def div_down(a, b):
+    a, b = array(a, b)
+    if (b == 0).any():
+        raise Revert('BAL#004')
+    return _check(a * ONE) // b
+
+
+def div_up(a, b):
+    a, b = array(a, b)
+    if (b == 0).any():
+        raise Revert('BAL#004')
+    inflated = _check(a * ONE)
+    return np.where(a == 0, 0, (inflated - 1) // b + 1)
+
+
+def _pow_raw(x, y):
+    '''
+    Output:
+      [tuple]: Mask of the elements with a trivial power, and pow of the
+               others
+    '''
+    trivial = (y == 0) | (x == ONE)
+    return trivial, pow(x[~trivial], y[~trivial])
+
+
+def pow_down(x, y):
+    x, y = array(x, y)
+    trivial, raw = _pow_raw(x, y)
+
+    max_error = mul_up(raw, MAX_POW_RELATIVE_ERROR) + 1
+
+    out = _full(x.shape, ONE)
+    out[~trivial] = np.where(raw < max_error, 0, raw - max_error)
+    return out
+
+
+def pow_up(x, y):
+    x, y = array(x, y)
+    trivial, raw = _pow_raw(x, y)
+
+    out = _full(x.shape, ONE)
+    out[~trivial] = _check(raw + mul_up(raw, MAX_POW_RELATIVE_ERROR) + 1)
+    return out
+
+
+def pow_up_int(x, n):
+    x, n = array(x, n)
+
+    z = _full(x.shape, ONE)
+    while (n != 0).any():
+        odd = n & 1 != 0
+        z[odd] = mul_up(z[odd], x[odd])
+        n >>= 1
+        left = n != 0
+        x[left] = mul_up(x[left], x[left])
+    return z
+
+
+def complement(x):
+    x, = array(x)
+    return np.where(x < ONE, ONE - x, 0)
+
+
+def pow(x, y):
+    x, y = array(x, y)
+
+    if (x >= 2**255).any():
+        raise Revert('BAL#006')
+    if (y >= MILD_EXPONENT_BOUND).any():
+        raise Revert('BAL#007')
+
+    near_one = (LN_36_LOWER_BOUND < x) & (x < LN_36_UPPER_BOUND)
+    logx_times_y = np.empty(x.shape, dtype=object)
+
+    ln_36_x = _ln_36(x[near_one])
+    whole = _tdiv(ln_36_x, ONE_18)
+    logx_times_y[near_one] = whole * y[near_one] + _tdiv(
+        (ln_36_x - whole * ONE_18) * y[near_one], ONE_18)
+
+    logx_times_y[~near_one] = _ln(x[~near_one]) * y[~near_one]
+
+    logx_times_y = _tdiv(logx_times_y, ONE_18)
+
+    if ((logx_times_y < MIN_NATURAL_EXPONENT)
+            | (logx_times_y > MAX_NATURAL_EXPONENT)).any():
+        raise Revert('BAL#008')
+
+    return exp(logx_times_y)
+
+
+def exp(x):
+    x, = array(x)
+
+    if ((x < MIN_NATURAL_EXPONENT) | (x > MAX_NATURAL_EXPONENT)).any():
+        raise Revert('BAL#009')
+
+    negative = x < 0
+    x = abs(x)
+
+    above_x0 = x >= x0
+    above_x1 = ~above_x0 & (x >= x1)
+
+    first_an = _full(x.shape, 1)
+    first_an[above_x0] = a0
+    first_an[above_x1] = a1
+
+    x = np.where(above_x0, x - x0, np.where(above_x1, x - x1, x)) * 100
+
+    product = _full(x.shape, ONE_20)
+    for x_n, a_n in EXP_TERMS:
+        taken = x >= x_n
+        np.subtract(x, x_n, out=x, where=taken)
+        np.multiply(product, a_n, out=product, where=taken)
+        np.floor_divide(product, ONE_20, out=product, where=taken)
+
+    term = x
+    series_sum = term + ONE_20
+    for divisor in EXP_SERIES:
+        term = term * x // divisor
+        series_sum += term
+
+    out = product * series_sum // ONE_20 * first_an // 100
+    return np.where(negative, ONE_36 // out, out)
+
+
+def ln(a):
+    a, = array(a)
+
+    if (a <= 0).any():
+        raise Revert('BAL#100')
+
+    near_one = (LN_36_LOWER_BOUND < a) & (a < LN_36_UPPER_BOUND)
+
+    out = np.empty(a.shape, dtype=object)
+    out[near_one] = _tdiv(_ln_36(a[near_one]), ONE_18)
+    out[~near_one] = _ln(a[~near_one])
+    return out
+
+
+def _ln(a):
+    if (a <= 0).any():
+        # division by zero in the inversion below
+        raise Revert()
+
+    inverted = a < ONE_18
+    a = np.where(inverted, ONE_36 // a, a)
+
+    above_a0 = a >= a0 * ONE_18
+    a = np.where(above_a0, a // a0, a)
+    total = _full(a.shape, 0)
+    total[above_a0] = x0
+
+    above_a1 = a >= a1 * ONE_18
+    a = np.where(above_a1, a // a1, a)
+    total = np.where(above_a1, total + x1, total)
+
+    total = total * 100
+    a = a * 100
+
+    for x_n, a_n in TERMS:
+        taken = a >= a_n
+        np.multiply(a, ONE_20, out=a, where=taken)
+        np.floor_divide(a, a_n, out=a, where=taken)
+        np.add(total, x_n, out=total, where=taken)
+
+    z = (a - ONE_20) * ONE_20 // (a + ONE_20)
+    z_squared = z * z // ONE_20
+
+    num = z
+    series_sum = num
+    for n in range(3, 12, 2):
+        num = num * z_squared // ONE_20
+        series_sum = series_sum + num // n
+
+    out = (total + 2 * series_sum) // 100
+    return np.where(inverted, -out, out)
+
+
+def _ln_36(x):
+    x = x * ONE_18
+
+    z = _tdiv((x - ONE_36) * ONE_36, x + ONE_36)
+    z_squared = z * z // ONE_36
+
+    num = z
+    series_sum = num
+    for n in range(3, 16, 2):
+        num = _tdiv(num * z_squared, ONE_36)
+        series_sum = series_sum + _tdiv(num, n)
+
+    return series_sum * 2
@@ -0,0 +1,305 @@
+'''
+Frames raw Uniswap V3 feeds into windows for the mock pools, without a
+chain.
+
+A window is cut from a raw feed by offset and length, rebased so its first
+observation falls at a fixed mock start, and written in the framed feed
+format with its reflection: the TWAPs, spot, bid and ask the markets read
+from the mock every minute. Reflections are computed with a port of the
+mock's observe, so framing a window takes no mining and the same window
+always produces the same files.
+
+The reflections in the fixtures are floats of fractional ticks. For prices
+to the wei, reflect_exact takes the TWAP ticks and quotes them as the
+markets do.
+
+    python -m scripts.frame_feeds feeds/univ3_dai_weth \\
+        day:0:86400 crash:172800:86400 [...]
+
+writes feeds/univ3_dai_weth_<name>_raw_uni_framed.json and
+feeds/univ3_dai_weth_<name>_reflected.json for each window, framing
+windows in parallel.
+'''
+import json
+import math
+import os
+import sys
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from scripts.fixed_point import E, INVERSE_E, pow_up
+from scripts.fixed_point_arrays import mul_down, mul_up
+from scripts.tick_math import TickPrices, mean_tick
+
+ONE_DAY = 86400
+
+# start of the windows in the feeds/ fixtures
+MOCK_START = 1633486892
+
+MACRO_WINDOW = 3600
+MICRO_WINDOW = 600
+PBNJ = .00573
+PBNJ_WEI = 5730000000000000
+
+REFLECTION_STEP = 60
+
+
+def load_raw(path):
+    '''
+    Inputs:
+      path [str]: Path to a raw feed of {observation, shim} entries
+
+    Output:
+      [list]: (observation, shim) pairs in chronological order
+    '''
+    with open(path) as f:
+        raw = json.load(f)
+
+    return sorted(((r['observation'], r['shim']) for r in raw),
+                  key=lambda r: r[0][0])
+
+
+def frame(raw, offset=0, length=ONE_DAY, mock_start=MOCK_START):
+    '''
+    Cuts a window from a raw feed and rebases it.
+
+    Inputs:
+      raw        [list]: (observation, shim) pairs in chronological order
+      offset     [int]:  Seconds from the first raw observation to the window
+      length     [int]:  Seconds the window spans
+      mock_start [int]:  Timestamp of the first observation in the window
+
+    Output:
+      [dict]: Framed feed of observations and shims, cardinality counted
+              from the start of the window
+    '''
+    start = raw[0][0][0] + offset
+    window = [r for r in raw if start <= r[0][0] <= start + length]
+
+    if not window:
+        raise ValueError(f'no observations in [{start}, {start + length}]')
+
+    first = window[0][0][0]
+
+    observations = []
+    shims = []
+
+    for i, (ob, shim) in enumerate(window):
+        timestamp = mock_start + ob[0] - first
+        observations.append([timestamp] + ob[1:])
+        shims.append([timestamp] + shim[1:3] + [i + 1])
+
+    return {'observations': observations, 'shims': shims}
+
+
+def _div(a, b):
+    # solidity integer division, truncating toward zero
+    q = abs(a) // abs(b)
+    return q if (a < 0) == (b < 0) else -q
+
+
+def observe(framed, time, seconds_agos, timestamps=None):
+    '''
+    UniswapV3OracleMock.observe on a framed feed at a block time.
+
+    Inputs:
+      framed       [dict]: Framed feed
+      time         [int]:  Block timestamp
+      seconds_agos [list]: Seconds before time to read tick cumulatives at
+      timestamps   [list]: Observation timestamps, if already at hand
+
+    Output:
+      [list]: Tick cumulative at each of seconds_agos
+    '''
+    observations = framed['observations']
+    if timestamps is None:
+        timestamps = [ob[0] for ob in observations]
+
+    # the mock reads the newest shim at or before the block
+    newest = bisect_right(timestamps, time) - 1
+    if newest < 0:
+        raise ValueError(f'no observations at {time}')
+
+    tick = framed['shims'][newest][2]
+    last = observations[newest]
+
+    tick_cumulatives = []
+
+    for seconds_ago in seconds_agos:
+        target = time - seconds_ago
+
+        if target < timestamps[0]:
+            raise ValueError('OLD')
+
+        if last[0] <= target:
+            tick_cumulatives.append(last[1] + tick * (target - last[0]))
+            continue
+
+        i = bisect_right(timestamps, target, 0, newest + 1) - 1
+        before, after = observations[i], observations[i + 1]
+
+        tick_cumulatives.append(before[1] + _div(
+            after[1] - before[1], after[0] - before[0]
+        ) * (target - before[0]))
+
+    return tick_cumulatives
+
+
+def reflect(framed, pbnj=PBNJ, step=REFLECTION_STEP):
+    '''
+    Prices the markets read from a framed feed every step seconds, from the
+    first time a full macro window is available.
+
+    Output:
+      [dict]: Reflection with timestamp, one_hr, ten_min, spot, bids and
+              asks lists
+    '''
+    observations = framed['observations']
+    timestamps = [ob[0] for ob in observations]
+
+    start = observations[0][0] + MACRO_WINDOW
+    breadth = observations[-1][0] - observations[0][0] - MACRO_WINDOW
+
+    reflected = {k: [] for k in
+                 ['timestamp', 'one_hr', 'ten_min', 'spot', 'bids', 'asks']}
+
+    for x in range(0, breadth, step):
+        time = start + x
+
+        macro, micro, second, now = observe(
+            framed, time, [MACRO_WINDOW, MICRO_WINDOW, 1, 0], timestamps)
+
+        ten_min = 1.0001 ** ((now - micro) / MICRO_WINDOW)
+        one_hr = 1.0001 ** ((now - macro) / MACRO_WINDOW)
+
+        reflected['timestamp'].append(time)
+        reflected['ten_min'].append(ten_min)
+        reflected['one_hr'].append(one_hr)
+        reflected['spot'].append(1.0001 ** (now - second))
+        reflected['bids'].append(min(ten_min, one_hr) * math.exp(-pbnj))
+        reflected['asks'].append(max(ten_min, one_hr) * math.exp(pbnj))
+
+    return reflected
+
+
+def reflect_exact(framed, base_amount, base_token, quote_token,
+                  pbnj=PBNJ_WEI, step=REFLECTION_STEP):
+    '''
+    Prices the markets read from a framed feed every step seconds, to the
+    wei, from the first time a full macro window is available.
+
+    Inputs:
+      framed      [dict]: Framed feed
+      base_amount [int]:  Amount of base the market quotes
+      base_token  [str]:  Market base
+      quote_token [str]:  Market quote
+      pbnj        [int]:  Spread
+
+    Output:
+      [dict]: Reflection with timestamp, macro_tick, micro_tick, bids and
+              asks lists
+    '''
+    observations = framed['observations']
+    timestamps = [ob[0] for ob in observations]
+
+    start = observations[0][0] + MACRO_WINDOW
+    breadth = observations[-1][0] - observations[0][0] - MACRO_WINDOW
+
+    reflected = {k: [] for k in
+                 ['timestamp', 'macro_tick', 'micro_tick', 'bids', 'asks']}
+
+    times = list(range(start, start + breadth, step))
+    if not times:
+        return reflected
+
+    macro_ticks = []
+    micro_ticks = []
+
+    for time in times:
+        macro, micro, now = observe(
+            framed, time, [MACRO_WINDOW, MICRO_WINDOW, 0], timestamps)
+
+        macro_ticks.append(mean_tick(now - macro, MACRO_WINDOW))
+        micro_ticks.append(mean_tick(now - micro, MICRO_WINDOW))
+
+    prices = TickPrices.for_ticks(macro_ticks + micro_ticks, base_amount,
+                                  base_token, quote_token)
+
+    macro_prices = prices.prices(macro_ticks)
+    micro_prices = prices.prices(micro_ticks)
+
+    bids = mul_down(np.minimum(macro_prices, micro_prices),
+                    pow_up(INVERSE_E, pbnj))
+    asks = mul_up(np.maximum(macro_prices, micro_prices), pow_up(E, pbnj))
+
+    reflected.update(timestamp=times, macro_tick=macro_ticks,
+                     micro_tick=micro_ticks, bids=bids.tolist(),
+                     asks=asks.tolist())
+
+    return reflected
+
+
+def write(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f, separators=(',', ':'))
+
+
+def frame_window(path, name, offset, length, mock_start=MOCK_START):
+    '''
+    Frames and reflects one window of the raw feed at path + '_raw_uni.json'.
+
+    Inputs:
+      path       [str]: Feed path prefix, e.g. feeds/univ3_dai_weth
+      name       [str]: Window name, empty for the unnamed default window
+      offset     [int]: Seconds from the first raw observation
+      length     [int]: Seconds the window spans
+      mock_start [int]: Timestamp of the first observation in the window
+
+    Output:
+      [tuple]: Paths of the framed feed and its reflection
+    '''
+    framed = frame(load_raw(path + '_raw_uni.json'), offset, length,
+                   mock_start)
+
+    prefix = f'{path}_{name}' if name else path
+
+    write(prefix + '_raw_uni_framed.json', framed)
+    write(prefix + '_reflected.json', reflect(framed))
+
+    return prefix + '_raw_uni_framed.json', prefix + '_reflected.json'
+
+
+def frame_windows(path, windows, mock_start=MOCK_START):
+    '''
+    Frames windows of a feed in parallel.
+
+    Inputs:
+      path    [str]:  Feed path prefix
+      windows [list]: (name, offset, length) of each window
+
+    Output:
+      [list]: Paths written for each window
+    '''
+    with ProcessPoolExecutor() as pool:
+        futures = [
+            pool.submit(frame_window, path, name, offset, length, mock_start)
+            for name, offset, length in windows
+        ]
+        return [f.result() for f in futures]
+
+
+def parse_window(spec):
+    name, offset, length = spec.split(':')
+    return name, int(offset), int(length)
+
+
+def main(path, *windows):
+    path = os.path.normpath(path)
+    for written in frame_windows(path, [parse_window(w) for w in windows]):
+        print(*written)
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
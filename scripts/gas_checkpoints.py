@@ -0,0 +1,254 @@
+'''
+Instrumented build of the contracts with gas checkpoints.
+
+The staged functions carry `// @checkpoint <stage>.<step>` comments, which
+the production build compiles to nothing. `build` copies the contracts to
+build/instrumented and rewrites each marker into a log of
+
+    event GasCheckpoint(bytes32 indexed stage, uint256 gas)
+
+carrying gasleft(), then compiles them there as a separate brownie project
+with its own artifacts. The log is written in assembly, so a marker needs
+no event declared along the inheritance chain and adds no stack variable
+to functions close to the stack limit.
+
+    python -m scripts.gas_checkpoints build
+
+`Checkpoints` collects the logs of transactions sent to instrumented
+contracts into gas histograms per stage and per step, a step being charged
+the gas spent since the previous checkpoint of its stage in the same
+contract. The EVM has no clock, so gas stands in for latency. Each
+checkpoint costs about 1.4k gas, charged to the step that follows it.
+'''
+import math
+import os
+import re
+import shutil
+import sys
+from collections import defaultdict
+
+from brownie import project
+from hexbytes import HexBytes
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONTRACTS = os.path.join(BASE, 'contracts')
+CONFIG = os.path.join(BASE, 'brownie-config.yaml')
+
+INSTRUMENTED = os.path.join(BASE, 'build', 'instrumented')
+PROJECT_NAME = 'OverlayInstrumentedProject'
+
+EVENT = 'GasCheckpoint(bytes32,uint256)'
+
+# keccak256 of EVENT
+TOPIC = '0xc4c719ae686ab65856f6b949fe17055e9cc0ed37ad17ea51ef21f5f0b7b0f818'
+
+MARKER = re.compile(r'^([ \t]*)// @checkpoint (\w+)\.(\w+)[ \t]*$', re.M)
+
+
+def instrument(source):
+    '''
+    Inputs:
+      source [str]: Solidity source with checkpoint markers
+
+    Output:
+      [str]: Source with each marker replaced by a GasCheckpoint log
+    '''
+    def emit(match):
+        indent, stage, step = match.groups()
+        label = f'{stage}.{step}'
+
+        if len(label) > 32:
+            raise ValueError(f'checkpoint {label} longer than 32 bytes')
+
+        return (f'{indent}assembly {{ mstore(0x00, gas()) '
+                f'log2(0x00, 0x20, {TOPIC}, "{label}") }}')
+
+    return MARKER.sub(emit, source)
+
+
+def build(path=INSTRUMENTED):
+    '''
+    Writes the instrumented contracts to path and compiles them.
+
+    Output:
+      [Project]: The instrumented brownie project
+    '''
+    shutil.rmtree(os.path.join(path, 'contracts'), ignore_errors=True)
+
+    for root, _, names in os.walk(CONTRACTS):
+        for name in names:
+            source_path = os.path.join(root, name)
+            target_path = os.path.join(
+                path, 'contracts', os.path.relpath(source_path, CONTRACTS))
+
+            with open(source_path) as f:
+                source = f.read()
+
+            if name.endswith('.sol'):
+                source = instrument(source)
+
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            with open(target_path, 'w') as f:
+                f.write(source)
+
+    shutil.copy(CONFIG, path)
+
+    return project.load(path, name=PROJECT_NAME)
+
+
+def load():
+    '''
+    Output:
+      [Project]: The instrumented project, built unless already loaded
+    '''
+    for loaded in project.get_loaded_projects():
+        if loaded._name == PROJECT_NAME:
+            return loaded
+
+    return build()
+
+
+def checkpoints(tx):
+    '''
+    Inputs:
+      tx [TransactionReceipt]: Transaction sent to instrumented contracts
+
+    Output:
+      [list]: (contract address, stage, step, gasleft) of each checkpoint
+              in the order they were logged
+    '''
+    topic = HexBytes(TOPIC)
+    found = []
+
+    for log in tx.logs:
+        topics = log['topics']
+        if len(topics) != 2 or HexBytes(topics[0]) != topic:
+            continue
+
+        stage, step = HexBytes(topics[1]).rstrip(b'\0').decode().split('.')
+        gas = int.from_bytes(HexBytes(log['data']), 'big')
+
+        found.append((log['address'], stage, step, gas))
+
+    return found
+
+
+def percentile(ordered, q):
+    # nearest rank
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def histogram(values, bins=10):
+    '''
+    Inputs:
+      values [list]: Gas samples
+      bins   [int]:  Number of equal width bins
+
+    Output:
+      [list]: (low, high, count) of each bin, low inclusive
+    '''
+    low, high = min(values), max(values)
+    width = max(1, math.ceil((high - low + 1) / bins))
+
+    counts = [0] * bins
+    for value in values:
+        counts[(value - low) // width] += 1
+
+    return [(low + i * width, low + (i + 1) * width, count)
+            for i, count in enumerate(counts)]
+
+
+class Checkpoints:
+    '''
+    Gas spent per stage and per step over instrumented transactions.
+    '''
+    def __init__(self):
+        self.stages = defaultdict(list)
+        self.steps = defaultdict(list)
+        self.txs = 0
+
+    def add(self, tx):
+        '''
+        Adds the checkpoints logged by a transaction. A stage runs from its
+        start checkpoint to the last checkpoint before it starts again in
+        the same contract or the transaction ends.
+        '''
+        # (contract, stage) -> [gasleft at start, gasleft at last checkpoint]
+        running = {}
+
+        for address, stage, step, gas in checkpoints(tx):
+            key = (address, stage)
+
+            if step == 'start' or key not in running:
+                if key in running:
+                    start, last = running[key]
+                    self.stages[stage].append(start - last)
+                running[key] = [gas, gas]
+                continue
+
+            self.steps[(stage, step)].append(running[key][1] - gas)
+            running[key][1] = gas
+
+        for (_, stage), (start, last) in running.items():
+            self.stages[stage].append(start - last)
+
+        self.txs += 1
+
+    def summary(self):
+        '''
+        Output:
+          [list]: (name, count, mean, p50, p90, max) of each stage followed
+                  by its steps, in the order first seen
+        '''
+        rows = []
+
+        def row(name, values):
+            ordered = sorted(values)
+            rows.append((name, len(ordered), sum(ordered) // len(ordered),
+                         percentile(ordered, .5), percentile(ordered, .9),
+                         ordered[-1]))
+
+        for stage, values in self.stages.items():
+            row(stage, values)
+            for (step_stage, step), step_values in self.steps.items():
+                if step_stage == stage:
+                    row(f'  {step}', step_values)
+
+        return rows
+
+    def report(self, bins=10, width=40):
+        '''
+        Output:
+          [list]: Lines of the summary table and a histogram of each stage
+        '''
+        lines = [f"{'stage':<24}{'count':>8}{'mean':>10}{'p50':>10}"
+                 f"{'p90':>10}{'max':>10}"]
+
+        for name, count, mean, p50, p90, high in self.summary():
+            lines.append(f'{name:<24}{count:>8}{mean:>10}{p50:>10}'
+                         f'{p90:>10}{high:>10}')
+
+        for stage, values in self.stages.items():
+            bars = histogram(values, bins)
+            most = max(count for _, _, count in bars)
+
+            lines.extend(['', stage])
+            for low, high, count in bars:
+                bar = '#' * math.ceil(width * count / most)
+                lines.append(f'{low:>10} - {high:<10}{count:>6} {bar}')
+
+        return lines
+
+
+def main(command='build'):
+    if command != 'build':
+        raise SystemExit(f'unknown command {command}')
+
+    instrumented = build()
+    print(f'instrumented build of {len(instrumented)} contracts in '
+          f'{instrumented._path}')
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,56 @@
+'''
+Merges brownie gas profiles recorded on separate chains.
+
+Each xdist worker runs its test modules against its own ganache and records
+gas in its own TxHistory. The profiles are shipped to the master with the
+worker output and merged here so `brownie test -n N --gas` reports one
+profile for the whole suite.
+'''
+
+
+def merge_gas_stats(a, b):
+    '''
+    Inputs:
+      a [dict]: TxHistory.gas_profile entry for a function
+      b [dict]: Entry for the same function from another chain
+
+    Output:
+      [dict]: Entry over the calls of both
+    '''
+    count = a['count'] + b['count']
+    count_success = a['count_success'] + b['count_success']
+
+    avg_success = 0
+    if count_success:
+        avg_success = (a['avg_success'] * a['count_success']
+                       + b['avg_success'] * b['count_success']) \
+            // count_success
+
+    return {
+        'avg': (a['avg'] * a['count'] + b['avg'] * b['count']) // count,
+        'high': max(a['high'], b['high']),
+        'low': min(a['low'], b['low']),
+        'count': count,
+        'count_success': count_success,
+        'avg_success': avg_success,
+    }
+
+
+def merge_gas_profiles(profile, other):
+    '''
+    Merges a gas profile into another in place.
+
+    Inputs:
+      profile [dict]: TxHistory.gas_profile to merge into
+      other   [dict]: Gas profile recorded on another chain
+
+    Output:
+      [dict]: profile
+    '''
+    for fn_name, stats in other.items():
+        if fn_name in profile:
+            profile[fn_name] = merge_gas_stats(profile[fn_name], stats)
+        else:
+            profile[fn_name] = dict(stats)
+
+    return profile
@@ -0,0 +1,111 @@
+'''
+Attributes transaction gas to the internal functions that spent it.
+
+Each step of a brownie trace is charged to the stack of functions active
+when it ran, across external calls and internal jumps, e.g.
+
+    OverlayV1OVLCollateral.build;OverlayV1Market.enterOI;
+    OverlayV1Market.update;OverlayV1UniswapV3Market.fetchPricePoint
+
+Stacks from many transactions are summed and written in the folded format
+read by flamegraph.pl, inferno and speedscope. Gas is execution gas before
+refunds, so a stack sums to the gas the trace spent rather than gas_used.
+'''
+from collections import Counter
+
+# collateral manager calls that run the market's enterOI and exitData
+STAGED_FNS = ('build', 'unwind', 'liquidate', 'update')
+
+
+def fold_trace(trace):
+    '''
+    Inputs:
+      trace [list]: Steps of TransactionReceipt.trace
+
+    Output:
+      [Counter]: Self gas of each function stack, keyed by the stack joined
+                 with ;
+    '''
+    stacks = Counter()
+    spent = 0
+
+    # internal call stack of each active external call frame
+    frames = []
+
+    # (step, stack, gas spent before the callee) of calls awaiting return
+    calls = []
+
+    for i, step in enumerate(trace):
+        depth, jump = step['depth'], step['jumpDepth']
+
+        del frames[depth + 1:]
+        frames.extend([] for _ in range(depth + 1 - len(frames)))
+        frames[depth] = frames[depth][:jump] + [step['fn']]
+
+        path = ';'.join(fn for frame in frames for fn in frame)
+
+        following = trace[i + 1] if i + 1 < len(trace) else None
+
+        if following is not None and following['depth'] > depth:
+            # a call is charged on return, less what the callee spent
+            calls.append((step, path, spent))
+            continue
+
+        if following is None or following['depth'] < depth:
+            cost = step['gasCost']
+        else:
+            cost = step['gas'] - following['gas']
+
+        stacks[path] += cost
+        spent += cost
+
+        if following is not None and following['depth'] < depth:
+            call, call_path, before = calls.pop()
+            cost = call['gas'] - following['gas'] - (spent - before)
+            stacks[call_path] += cost
+            spent += cost
+
+    return stacks
+
+
+class GasStacks:
+    '''
+    Folded gas stacks summed over transactions.
+    '''
+    def __init__(self, fns=STAGED_FNS):
+        self.fns = fns
+        self.stacks = Counter()
+        self.txs = 0
+
+    def add(self, tx):
+        '''
+        Adds a transaction, if it calls one of the staged functions.
+        '''
+        if tx.fn_name not in self.fns:
+            return
+        self.stacks.update(fold_trace(tx.trace))
+        self.txs += 1
+
+    def functions(self):
+        '''
+        Output:
+          [list]: (function, self gas, total gas) by total gas descending
+        '''
+        self_gas = Counter()
+        total_gas = Counter()
+
+        for path, gas in self.stacks.items():
+            fns = path.split(';')
+            self_gas[fns[-1]] += gas
+            for fn in set(fns):
+                total_gas[fn] += gas
+
+        return sorted(((fn, self_gas[fn], gas)
+                       for fn, gas in total_gas.items()),
+                      key=lambda row: -row[2])
+
+    def write_folded(self, path):
+        with open(path, 'w') as f:
+            for stack, gas in sorted(self.stacks.items()):
+                if gas > 0:
+                    f.write(f'{stack} {gas}\n')
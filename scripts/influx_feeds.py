@@ -0,0 +1,236 @@
+'''
+Converts Influx CSV exports of Uniswap V3 oracle data into the framed feed
+format read by the market tests and scripts/mock_feeds.py.
+
+Exports are long format, one `_time,_field,_value` row per field of an
+observation. Rows are pivoted into observations in a single pass, holding
+one observation of lookahead, and written out as they complete, so months of
+pool history convert in constant memory. Rows must be ordered by `_time`,
+which Influx does with `|> sort(columns: ["_time"])`. Wide exports without
+timestamps, such as tests/markets/fixtures/uniswap_v3_DAI_WETH.csv with its
+tick_cumulative_now,tick_cumulative_then columns, cannot be framed and are
+rejected.
+
+Fields read, by their Uniswap V3 names:
+  tickCumulative                     required
+  secondsPerLiquidityCumulativeX128  optional, accumulated from liquidity
+  liquidity                          optional, derived from the above
+  tick                               optional, derived from tickCumulative
+
+    python -m scripts.influx_feeds export.csv feed_framed.json [liquidity]
+'''
+import csv
+import json
+import sys
+import tempfile
+from datetime import datetime
+from decimal import Decimal
+from itertools import groupby
+
+from scripts.mock_feeds import MAX_CARDINALITY
+
+TICK_CUMULATIVE = 'tickCumulative'
+SECONDS_PER_LIQUIDITY = 'secondsPerLiquidityCumulativeX128'
+LIQUIDITY = 'liquidity'
+TICK = 'tick'
+
+Q128 = 2**128
+
+COLUMNS = ('_time', '_field', '_value')
+
+
+def parse_time(value):
+    '''
+    Inputs:
+      value [str]: RFC3339 or pandas style timestamp, e.g.
+                   2021-05-04T20:35:34Z or 2021-05-04 20:35:34+00:00
+
+    Output:
+      [int]: Unix timestamp
+    '''
+    return int(datetime.fromisoformat(value.replace('Z', '+00:00'))
+               .timestamp())
+
+
+def parse_value(value):
+    '''
+    Exact integer of an exported value, which may be written as a float.
+    '''
+    return int(Decimal(value))
+
+
+def read_rows(lines):
+    '''
+    Pivots long format rows into one dict of fields per timestamp. The
+    header is checked on call, before any row is pivoted.
+
+    Inputs:
+      lines [iterable]: Lines of an Influx CSV export
+
+    Output:
+      [generator]: (timestamp, {field: value}) in time order
+    '''
+    reader = csv.DictReader(lines)
+
+    missing = [c for c in COLUMNS if c not in (reader.fieldnames or ())]
+    if missing:
+        raise ValueError(
+            f'not a long format Influx export, missing columns '
+            f'{", ".join(missing)} in header {reader.fieldnames}')
+
+    return pivot(
+        (parse_time(row['_time']), row['_field'], row['_value'])
+        for row in reader
+        if row.get('_value') not in (None, '')
+    )
+
+
+def pivot(rows):
+    '''
+    Inputs:
+      rows [iterable]: (timestamp, field, value) in time order
+
+    Output:
+      [generator]: (timestamp, {field: value}) in time order
+    '''
+    last = None
+
+    for timestamp, group in groupby(rows, key=lambda row: row[0]):
+        if last is not None and timestamp <= last:
+            raise ValueError(
+                f'rows out of time order at {timestamp}, sort the export by '
+                '_time')
+        last = timestamp
+
+        yield timestamp, {field: parse_value(v) for _, field, v in group}
+
+
+def frame(rows, liquidity=None):
+    '''
+    Derives observations and shims from pivoted rows.
+
+    The shim tick of an observation is the tick in force until the next
+    observation, the mean tick over that interval rounded down. Liquidity is
+    the in range liquidity over the same interval where seconds per
+    liquidity was exported, and otherwise carried from the export or the
+    `liquidity` default.
+
+    Inputs:
+      rows      [iterable]: (timestamp, {field: value}) in time order
+      liquidity [int]:      Liquidity where the export has none
+
+    Output:
+      [generator]: (observation, shim) per row
+    '''
+    rows = iter(rows)
+    current = next(rows, None)
+
+    tick = None
+    seconds_per_liquidity = 0
+    cardinality = 0
+
+    while current is not None:
+        following = next(rows, None)
+
+        timestamp, fields = current
+
+        if TICK_CUMULATIVE not in fields:
+            raise ValueError(f'no {TICK_CUMULATIVE} at {timestamp}')
+
+        if following is not None:
+            elapsed = following[0] - timestamp
+            tick = (following[1][TICK_CUMULATIVE]
+                    - fields[TICK_CUMULATIVE]) // elapsed
+
+            if SECONDS_PER_LIQUIDITY in fields \
+                    and SECONDS_PER_LIQUIDITY in following[1]:
+                growth = following[1][SECONDS_PER_LIQUIDITY] \
+                    - fields[SECONDS_PER_LIQUIDITY]
+                if growth > 0:
+                    liquidity = elapsed * Q128 // growth
+
+        tick = fields.get(TICK, tick)
+        liquidity = fields.get(LIQUIDITY, liquidity)
+
+        if tick is None:
+            raise ValueError(f'cannot derive a tick from a single row at '
+                             f'{timestamp}')
+        if liquidity is None:
+            raise ValueError(f'no liquidity exported or given at '
+                             f'{timestamp}')
+
+        seconds_per_liquidity = fields.get(
+            SECONDS_PER_LIQUIDITY, seconds_per_liquidity)
+
+        cardinality = min(cardinality + 1, MAX_CARDINALITY)
+
+        yield (
+            [timestamp, fields[TICK_CUMULATIVE], seconds_per_liquidity, True],
+            [timestamp, liquidity, tick, cardinality],
+        )
+
+        if SECONDS_PER_LIQUIDITY not in fields and following is not None:
+            seconds_per_liquidity += elapsed * Q128 // liquidity
+
+        current = following
+
+
+def write_framed(framed, out):
+    '''
+    Writes observations and shims as the framed feed JSON object, spooling
+    shims to a temporary file so neither list is held in memory.
+
+    Inputs:
+      framed [iterable]: (observation, shim) pairs
+      out    [file]:     Text file to write to
+
+    Output:
+      [int]: Number of observations written
+    '''
+    count = 0
+
+    with tempfile.TemporaryFile('w+') as shims:
+        out.write('{"observations": [')
+
+        for observation, shim in framed:
+            sep = ', ' if count else ''
+            out.write(sep + json.dumps(observation))
+            shims.write(sep + json.dumps(shim))
+            count += 1
+
+        out.write('], "shims": [')
+
+        shims.seek(0)
+        for chunk in iter(lambda: shims.read(1 << 16), ''):
+            out.write(chunk)
+
+        out.write(']}')
+
+    return count
+
+
+def convert(src, dst, liquidity=None):
+    '''
+    Inputs:
+      src       [str]: Path to an Influx CSV export
+      dst       [str]: Path to write the framed feed to
+      liquidity [int]: Liquidity where the export has none
+
+    Output:
+      [int]: Number of observations written
+    '''
+    with open(src, newline='') as lines:
+        rows = read_rows(lines)
+
+        with open(dst, 'w') as out:
+            return write_framed(frame(rows, liquidity), out)
+
+
+def main(src, dst, liquidity=None):
+    count = convert(src, dst,
+                    None if liquidity is None else int(liquidity))
+    print(f'{count} observations written to {dst}')
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
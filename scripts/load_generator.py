@@ -0,0 +1,406 @@
+'''
+Load generator for the Overlay stack on a local ganache.
+
+Funds and unlocks many trader accounts, then has each send build, unwind
+and liquidate transactions, one after the other, concurrently with every
+other trader, through an async JSON-RPC client. A keeper updates the market
+as often as the chain's clock ticks. Every transaction is recorded with its
+latency, gas, block and revert reason, and whether it paid for the
+market's update, i.e. emitted a new price point or paid funding.
+
+The summary gives transactions a second, latency, and for each action the
+gas of transactions that did and did not pay for the update, the revert
+rate and the count of each revert reason, e.g. OVLV1:>cap and
+OVLV1:collat<min.
+
+    brownie run load_generator main [traders] [seconds] [summary.json]
+
+ganache mines each transaction into its own block, so a reverted
+transaction's reason is read from an eth_call of it at the block before,
+where nodes do not return it with the transaction.
+'''
+import asyncio
+import json
+import math
+import random
+import re
+import time
+from collections import Counter, namedtuple
+
+import aiohttp
+import numpy as np
+from brownie import OverlayToken, Wei, accounts, web3
+from eth_utils import keccak, to_checksum_address
+
+from scripts.deploy import GOV
+from scripts.event_pipeline import EventPipeline
+from scripts.replay import GAS_LIMIT, deploy_stack
+
+ACTIONS = ('build', 'unwind', 'liquidate')
+
+# chance of a trader building, unwinding or liquidating next
+MIX = (.5, .35, .15)
+
+TRADER_OVL = 100000 * 10**18
+
+# ganache: VM Exception while processing transaction: revert OVLV1:>cap
+REVERT = re.compile(r'revert (\S+)')
+
+# Error(string)
+ERROR_SELECTOR = '0x08c379a0'
+
+Sent = namedtuple('Sent', ['action', 'account', 'started', 'latency',
+                           'status', 'gas_used', 'reason', 'block',
+                           'updated'])
+
+
+def revert_reason(response):
+    '''
+    Inputs:
+      response [dict]: JSON-RPC response of a reverted eth_sendTransaction
+                       or eth_call
+
+    Output:
+      [str]: Revert reason, the error message if it has none
+    '''
+    error = response.get('error')
+    data = response.get('result')
+
+    if error is not None:
+        match = REVERT.search(error.get('message', ''))
+        if match:
+            return match.group(1)
+
+        data = error.get('data')
+        if not isinstance(data, str):
+            return error.get('message')
+
+    if data and data.startswith(ERROR_SELECTOR):
+        encoded = bytes.fromhex(data[len(ERROR_SELECTOR):])
+        length = int.from_bytes(encoded[32:64], 'big')
+        return encoded[64:64 + length].decode()
+
+    return 'revert'
+
+
+def percentiles(values):
+    '''
+    Output:
+      [dict]: Least, mean, median, 90th, 99th percentile and most of
+              values, None if there are none
+    '''
+    if not values:
+        return None
+
+    values = np.asarray(values, dtype=float)
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+
+    return {
+        'min': float(values.min()),
+        'mean': float(values.mean()),
+        'p50': float(p50),
+        'p90': float(p90),
+        'p99': float(p99),
+        'max': float(values.max()),
+    }
+
+
+def summarize(sent, elapsed):
+    '''
+    Inputs:
+      sent    [list]:  Sent transactions
+      elapsed [float]: Seconds the load ran for
+
+    Output:
+      [dict]: Throughput and latency of all transactions, and gas and
+              reverts by action
+    '''
+    summary = {
+        'txs': len(sent),
+        'elapsed': elapsed,
+        'tx_per_s': len(sent) / elapsed if elapsed else 0.,
+        'blocks': len({s.block for s in sent if s.block is not None}),
+        'latency': percentiles([s.latency for s in sent]),
+    }
+
+    for action in ACTIONS + ('update',):
+        txs = [s for s in sent if s.action == action]
+        if not txs:
+            continue
+
+        reverted = [s for s in txs if not s.status]
+
+        summary[action] = {
+            'txs': len(txs),
+            'revert_rate': len(reverted) / len(txs),
+            'reverts': dict(Counter(s.reason for s in reverted)),
+            'gas': percentiles([s.gas_used for s in txs
+                                if s.status and not s.updated]),
+            'gas_updating': percentiles([s.gas_used for s in txs
+                                         if s.status and s.updated]),
+        }
+
+    return summary
+
+
+def trader_accounts(n, token, collateral, gov=GOV, ovl=TRADER_OVL, ether=0):
+    '''
+    Unlocks n accounts on ganache and funds each with OVL, with the
+    collateral manager approved to spend it, as create_token does for alice
+    and bob. Transactions are sent at a zero gas price, as brownie does on
+    development networks, so traders need no ether.
+
+    Inputs:
+      n          [int]:      Number of traders
+      token      [Contract]: OverlayToken gov can mint
+      collateral [Contract]: Collateral manager the traders build through
+      gov        [Account]:  Account funding the traders
+      ovl        [int]:      OVL minted to each trader
+      ether      [int]:      Wei sent to each trader from gov
+
+    Output:
+      [list]: Trader accounts
+    '''
+    ether = Wei(ether)
+    if n * ether > gov.balance():
+        raise ValueError(f'{gov} holds {gov.balance()} wei, too little to '
+                         f'send {n} traders {ether} each')
+
+    traders = []
+
+    for i in range(n):
+        address = to_checksum_address(keccak(text=f'trader {i}')[-20:])
+        trader = accounts.at(address, force=True)
+
+        if ether:
+            gov.transfer(trader, ether)
+
+        token.mint(trader, ovl, {'from': gov})
+        token.approve(collateral, 1e50, {'from': trader})
+
+        traders.append(trader)
+
+    return traders
+
+
+class RpcClient:
+    '''
+    JSON-RPC over http on an aiohttp session.
+    '''
+    def __init__(self, session, uri):
+        self.session = session
+        self.uri = uri
+        self.id = 0
+
+    async def request(self, method, params):
+        self.id += 1
+        payload = {'jsonrpc': '2.0', 'id': self.id, 'method': method,
+                   'params': params}
+
+        async with self.session.post(self.uri, json=payload) as response:
+            return await response.json(content_type=None)
+
+
+class LoadGenerator:
+    '''
+    Inputs:
+      market     [Contract]: Market traded on
+      collateral [Contract]: Collateral manager traded through
+      traders    [list]:     Funded, unlocked accounts, one concurrent
+                             sender each
+      keeper     [Account]:  Account updating the market, none if None
+      amounts    [tuple]:    Least and most collateral of a build, drawn
+                             log-uniformly
+      leverages  [tuple]:    Leverages to build at
+      mix        [tuple]:    Chance of a build, unwind and liquidate
+      seed       [int]:      Seed of the traders' choices
+    '''
+    def __init__(self, market, collateral, traders, keeper=None,
+                 amounts=(10**16, 10**22), leverages=(1, 2, 5, 10, 25, 100),
+                 mix=MIX, seed=0):
+        self.market = market
+        self.collateral = collateral
+        self.traders = [str(t) for t in traders]
+        self.keeper = None if keeper is None else str(keeper)
+
+        self.amounts = amounts
+        self.leverages = leverages
+        self.mix = mix
+        self.rng = random.Random(seed)
+
+        self.pipeline = EventPipeline([market, collateral])
+
+        # (account, position id) of each position held
+        self.positions = []
+
+        self.sent = []
+        self.elapsed = 0.
+
+    def amount(self):
+        low, high = (math.log(a) for a in self.amounts)
+        return int(math.exp(self.rng.uniform(low, high)))
+
+    async def send(self, rpc, action, account, to, data):
+        '''
+        Output:
+          [list]: Events of the transaction, None if it reverted
+        '''
+        tx = {'from': account, 'to': to, 'data': data,
+              'gas': hex(GAS_LIMIT), 'gasPrice': '0x0'}
+
+        started = time.time()
+        response = await rpc.request('eth_sendTransaction', [tx])
+
+        if 'error' in response:
+            self.sent.append(Sent(action, account, started,
+                                  time.time() - started, 0, None,
+                                  revert_reason(response), None, False))
+            return None
+
+        receipt = (await rpc.request('eth_getTransactionReceipt',
+                                     [response['result']]))['result']
+        latency = time.time() - started
+
+        block = int(receipt['blockNumber'], 16)
+        status = int(receipt['status'], 16)
+
+        events = [e for e in map(self.pipeline.decode, receipt['logs'])
+                  if e is not None]
+
+        reason = None
+        if not status:
+            reason = revert_reason(await rpc.request(
+                'eth_call', [tx, hex(block - 1)]))
+
+        self.sent.append(Sent(
+            action, account, started, latency, status,
+            int(receipt['gasUsed'], 16), reason, block,
+            any(e.name in ('NewPricePoint', 'FundingPaid') for e in events)))
+
+        return events if status else None
+
+    async def build(self, rpc, trader):
+        data = self.collateral.build.encode_input(
+            self.market.address, self.amount(),
+            self.rng.choice(self.leverages), self.rng.random() < .5, 0)
+
+        events = await self.send(rpc, 'build', trader,
+                                 self.collateral.address, data)
+
+        for event in events or []:
+            if event.name == 'Build':
+                self.positions.append((trader, event.args['positionId']))
+
+    async def unwind(self, rpc, trader, position):
+        # taken off the book before awaiting, so no one unwinds it twice
+        self.positions.remove(position)
+
+        _, position_id = position
+        call = self.collateral.balanceOf.encode_input(trader, position_id)
+        response = await rpc.request(
+            'eth_call', [{'to': self.collateral.address, 'data': call},
+                         'latest'])
+        shares = self.collateral.balanceOf.decode_output(response['result'])
+
+        data = self.collateral.unwind.encode_input(position_id, shares)
+        await self.send(rpc, 'unwind', trader, self.collateral.address,
+                        data)
+
+    async def liquidate(self, rpc, trader, position):
+        _, position_id = position
+        data = self.collateral.liquidate.encode_input(position_id, trader)
+
+        events = await self.send(rpc, 'liquidate', trader,
+                                 self.collateral.address, data)
+
+        if events is not None and position in self.positions:
+            self.positions.remove(position)
+
+    async def trade(self, rpc, trader, deadline):
+        while time.time() < deadline:
+            action = self.rng.choices(ACTIONS, self.mix)[0]
+            held = [p for p in self.positions if p[0] == trader]
+
+            if action == 'unwind' and held:
+                await self.unwind(rpc, trader, self.rng.choice(held))
+            elif action == 'liquidate' and self.positions:
+                await self.liquidate(rpc, trader,
+                                     self.rng.choice(self.positions))
+            else:
+                await self.build(rpc, trader)
+
+    async def keep(self, rpc, deadline):
+        data = self.market.update.encode_input()
+        updated = None
+
+        while time.time() < deadline:
+            # the market only updates once a timestamp
+            now = int(time.time())
+            if now != updated:
+                updated = now
+                await self.send(rpc, 'update', self.keeper,
+                                self.market.address, data)
+            await asyncio.sleep(.05)
+
+    async def run_async(self, duration):
+        started = time.time()
+        deadline = started + duration
+
+        async with aiohttp.ClientSession() as session:
+            rpc = RpcClient(session, web3.provider.endpoint_uri)
+
+            tasks = [self.trade(rpc, t, deadline) for t in self.traders]
+            if self.keeper is not None:
+                tasks.append(self.keep(rpc, deadline))
+
+            await asyncio.gather(*tasks)
+
+        self.elapsed = time.time() - started
+
+    def run(self, duration):
+        '''
+        Inputs:
+          duration [float]: Seconds to send transactions for
+
+        Output:
+          [dict]: summarize of the transactions sent
+        '''
+        asyncio.run(self.run_async(duration))
+        return summarize(self.sent, self.elapsed)
+
+
+def main(traders='20', duration='60', path=None):
+    '''
+    Inputs:
+      traders  [str]: Number of concurrent traders
+      duration [str]: Seconds to send transactions for
+      path     [str]: Where to write the summary as json, if anywhere
+    '''
+    market, collateral = deploy_stack(traders=())
+    token = OverlayToken.at(collateral.ovl())
+
+    generator = LoadGenerator(
+        market, collateral,
+        trader_accounts(int(traders), token, collateral),
+        keeper=GOV)
+
+    summary = generator.run(float(duration))
+
+    print(f"{summary['txs']} transactions in {summary['elapsed']:.1f}s, "
+          f"{summary['tx_per_s']:.1f} tx/s")
+
+    for action in ACTIONS + ('update',):
+        if action not in summary:
+            continue
+
+        stats = summary[action]
+        gas, updating = (stats[k] or {'p50': 0.}
+                         for k in ('gas', 'gas_updating'))
+
+        print(f"{action}: {stats['txs']} txs, median gas {gas['p50']:.0f}, "
+              f"{updating['p50']:.0f} paying the update, reverted "
+              f"{stats['revert_rate']:.1%} {stats['reverts']}")
+
+    if path is not None:
+        with open(path, 'w') as f:
+            json.dump(summary, f, indent=2)
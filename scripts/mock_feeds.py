@@ -0,0 +1,136 @@
+'''
+Loads recorded Uniswap V3 feeds into UniswapV3OracleMock pools.
+
+Observations and shims are packed two words per observation and sent in
+chunks small enough to fit in a block. Pools are indexed by the mean spacing
+of the feed so observe can jump straight to the right observation.
+'''
+from brownie import web3
+
+# gas to store one observation and its shim: two fresh storage slots plus
+# calldata and loop overhead
+OBSERVATION_GAS = 50000
+
+# gas held back in each chunk for the transaction and the cardinality write
+CHUNK_OVERHEAD_GAS = 100000
+
+# share of the block gas limit a single chunk may use
+BLOCK_GAS_SHARE = 0.8
+
+# storage slots available in the mock observation array
+MAX_CARDINALITY = 65535
+
+
+def pack_observation(observation, shim):
+    '''
+    Packs an observation and its shim into the two words read by
+    UniswapV3OracleMock.loadObservationsPacked.
+
+    Inputs:
+      observation [list]: [blockTimestamp, tickCumulative,
+                           secondsPerLiquidityCumulativeX128, initialized]
+      shim        [list]: [timestamp, liquidity, tick, cardinality]
+
+    Output:
+      [tuple]: (observation word, shim word)
+    '''
+    timestamp, tick_cumulative, seconds_per_liquidity, initialized = \
+        observation
+    _, liquidity, tick, cardinality = shim
+
+    observation_word = (
+        timestamp
+        | (tick_cumulative & (2**56 - 1)) << 32
+        | seconds_per_liquidity << 88
+        | int(bool(initialized)) << 248
+    )
+
+    shim_word = (
+        liquidity
+        | (tick & (2**24 - 1)) << 128
+        | cardinality << 152
+    )
+
+    return observation_word, shim_word
+
+
+def pack_observations(observations, shims):
+    '''
+    Inputs:
+      observations [list]: Observations in chronological order
+      shims        [list]: Shims matching each observation
+
+    Output:
+      [list]: Interleaved observation and shim words
+    '''
+    packed = []
+    for observation, shim in zip(observations, shims):
+        packed.extend(pack_observation(observation, shim))
+    return packed
+
+
+def chunk_size(gas_limit=None):
+    '''
+    Number of observations that fit in one loading transaction.
+
+    Inputs:
+      gas_limit [int]: Block gas limit, read from the chain if not given
+
+    Output:
+      [int]: Observations per chunk, at least one
+    '''
+    if gas_limit is None:
+        gas_limit = web3.eth.get_block('latest').gasLimit
+
+    budget = int(gas_limit * BLOCK_GAS_SHARE) - CHUNK_OVERHEAD_GAS
+
+    return min(MAX_CARDINALITY, max(1, budget // OBSERVATION_GAS))
+
+
+def index_interval(observations):
+    '''
+    Inputs:
+      observations [list]: Observations in chronological order
+
+    Output:
+      [int]: Mean seconds between observations, at least one
+    '''
+    if len(observations) < 2:
+        return 1
+
+    span = observations[-1][0] - observations[0][0]
+
+    return max(1, span // (len(observations) - 1))
+
+
+def load_observations(pool, observations, shims, sender, gas_limit=None,
+                      indexed=True):
+    '''
+    Loads a feed into a mock pool, splitting it into gas bounded chunks.
+
+    Inputs:
+      pool         [Contract]:   IUniswapV3OracleMock instance
+      observations [list]:       Observations in chronological order
+      shims        [list]:       Shims matching each observation
+      sender       [Account]:    Account sending the transactions
+      gas_limit    [int]:        Block gas limit, read from the chain if not
+                                 given
+      indexed      [bool]:       Whether to build the uniform time index,
+                                 only possible on an empty pool
+
+    Output:
+      [list]: Transaction receipt for each chunk
+    '''
+    assert len(observations) == len(shims), 'observations != shims'
+
+    if indexed and pool.cardinality() == 0:
+        pool.indexObservations(index_interval(observations),
+                               {'from': sender})
+
+    packed = pack_observations(observations, shims)
+    step = 2 * chunk_size(gas_limit)
+
+    return [
+        pool.loadObservationsPacked(packed[i:i + step], {'from': sender})
+        for i in range(0, len(packed), step)
+    ]
@@ -0,0 +1,332 @@
+'''
+Integer reference model of an Overlay V1 market and its OVL collateral
+manager, mirroring the contract arithmetic to the wei.
+
+Prices are inputs: the model is handed the bid and ask of price points
+realized on chain rather than reading feeds. The model covers markets with
+zero lambda, where the cap is static and builds pay no impact.
+'''
+from eth_utils import keccak
+
+from scripts.fixed_point import (
+    ONE,
+    Revert as ModelRevert,
+    div_down,
+    div_up,
+    mul_down,
+    mul_up,
+    pow_up_int,
+)
+
+MIN_COLLAT = 10**14
+
+
+def checked_sub(a, b):
+    if b > a:
+        raise ModelRevert()
+    return a - b
+
+
+def position_id(market, feed, is_long, leverage, price_point):
+    '''
+    OverlayV1OVLCollateral.positionId
+    '''
+    words = [int(str(market), 16), feed, int(is_long), leverage, price_point]
+    return int.from_bytes(
+        keccak(b''.join(w.to_bytes(32, 'big') for w in words)), 'big')
+
+
+class Position:
+    '''
+    Position.Info and the Position library views.
+    '''
+    def __init__(self, market, feed, is_long, leverage, price_point):
+        self.market = market
+        self.feed = feed
+        self.is_long = is_long
+        self.leverage = leverage
+        self.price_point = price_point
+        self.oi_shares = 0
+        self.debt = 0
+        self.cost = 0
+
+    def info(self):
+        return (self.market, self.feed, self.is_long, self.leverage,
+                self.price_point, self.oi_shares, self.debt, self.cost)
+
+    def oi(self, total_oi, total_oi_shares):
+        return div_up(mul_down(self.oi_shares, total_oi), total_oi_shares)
+
+    def value(self, total_oi, total_oi_shares, price_frame):
+        oi = self.oi(total_oi, total_oi_shares)
+        if self.is_long:
+            val = mul_down(oi, price_frame)
+            return val - min(val, self.debt)
+        val = mul_down(oi, 2 * ONE)
+        return val - min(val, self.debt + mul_down(oi, price_frame))
+
+    def notional(self, total_oi, total_oi_shares, price_frame):
+        return self.value(total_oi, total_oi_shares, price_frame) + self.debt
+
+    def is_liquidatable(self, total_oi, total_oi_shares, price_frame,
+                        margin_maintenance):
+        val = self.value(total_oi, total_oi_shares, price_frame)
+        return val < mul_up(self.cost + self.debt, margin_maintenance)
+
+
+class MarketModel:
+    '''
+    OverlayV1Market with the OI, funding and price point bookkeeping of its
+    base contracts.
+    '''
+    def __init__(self, address, k, pbnj, compounding_period, compounded,
+                 updated, price_points, oi_cap, price_frame_cap,
+                 oi_long=0, oi_short=0, oi_long_shares=0, oi_short_shares=0):
+        self.address = address
+        self.k = k
+        self.pbnj = pbnj
+        self.compounding_period = compounding_period
+        self.compounded = compounded
+        self.updated = updated
+        self.price_points = price_points
+        self.oi_cap = oi_cap
+        self.price_frame_cap = price_frame_cap
+        self.oi_long = oi_long
+        self.oi_short = oi_short
+        self.oi_long_shares = oi_long_shares
+        self.oi_short_shares = oi_short_shares
+        self.funding_paid = []
+
+    def epochs(self, now, compounded):
+        compoundings = (now - compounded) // self.compounding_period
+        return (compoundings,
+                compounded + compoundings * self.compounding_period)
+
+    @staticmethod
+    def compute_funding(oi_long, oi_short, epochs, k):
+        if oi_long == 0 and oi_short == 0:
+            return 0, 0, 0
+
+        if epochs == 0:
+            return oi_long, oi_short, 0
+
+        factor = pow_up_int(checked_sub(ONE, mul_up(k, 2 * ONE)), epochs)
+
+        funder, funded = oi_long, oi_short
+        paying_longs = funder <= funded
+        if paying_longs:
+            funder, funded = funded, funder
+
+        if funded == 0:
+            oi_now = mul_down(factor, funder)
+            paid = funder - oi_now
+            funder = oi_now
+        else:
+            imb_now = mul_down(factor, funder - funded)
+            total = funder + funded
+            paid = (funder - funded) // 2
+            funder = (total + imb_now) // 2
+            funded = (total - imb_now) // 2
+
+        if paying_longs:
+            return funded, funder, paid
+        return funder, funded, -paid
+
+    def update(self, now):
+        if now == self.updated:
+            return
+
+        self.price_points += 1
+        self.updated = now
+
+        compoundings, t_compounding = self.epochs(now, self.compounded)
+
+        if 0 < compoundings:
+            self.oi_long, self.oi_short, paid = self.compute_funding(
+                self.oi_long, self.oi_short, compoundings, self.k)
+            self.compounded = t_compounding
+            self.funding_paid.append((self.oi_long, self.oi_short, paid))
+
+    def price_frame(self, is_long, entry, prices):
+        entry_bid, entry_ask = prices(entry)
+        exit_bid, exit_ask = prices(self.price_points - 1)
+        if is_long:
+            return min(div_down(exit_bid, entry_ask), self.price_frame_cap)
+        return div_up(exit_ask, entry_bid)
+
+    def enter_oi(self, now, is_long, collateral, leverage, fee_rate):
+        self.update(now)
+
+        oi = collateral * leverage
+        fee = mul_down(oi, fee_rate)
+        impact = 0
+
+        if collateral < MIN_COLLAT + impact + fee:
+            raise ModelRevert('OVLV1:collat<min')
+
+        collateral_adjusted = collateral - impact - fee
+        oi_adjusted = collateral_adjusted * leverage
+        debt_adjusted = oi_adjusted - collateral_adjusted
+
+        side = self.oi_long if is_long else self.oi_short
+        if side + oi_adjusted > self.oi_cap:
+            raise ModelRevert('OVLV1:>cap')
+
+        if is_long:
+            self.oi_long += oi_adjusted
+            self.oi_long_shares += oi_adjusted
+        else:
+            self.oi_short += oi_adjusted
+            self.oi_short_shares += oi_adjusted
+
+        return (oi_adjusted, collateral_adjusted, debt_adjusted, fee, impact,
+                self.price_points - 1)
+
+    def exit_data(self, now, is_long, entry, prices):
+        self.update(now)
+        if is_long:
+            oi, shares = self.oi_long, self.oi_long_shares
+        else:
+            oi, shares = self.oi_short, self.oi_short_shares
+        return oi, shares, self.price_frame(is_long, entry, prices)
+
+    def exit_oi(self, is_long, oi, oi_shares):
+        if is_long:
+            self.oi_long = checked_sub(self.oi_long, oi)
+            self.oi_long_shares = checked_sub(self.oi_long_shares, oi_shares)
+        else:
+            self.oi_short = checked_sub(self.oi_short, oi)
+            self.oi_short_shares = checked_sub(self.oi_short_shares,
+                                               oi_shares)
+
+
+class CollateralModel:
+    '''
+    OverlayV1OVLCollateral over a single market feed, with the OVL balances
+    it moves.
+    '''
+    def __init__(self, market, fee_rate, margin_maintenance,
+                 margin_reward_rate, max_leverage, balances, total_supply,
+                 fees=0, liquidations=0, feed=0):
+        self.market = market
+        self.feed = feed
+        self.fee_rate = fee_rate
+        self.margin_maintenance = margin_maintenance
+        self.margin_reward_rate = margin_reward_rate
+        self.max_leverage = max_leverage
+        self.balances = dict(balances)
+        self.total_supply = total_supply
+        self.fees = fees
+        self.liquidations = liquidations
+        self.positions = {}
+        self.shares = {}
+
+    def share_balance(self, account, pid):
+        return self.shares.get((account, pid), 0)
+
+    def build(self, now, trader, collateral, leverage, is_long):
+        if leverage > self.max_leverage:
+            raise ModelRevert('OVLV1:lev>max')
+        if leverage == 0:
+            raise ModelRevert('OVLV1:lev==0')
+
+        (oi_adjusted, collateral_adjusted, debt_adjusted, fee, impact,
+         price_point) = self.market.enter_oi(now, is_long, collateral,
+                                             leverage, self.fee_rate)
+
+        pid = position_id(self.market.address, self.feed, is_long, leverage,
+                          price_point)
+        pos = self.positions.setdefault(
+            pid, Position(self.market.address, self.feed, is_long, leverage,
+                          price_point))
+
+        pos.oi_shares += oi_adjusted
+        pos.cost += collateral_adjusted
+        pos.debt += debt_adjusted
+
+        self.fees += fee
+
+        self.balances[trader] = checked_sub(
+            self.balances[trader], collateral_adjusted + impact + fee)
+        self.total_supply -= impact
+        self.shares[(trader, pid)] = \
+            self.share_balance(trader, pid) + oi_adjusted
+
+        return pid, oi_adjusted, debt_adjusted
+
+    def unwind(self, now, trader, pid, shares, prices):
+        if not 0 < shares <= self.share_balance(trader, pid):
+            raise ModelRevert('OVLV1:!shares')
+
+        pos = self.positions[pid]
+
+        if pos.oi_shares == 0:
+            raise ModelRevert('OVLV1:liquidated')
+
+        oi, oi_shares, price_frame = self.market.exit_data(
+            now, pos.is_long, pos.price_point, prices)
+
+        total_pos_shares = pos.oi_shares
+
+        user_notional = shares * pos.notional(oi, oi_shares, price_frame) \
+            // total_pos_shares
+        user_debt = shares * pos.debt // total_pos_shares
+        user_cost = shares * pos.cost // total_pos_shares
+        user_oi = shares * pos.oi(oi, oi_shares) // total_pos_shares
+
+        fee = mul_up(user_notional, self.fee_rate)
+
+        value_adjusted = checked_sub(user_notional, fee)
+        if value_adjusted > user_debt:
+            value_adjusted -= user_debt
+        else:
+            value_adjusted = 0
+            fee = user_notional - user_debt \
+                if user_notional > user_debt else 0
+
+        self.fees += fee
+
+        pos.debt -= user_debt
+        pos.cost -= user_cost
+        pos.oi_shares -= shares
+
+        self.market.exit_oi(pos.is_long, user_oi, shares)
+
+        # the fee is minted with the PnL, to back the fee pot
+        self.total_supply += value_adjusted + fee - user_cost
+        self.balances[trader] += value_adjusted
+        self.shares[(trader, pid)] -= shares
+
+        return user_oi, user_debt
+
+    def liquidate(self, now, pid, rewards_to, prices):
+        pos = self.positions.get(pid)
+
+        if pos is None or pos.oi_shares == 0:
+            raise ModelRevert('OVLV1:liquidated')
+
+        oi, oi_shares, price_frame = self.market.exit_data(
+            now, pos.is_long, pos.price_point, prices)
+
+        if not pos.is_liquidatable(oi, oi_shares, price_frame,
+                                   self.margin_maintenance):
+            raise ModelRevert('OVLV1:!liquidatable')
+
+        value = pos.value(oi, oi_shares, price_frame)
+        burnt = checked_sub(pos.cost, value)
+
+        self.market.exit_oi(pos.is_long, pos.oi(oi, oi_shares),
+                            pos.oi_shares)
+
+        pos.oi_shares = 0
+        pos.debt = 0
+
+        reward = mul_up(value, self.margin_reward_rate)
+
+        self.liquidations += value - reward
+
+        self.total_supply -= burnt
+        self.balances[rewards_to] = \
+            self.balances.get(rewards_to, 0) + reward
+
+        return reward
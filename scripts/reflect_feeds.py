@@ -1,113 +1,46 @@
-import math
-import os
 import json
-import brownie
-from brownie import \
-    chain, \
-    interface, \
-    accounts
-
-START = chain.time()
-ONE_DAY = 86400
-
-
-def reflect_feed(path):
-    base = os.path.dirname(os.path.abspath(__file__))
-    raw_uni_path = os.path.join(base, path + '_raw_uni.json')
-    with open(os.path.normpath(raw_uni_path)) as f:
-        feed = json.load(f)
-
-    feed.reverse()
-
-    chain.mine(timestamp=START)
-    now = chain.time()
-    earliest = feed[0]['observation'][0]
-
-    print("len feed", len(feed))
-
-    print("feed12", feed[311])
-
-    obs = []
-    shims = []
-
-    mock_start = now - 3600
-
-    for f in feed:
-        ob = f['observation']
-        shim = f['shim']
-        if earliest + ONE_DAY < ob[0]:
-            break
-        time_diff = ob[0] - earliest
-        ob[0] = shim[0] = mock_start + time_diff
-        obs.append(ob)
-        shims.append(shim)
-
-    factory = accounts[6].deploy(getattr(brownie, 'UniswapV3FactoryMock'))
-
-    IUniswapV3OracleMock = getattr(interface, 'IUniswapV3OracleMock')
-
-    zeroth = "0x0000000000000000000000000000000000000000"
-    factory.createPool(zeroth, zeroth)
-
-    mock = IUniswapV3OracleMock(factory.allPools(0))
-
-    mock.loadObservations(obs, shims, {'from': accounts[0]})
-
-    breadth = obs[-1][0] - obs[0][0] - 3600
-
-    timestamps = []
-    ten_mins = []
-    one_hrs = []
-    spots = []
-    bids = []
-    asks = []
-
-    for x in range(0, breadth, 60):
-
-        time = START + x
-
-        print("time", time, "x", x, "breadth", breadth)
+import os
+from brownie import chain
+from scripts.frame_feeds import (
+    MACRO_WINDOW,
+    ONE_DAY,
+    frame_window,
+    reflect_exact,
+    write
+)
 
-        brownie.chain.mine(timestamp=time)
+WETH = '0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2'
+DAI = '0x6B175474E89094C44Da98b954EedeAC495271d0F'
+AXS = '0xBB0E17EF65F82Ab018d8EDd776e8DD940327B28b'
 
-        pbnj = .00573
+BASE_AMOUNT = 10**18
 
-        ob = mock.observe([3600, 600, 1, 0])
 
-        ten_min = 1.0001 ** ((ob[0][3] - ob[0][1]) / 600)
-        one_hr = 1.0001 ** ((ob[0][3] - ob[0][0]) / 3600)
-        spot = 1.0001 ** ((ob[0][3] - ob[0][2]))
-        bid = min(ten_min, one_hr) * math.exp(-pbnj)
-        ask = max(ten_min, one_hr) * math.exp(pbnj)
+def reflect_feed(path, base, quote):
+    '''
+    Frames the first day of a raw feed so the macro window is available as
+    of now on the connected chain, writing the framed feed and reflections.
 
-        timestamps.append(time)
-        ten_mins.append(ten_min)
-        one_hrs.append(one_hr)
-        spots.append(spot)
-        bids.append(bid)
-        asks.append(ask)
+    The float reflection is the one the market test fixtures read. The
+    exact reflection is written next to it, with the bids and asks a market
+    quoting BASE_AMOUNT of base in quote reads, to the wei.
 
-    reflected = {
-        'timestamp': timestamps,
-        'one_hr': one_hrs,
-        'ten_min': ten_mins,
-        'spot': spots,
-        'bids': bids,
-        'asks': asks
-    }
+    Inputs:
+      path  [str]: Feed path prefix relative to scripts/
+      base  [str]: Market base, the pool token priced
+      quote [str]: Market quote, the pool token priced in
+    '''
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    path = os.path.normpath(os.path.join(base_dir, path))
 
-    mock = {
-        'observations': obs,
-        'shims': shims
-    }
+    framed_path, _ = frame_window(path, '', 0, ONE_DAY,
+                                  mock_start=chain.time() - MACRO_WINDOW)
 
-    reflected_path = os.path.join(base, path + '_reflected.json')
-    with open(os.path.normpath(reflected_path), 'w+') as f:
-        json.dump(reflected, f)
+    with open(framed_path) as f:
+        framed = json.load(f)
 
-    raw_uni_framed_path = os.path.join(base, path + '_raw_uni_framed.json')
-    with open(os.path.normpath(raw_uni_framed_path), 'w+') as f:
-        json.dump(mock, f)
+    write(path + '_reflected_exact.json',
+          reflect_exact(framed, BASE_AMOUNT, base, quote))
 
 
 def main():
@@ -116,6 +49,6 @@ def main():
 
     dai_weth_path = '../feeds/univ3_dai_weth'
 
-    reflect_feed(dai_weth_path)
+    reflect_feed(dai_weth_path, DAI, WETH)
 
-    reflect_feed(axs_weth_path)
+    reflect_feed(axs_weth_path, AXS, WETH)
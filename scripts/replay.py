@@ -0,0 +1,529 @@
+'''
+Replays an order flow of builds, unwinds and liquidations against the
+Overlay stack, deployed once on the mock feeds.
+
+scripts/deploy.py drives the market a transaction at a time, waiting on
+each receipt, and moves time with chain.mine, which takes a snapshot of
+the chain every call. Replay instead stops ganache's miner and, for each
+timestamp of the order flow, sends every order as one JSON-RPC batch of
+eth_sendTransaction and mines them into a block with a single evm_mine at
+that timestamp. The receipts and the market views at the block are each
+read with one more batch. Orders on a position built in the same block go
+out in a following block at the same timestamp, once its Build gives the
+position id. Orders on positions never built are skipped.
+
+Each transaction is a row of the columns returned by Replay.run: its gas,
+the oi and debt of its Build, Unwind or Liquidate, the funding it paid,
+and the market's oi, oi cap and price point at its block.
+
+    brownie run replay main synthetic replay.json
+    brownie run replay main orders.csv replay.json
+
+An order flow csv has the fields of Order as its header. An unwind with
+no shares unwinds all the account's shares of the position.
+'''
+import csv
+import json
+import os
+import random
+import time
+from collections import namedtuple
+from itertools import groupby
+
+from brownie import (
+    OverlayToken,
+    OverlayV1Mothership,
+    OverlayV1OVLCollateral,
+    OverlayV1UniswapV3Market,
+    chain,
+    web3
+)
+
+from scripts.deploy import (
+    ALICE,
+    AMOUNT_IN,
+    BOB,
+    BRRRR_EXPECTED,
+    BRRRR_WINDOW_MACRO,
+    BRRRR_WINDOW_MICRO,
+    COMPOUND_PERIOD,
+    FEE,
+    FEE_BURN_RATE,
+    FEE_TO,
+    FEED_OWNER,
+    GOV,
+    K,
+    LAMBDA,
+    MARGIN_BURN_RATE,
+    MARGIN_MAINTENANCE,
+    MARGIN_REWARD_RATE,
+    MAX_LEVERAGE,
+    PRICE_FRAME_CAP,
+    PRICE_WINDOW_MACRO,
+    PRICE_WINDOW_MICRO,
+    SPREAD,
+    STATIC_CAP,
+    TOKEN_TOTAL_SUPPLY,
+    WETH
+)
+from scripts.event_pipeline import EventPipeline
+from scripts.twap_listener import batch_requests
+from scripts.warm_chain import (
+    FEED_FILES,
+    FEEDS,
+    cached_feeds,
+    load_feeds,
+    read_feed_info
+)
+
+OVL_PRICE_PERIOD = 600
+
+# gas of each transaction, not estimated since the orders in a block build
+# on each other
+GAS_LIMIT = 3000000
+
+# blocks to mine at a timestamp before giving up on its transactions
+MAX_BLOCKS = 8
+
+Order = namedtuple('Order', ['timestamp', 'action', 'account', 'position',
+                             'collateral', 'leverage', 'is_long', 'shares'],
+                   defaults=[None] * 4)
+
+ACTIONS = ('build', 'unwind', 'liquidate', 'update')
+
+COLUMNS = [
+    'block',
+    'timestamp',
+    'action',
+    'account',
+    'position',
+    'position_id',
+    'status',
+    'gas_used',
+    'oi',
+    'debt',
+    'funding_paid',
+    'oi_long',
+    'oi_short',
+    'oi_cap',
+    'bid',
+    'ask',
+    'depth',
+]
+
+
+def parse_order(row):
+    '''
+    Inputs:
+      row [dict]: Order flow csv row
+
+    Output:
+      [Order]: Order of the row
+    '''
+    def integer(value):
+        return None if value in (None, '') else int(value)
+
+    if row['action'] not in ACTIONS:
+        raise ValueError(f"unknown action {row['action']}")
+
+    return Order(
+        timestamp=int(row['timestamp']),
+        action=row['action'],
+        account=row['account'],
+        position=row.get('position') or None,
+        collateral=integer(row.get('collateral')),
+        leverage=integer(row.get('leverage')),
+        is_long=None if row.get('is_long') in (None, '')
+        else row['is_long'].lower() in ('1', 'true'),
+        shares=integer(row.get('shares')),
+    )
+
+
+def load_orders(path):
+    '''
+    Output:
+      [list]: Orders of the csv at path, by timestamp
+    '''
+    with open(path) as f:
+        orders = [parse_order(row) for row in csv.DictReader(f)]
+
+    return sorted(orders, key=lambda o: o.timestamp)
+
+
+def write_orders(orders, path):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(Order._fields)
+        writer.writerows(['' if v is None else v for v in o] for o in orders)
+
+
+def synthetic_orders(start, end, accounts, builds=100, hold=(600, 7200),
+                     collateral=(10**18, 100 * 10**18),
+                     leverages=(1, 2, 5, 10), liquidations=.1, seed=0):
+    '''
+    Inputs:
+      start        [int]:   First timestamp of the flow
+      end          [int]:   Timestamp the flow ends before
+      accounts     [list]:  Addresses of the traders and keepers
+      builds       [int]:   Number of positions built
+      hold         [tuple]: Least and most seconds a position is held
+      collateral   [tuple]: Least and most OVL collateral of a build
+      leverages    [tuple]: Leverages to build at
+      liquidations [float]: Chance of a keeper trying to liquidate a
+                            leveraged position while it is held
+      seed         [int]:   Seed of the flow
+
+    Output:
+      [list]: Orders by timestamp, unwinding each position built unless it
+              is held past end
+    '''
+    rng = random.Random(seed)
+    orders = []
+
+    for i in range(builds):
+        built = rng.randrange(start, end)
+        account = rng.choice(accounts)
+        leverage = rng.choice(leverages)
+        position = f'p{i}'
+
+        orders.append(Order(built, 'build', account, position,
+                            rng.randint(*collateral), leverage,
+                            rng.random() < .5))
+
+        unwound = built + rng.randint(*hold)
+
+        if leverage > 1 and rng.random() < liquidations:
+            orders.append(Order(rng.randint(built + 1, unwound),
+                                'liquidate', rng.choice(accounts), position))
+
+        if unwound < end:
+            orders.append(Order(unwound, 'unwind', account, position))
+
+    return sorted(orders, key=lambda o: o.timestamp)
+
+
+def feed_window():
+    '''
+    Output:
+      [tuple]: First and last timestamps of the reflected market feed
+    '''
+    with open(os.path.join(FEEDS, FEED_FILES[1])) as f:
+        timestamps = json.load(f)['timestamp']
+
+    return timestamps[0], timestamps[-1]
+
+
+def deploy_stack(gov=GOV, fee_to=FEE_TO, feed_owner=FEED_OWNER,
+                 traders=(ALICE, BOB)):
+    '''
+    Deploys the market and OVL collateral manager on the mock feeds, reusing
+    those of a warm chain, at the start of the feed window.
+
+    Inputs:
+      gov        [Account]: Account deploying and governing the stack
+      fee_to     [Account]: Account fees are sent to
+      feed_owner [Account]: Account loading the mock feeds
+      traders    [tuple]:   Accounts minted OVL, with the collateral manager
+                            approved to spend it
+
+    Output:
+      [tuple]: (market, collateral manager)
+    '''
+    _, market_feed, ovl_feed = cached_feeds() \
+        or load_feeds(feed_owner, read_feed_info())
+
+    chain.mine(timestamp=feed_window()[0])
+
+    ovl = gov.deploy(OverlayToken)
+
+    for trader in traders:
+        ovl.mint(trader, TOKEN_TOTAL_SUPPLY / len(traders), {'from': gov})
+
+    mothership = gov.deploy(OverlayV1Mothership, ovl, fee_to, FEE,
+                            FEE_BURN_RATE, MARGIN_BURN_RATE)
+
+    ovl.grantRole(ovl.ADMIN_ROLE(), mothership, {'from': gov})
+
+    market = gov.deploy(OverlayV1UniswapV3Market, mothership, ovl_feed,
+                        market_feed, WETH, WETH, AMOUNT_IN,
+                        PRICE_WINDOW_MACRO, PRICE_WINDOW_MICRO,
+                        PRICE_FRAME_CAP)
+
+    market.setEverything(K, SPREAD, COMPOUND_PERIOD, LAMBDA, STATIC_CAP,
+                         BRRRR_EXPECTED, BRRRR_WINDOW_MACRO,
+                         BRRRR_WINDOW_MICRO, {'from': gov})
+
+    market.setOvlPricePeriod(OVL_PRICE_PERIOD, {'from': gov})
+
+    mothership.initializeMarket(market, {'from': gov})
+
+    collateral = gov.deploy(OverlayV1OVLCollateral, 'uri', mothership)
+
+    collateral.setMarketInfo(market, 0, MARGIN_MAINTENANCE,
+                             MARGIN_REWARD_RATE, MAX_LEVERAGE, {'from': gov})
+
+    mothership.initializeCollateral(collateral, {'from': gov})
+
+    market.addCollateral(collateral, {'from': gov})
+
+    for trader in traders:
+        ovl.approve(collateral, 1e50, {'from': trader})
+
+    return market, collateral
+
+
+class Replay:
+    '''
+    Inputs:
+      market     [Contract]: Market the orders build on
+      collateral [Contract]: Collateral manager the orders are sent to
+      gas_limit  [int]:      Gas of each transaction
+    '''
+    def __init__(self, market, collateral, gas_limit=GAS_LIMIT):
+        self.market = market
+        self.collateral = collateral
+        self.gas_limit = gas_limit
+
+        self.pipeline = EventPipeline([market, collateral])
+
+        self.views = [market.oi, market.oiCap, market.pricePointCurrent]
+        self.view_data = [view.encode_input() for view in self.views]
+
+        # position id of each position built, by its name in the order flow
+        self.ids = {}
+
+        self.nonces = {}
+        self.timestamp = None
+
+        self.columns = {column: [] for column in COLUMNS}
+        self.skipped = []
+        self.blocks = 0
+        self.elapsed = 0.
+
+    def run(self, orders):
+        '''
+        Inputs:
+          orders [list]: Orders to replay, timestamps before the latest
+                         block's replayed at it
+
+        Output:
+          [dict]: Column of each transaction's values by name
+        '''
+        started = time.time()
+
+        self.nonces = {}
+        self.timestamp = web3.eth.get_block('latest').timestamp
+
+        web3.provider.make_request('miner_stop', [])
+
+        try:
+            orders = sorted(orders, key=lambda o: o.timestamp)
+            for timestamp, block in groupby(orders, lambda o: o.timestamp):
+                self.replay_block(max(timestamp, self.timestamp), list(block))
+        finally:
+            web3.provider.make_request('miner_start', [])
+
+            # brownie keeps the chain's time as an offset from the clock
+            chain.sleep(0)
+
+        self.elapsed += time.time() - started
+
+        return self.columns
+
+    def replay_block(self, timestamp, orders):
+        while orders:
+            building = {o.position for o in orders if o.action == 'build'}
+
+            ready, deferred = [], []
+
+            for order in orders:
+                if order.action not in ('unwind', 'liquidate') \
+                        or order.position in self.ids:
+                    ready.append(order)
+                elif order.position in building:
+                    deferred.append(order)
+                else:
+                    self.skipped.append(order)
+
+            if ready:
+                self.mine(timestamp, ready)
+
+            orders = deferred
+
+    def encode(self, order):
+        '''
+        Output:
+          [tuple]: (to, data) of the order's transaction
+        '''
+        if order.action == 'update':
+            return self.market.address, self.market.update.encode_input()
+
+        collateral = self.collateral
+
+        if order.action == 'build':
+            return collateral.address, collateral.build.encode_input(
+                self.market.address, order.collateral, order.leverage,
+                order.is_long, 0)
+
+        position_id = self.ids[order.position]
+
+        if order.action == 'liquidate':
+            return collateral.address, collateral.liquidate.encode_input(
+                position_id, order.account)
+
+        shares = order.shares
+        if shares is None:
+            shares = collateral.balanceOf(order.account, position_id)
+
+        return collateral.address, collateral.unwind.encode_input(
+            position_id, shares)
+
+    def nonce(self, account):
+        if account not in self.nonces:
+            self.nonces[account] = web3.eth.get_transaction_count(account)
+
+        nonce = self.nonces[account]
+        self.nonces[account] += 1
+        return nonce
+
+    def mine(self, timestamp, orders):
+        txs = []
+
+        for order in orders:
+            to, data = self.encode(order)
+            txs.append([{
+                'from': order.account,
+                'to': to,
+                'data': data,
+                'gas': hex(self.gas_limit),
+                'nonce': hex(self.nonce(order.account)),
+            }])
+
+        sent = batch_requests('eth_sendTransaction', txs)
+
+        errors = [r['error'].get('message') for r in sent if 'error' in r]
+        if errors:
+            raise RuntimeError(f'orders at {timestamp} not sent: {errors}')
+
+        hashes = [r['result'] for r in sent]
+        receipts = [None] * len(hashes)
+
+        for _ in range(MAX_BLOCKS):
+            # ganache reports the reverts of the block's transactions as an
+            # error, their receipts are read below either way
+            web3.provider.make_request('evm_mine', [timestamp])
+            self.blocks += 1
+
+            pending = [i for i, r in enumerate(receipts) if r is None]
+            responses = batch_requests('eth_getTransactionReceipt',
+                                       [[hashes[i]] for i in pending])
+
+            for i, response in zip(pending, responses):
+                receipts[i] = response.get('result')
+
+            if all(receipts):
+                break
+        else:
+            raise RuntimeError(f'orders at {timestamp} still pending after '
+                               f'{MAX_BLOCKS} blocks')
+
+        self.timestamp = timestamp
+
+        blocks = sorted({int(r['blockNumber'], 16) for r in receipts})
+        views = self.read_views(blocks)
+
+        for order, receipt in zip(orders, receipts):
+            self.record(order, receipt, views)
+
+    def read_views(self, blocks):
+        '''
+        Output:
+          [dict]: Market's oi, oi cap and price point at each block
+        '''
+        responses = batch_requests('eth_call', [
+            [{'to': self.market.address, 'data': data}, hex(block)]
+            for block in blocks for data in self.view_data
+        ])
+
+        n = len(self.views)
+        views = {}
+
+        for i, block in enumerate(blocks):
+            oi, oi_cap, price_point = [
+                view.decode_output(r['result']) if 'result' in r else None
+                for view, r in zip(self.views, responses[i * n:(i + 1) * n])
+            ]
+            views[block] = (oi, oi_cap, price_point)
+
+        return views
+
+    def record(self, order, receipt, views):
+        block = int(receipt['blockNumber'], 16)
+
+        events = [e for e in map(self.pipeline.decode, receipt['logs'])
+                  if e is not None]
+
+        event = next((e for e in events
+                      if e.name in ('Build', 'Unwind', 'Liquidate')), None)
+
+        if order.action == 'build' and event is not None:
+            self.ids[order.position] = event.args['positionId']
+
+        oi, oi_cap, price_point = views[block]
+        oi_long, oi_short = (None, None) if oi is None else oi[:2]
+        bid, ask, depth = (None,) * 3 if price_point is None else price_point
+
+        row = {
+            'block': block,
+            'timestamp': self.timestamp,
+            'action': order.action,
+            'account': order.account,
+            'position': order.position,
+            'position_id': self.ids.get(order.position),
+            'status': int(receipt['status'], 16),
+            'gas_used': int(receipt['gasUsed'], 16),
+            'oi': None if event is None else event.args['oi'],
+            'debt': None if event is None else event.args.get('debt'),
+            'funding_paid': sum(e.args['fundingPaid'] for e in events
+                                if e.name == 'FundingPaid'),
+            'oi_long': oi_long,
+            'oi_short': oi_short,
+            'oi_cap': oi_cap,
+            'bid': bid,
+            'ask': ask,
+            'depth': depth,
+        }
+
+        for column, value in row.items():
+            self.columns[column].append(value)
+
+
+def write_columns(columns, path):
+    with open(path, 'w') as f:
+        json.dump(columns, f)
+
+
+def main(orders='synthetic', path='replay.json'):
+    '''
+    Inputs:
+      orders [str]: Order flow csv, or synthetic for a flow generated over
+                    the feed window
+      path   [str]: Where to write the replay's columns as json
+    '''
+    market, collateral = deploy_stack()
+
+    start, end = feed_window()
+
+    if orders == 'synthetic':
+        orders = synthetic_orders(start, end, [str(ALICE), str(BOB)])
+    else:
+        orders = load_orders(orders)
+
+    replay = Replay(market, collateral)
+    columns = replay.run(o for o in orders if start <= o.timestamp <= end)
+
+    write_columns(columns, path)
+
+    print(f"replayed {len(columns['block'])} transactions in "
+          f"{replay.blocks} blocks over {end - start}s of feed in "
+          f"{replay.elapsed:.1f}s, {len(replay.skipped)} orders skipped")
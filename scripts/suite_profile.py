@@ -0,0 +1,183 @@
+'''
+Profiles a test run: wall time of each test and fixture, and the RPC
+requests they make to ganache by method.
+
+Every request brownie sends goes through the provider's make_request,
+including evm_snapshot, evm_revert and evm_mine which skip the web3
+middlewares, so `SuiteProfile.wrap` times requests there. Time a test or
+fixture spends outside of RPC is Python: hypothesis, event decoding, trace
+analysis and the test body. A test's wall time includes the setup of the
+fixtures it requests, which is also reported as its setup time.
+
+    brownie test --suite-profile profile.csv
+    python -m scripts.suite_profile profile.csv [column] [kind]
+
+prints the rows of a report sorted by column, largest first, optionally
+only those of one kind: test, fixture or rpc.
+'''
+import csv
+import sys
+import time
+from contextlib import contextmanager
+
+METHODS = ('eth_call', 'eth_sendTransaction', 'evm_snapshot', 'evm_revert',
+           'evm_mine')
+
+COLUMNS = ('kind', 'name', 'count', 'wall', 'setup', 'python', 'rpc',
+           'rpc_calls') + METHODS
+
+SECONDS = ('wall', 'setup', 'python', 'rpc')
+
+
+def new_row():
+    return {'count': 0, 'wall': 0., 'setup': 0., 'rpc': 0., 'calls': {}}
+
+
+class SuiteProfile:
+    '''
+    Wall and RPC time of tests, fixtures and RPC methods.
+    '''
+    def __init__(self):
+        # (kind, name) -> row
+        self.rows = {}
+
+        # rows of the tests and fixtures running
+        self.running = []
+
+    def row(self, kind, name):
+        return self.rows.setdefault((kind, name), new_row())
+
+    def wrap(self, provider):
+        '''
+        Times the requests of a provider, once.
+        '''
+        if provider is None or hasattr(provider.make_request, 'profile'):
+            return
+
+        make_request = provider.make_request
+
+        def timed_request(method, params):
+            start = time.perf_counter()
+            try:
+                return make_request(method, params)
+            finally:
+                self.record(method, time.perf_counter() - start)
+
+        timed_request.profile = self
+        provider.make_request = timed_request
+
+    def record(self, method, elapsed):
+        method_row = self.row('rpc', method)
+        method_row['count'] += 1
+        method_row['wall'] += elapsed
+
+        for row in self.running + [method_row]:
+            row['rpc'] += elapsed
+            row['calls'][method] = row['calls'].get(method, 0) + 1
+
+    @contextmanager
+    def span(self, kind, name):
+        '''
+        Times a test or fixture, and the requests made while it runs.
+        '''
+        row = self.row(kind, name)
+        self.running.append(row)
+        start = time.perf_counter()
+
+        try:
+            yield row
+        finally:
+            row['count'] += 1
+            row['wall'] += time.perf_counter() - start
+            self.running.pop()
+
+    def dump(self):
+        '''
+        Output:
+          [list]: [kind, name, row] of each row, for xdist workeroutput
+        '''
+        return [[kind, name, row] for (kind, name), row in self.rows.items()]
+
+    def merge(self, dumped):
+        '''
+        Adds the rows of another profile's dump.
+        '''
+        for kind, name, other in dumped:
+            row = self.row(kind, name)
+            for key in ['count', 'wall', 'setup', 'rpc']:
+                row[key] += other[key]
+            for method, calls in other['calls'].items():
+                row['calls'][method] = row['calls'].get(method, 0) + calls
+
+    def table(self, kind=None, column='wall'):
+        '''
+        Output:
+          [list]: Rows of the report as dicts keyed by COLUMNS, sorted by
+                  column descending
+        '''
+        rows = []
+
+        for (row_kind, name), row in self.rows.items():
+            if kind is not None and row_kind != kind:
+                continue
+
+            rows.append(dict(
+                kind=row_kind,
+                name=name,
+                count=row['count'],
+                wall=row['wall'],
+                setup=row['setup'],
+                python=max(0., row['wall'] - row['rpc'])
+                if row_kind != 'rpc' else 0.,
+                rpc=row['rpc'],
+                rpc_calls=sum(row['calls'].values()),
+                **{method: row['calls'].get(method, 0) for method in METHODS}
+            ))
+
+        return sorted(rows, key=lambda row: -row[column])
+
+    def write_csv(self, path):
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, COLUMNS)
+            writer.writeheader()
+            writer.writerows(self.table())
+
+
+def format_rows(rows, n=None):
+    '''
+    Output:
+      [list]: Lines of rows aligned under a header, at most n rows
+    '''
+    lines = [f"{'name':<64}{'count':>7}{'wall':>9}{'setup':>9}"
+             f"{'python':>9}{'rpc':>9}{'calls':>8}"]
+
+    for row in rows[:n]:
+        lines.append(f"{row['name'][-64:]:<64}{row['count']:>7}"
+                     f"{row['wall']:>9.3f}{row['setup']:>9.3f}"
+                     f"{row['python']:>9.3f}{row['rpc']:>9.3f}"
+                     f"{row['rpc_calls']:>8}")
+
+    return lines
+
+
+def read_csv(path):
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+
+    for row in rows:
+        for column in COLUMNS[2:]:
+            row[column] = (float if column in SECONDS else int)(row[column])
+
+    return rows
+
+
+def main(path, column='wall', kind=None):
+    rows = [row for row in read_csv(path)
+            if kind is None or row['kind'] == kind]
+
+    for line in format_rows(sorted(rows, key=lambda row: -row[column])):
+        print(line)
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
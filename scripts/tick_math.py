@@ -0,0 +1,244 @@
+'''
+Exact port of TickMath.getSqrtRatioAtTick, FullMath.mulDiv and
+OracleLibraryV2.getQuoteAtTick, for single ticks and numpy arrays of
+them.
+
+Prices come out as the markets' _tickToPrice and the OVL price read them,
+to the wei, where 1.0001 ** tick is off in the last digits. Reverts raise
+scripts.fixed_point.Revert.
+
+A feed only visits a narrow band of ticks, so TickPrices quotes every tick
+of a band once and then prices ticks by table lookup:
+
+    prices = TickPrices(low, high, 10**18, base, quote)
+    prices.price(tick)
+    prices.prices(ticks)
+'''
+import numpy as np
+
+from scripts.fixed_point import MAX_UINT256, Revert
+
+MIN_TICK = -887272
+MAX_TICK = 887272
+
+MIN_SQRT_RATIO = 4295128739
+MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
+
+MAX_UINT128 = 2**128 - 1
+
+Q32 = 2**32
+Q64 = 2**64
+Q128 = 2**128
+Q192 = 2**192
+
+# sqrt(1.0001) ** -(2 ** i) as Q128.128, for bit 2 ** i of an absolute tick
+RATIO_BIT_0 = 0xfffcb933bd6fad37aa2d162d1a594001
+RATIOS = (
+    (0x2, 0xfff97272373d413259a46990580e213a),
+    (0x4, 0xfff2e50f5f656932ef12357cf3c7fdcc),
+    (0x8, 0xffe5caca7e10e4e61c3624eaa0941cd0),
+    (0x10, 0xffcb9843d60f6159c9db58835c926644),
+    (0x20, 0xff973b41fa98c081472e6896dfb254c0),
+    (0x40, 0xff2ea16466c96a3843ec78b326b52861),
+    (0x80, 0xfe5dee046a99a2a811c461f1969c3053),
+    (0x100, 0xfcbe86c7900a88aedcffc83b479aa3a4),
+    (0x200, 0xf987a7253ac413176f2b074cf7815e54),
+    (0x400, 0xf3392b0822b70005940c7a398e4b70f3),
+    (0x800, 0xe7159475a2c29b7443b29c7fa6e889d9),
+    (0x1000, 0xd097f3bdfd2022b8845ad8f792aa5825),
+    (0x2000, 0xa9f746462d870fdf8a65dc1f90e061e5),
+    (0x4000, 0x70d869a156d2a1b890bb3df62baf32f7),
+    (0x8000, 0x31be135f97d08fd981231505542fcfa6),
+    (0x10000, 0x9aa508b5b7a84e1c677de54f3e99bc9),
+    (0x20000, 0x5d6af8dedb81196699c329225ee604),
+    (0x40000, 0x2216e584f5fa1ea926041bedfe98),
+    (0x80000, 0x48a170391f7dc42444e8fa2),
+)
+
+
+def get_sqrt_ratio_at_tick(tick):
+    '''
+    Output:
+      [int]: sqrt(1.0001 ** tick) as a Q64.96
+    '''
+    abs_tick = abs(tick)
+    if abs_tick > MAX_TICK:
+        raise Revert('T')
+
+    ratio = RATIO_BIT_0 if abs_tick & 0x1 else Q128
+    for bit, factor in RATIOS:
+        if abs_tick & bit:
+            ratio = ratio * factor >> 128
+
+    if tick > 0:
+        ratio = MAX_UINT256 // ratio
+
+    return (ratio >> 32) + (0 if ratio % Q32 == 0 else 1)
+
+
+def mul_div(a, b, denominator):
+    '''
+    FullMath.mulDiv: floor(a * b / denominator) with a full precision
+    product, reverting if the result overflows uint256.
+    '''
+    if denominator == 0:
+        raise Revert()
+
+    result = a * b // denominator
+    if result > MAX_UINT256:
+        raise Revert()
+
+    return result
+
+
+def is_before(base_token, quote_token):
+    '''
+    Output:
+      [bool]: Whether base_token < quote_token as solidity compares
+              addresses
+    '''
+    return int(str(base_token), 16) < int(str(quote_token), 16)
+
+
+def quote_at_sqrt_ratio(sqrt_ratio_x96, base_amount, base_before):
+    if sqrt_ratio_x96 <= MAX_UINT128:
+        ratio_x192 = sqrt_ratio_x96 * sqrt_ratio_x96
+        return mul_div(ratio_x192, base_amount, Q192) if base_before \
+            else mul_div(Q192, base_amount, ratio_x192)
+
+    ratio_x128 = mul_div(sqrt_ratio_x96, sqrt_ratio_x96, Q64)
+    return mul_div(ratio_x128, base_amount, Q128) if base_before \
+        else mul_div(Q128, base_amount, ratio_x128)
+
+
+def get_quote_at_tick(tick, base_amount, base_token, quote_token):
+    '''
+    OracleLibraryV2.getQuoteAtTick, and the markets' _tickToPrice.
+
+    Output:
+      [int]: Amount of quote_token received for base_amount of base_token
+    '''
+    return quote_at_sqrt_ratio(get_sqrt_ratio_at_tick(tick), base_amount,
+                               is_before(base_token, quote_token))
+
+
+def consult_tick(tick_cumulative_delta, period):
+    '''
+    OracleLibraryV2.consult: mean tick over period, rounded to negative
+    infinity.
+    '''
+    if period == 0:
+        raise Revert('BP')
+
+    tick = mean_tick(tick_cumulative_delta, period)
+    if tick_cumulative_delta < 0 and tick_cumulative_delta % period != 0:
+        tick -= 1
+
+    return tick
+
+
+def mean_tick(tick_cumulative_delta, window):
+    '''
+    Mean tick over window as the markets take their TWAPs, rounded toward
+    zero.
+    '''
+    tick = abs(tick_cumulative_delta) // window
+    return tick if tick_cumulative_delta >= 0 else -tick
+
+
+def sqrt_ratios_at_ticks(ticks):
+    '''
+    Output:
+      [ndarray]: get_sqrt_ratio_at_tick of each tick, as python ints
+    '''
+    ticks = np.asarray(ticks, dtype=np.int64)
+    abs_ticks = np.abs(ticks)
+
+    if (abs_ticks > MAX_TICK).any():
+        raise Revert('T')
+
+    ratios = np.full(ticks.shape, Q128, dtype=object)
+    ratios[abs_ticks & 0x1 != 0] = RATIO_BIT_0
+
+    for bit, factor in RATIOS:
+        taken = abs_ticks & bit != 0
+        ratios[taken] = ratios[taken] * factor >> 128
+
+    positive = ticks > 0
+    ratios[positive] = MAX_UINT256 // ratios[positive]
+
+    # (ratio >> 32) rounded up, as the library does
+    return (ratios + (Q32 - 1)) >> 32
+
+
+def quotes_at_ticks(ticks, base_amount, base_token, quote_token):
+    '''
+    Output:
+      [ndarray]: get_quote_at_tick of each tick, as python ints
+    '''
+    sqrt_ratios = sqrt_ratios_at_ticks(ticks)
+    base_before = is_before(base_token, quote_token)
+
+    out = np.empty(sqrt_ratios.shape, dtype=object)
+
+    small = sqrt_ratios <= MAX_UINT128
+    ratios_x192 = sqrt_ratios[small] * sqrt_ratios[small]
+    out[small] = ratios_x192 * base_amount // Q192 if base_before \
+        else Q192 * base_amount // ratios_x192
+
+    ratios_x128 = sqrt_ratios[~small] * sqrt_ratios[~small] // Q64
+    out[~small] = ratios_x128 * base_amount // Q128 if base_before \
+        else Q128 * base_amount // ratios_x128
+
+    if (out > MAX_UINT256).any():
+        raise Revert()
+
+    return out
+
+
+class TickPrices:
+    '''
+    Quotes of base_amount of base_token in quote_token at each tick from
+    low to high, quoting ticks outside of them as they are asked for.
+    '''
+    def __init__(self, low, high, base_amount, base_token, quote_token):
+        self.low = low
+        self.high = high
+        self.base_amount = base_amount
+        self.base_token = base_token
+        self.quote_token = quote_token
+
+        self.table = quotes_at_ticks(np.arange(low, high + 1), base_amount,
+                                     base_token, quote_token)
+
+    @classmethod
+    def for_ticks(cls, ticks, base_amount, base_token, quote_token):
+        '''
+        Output:
+          [TickPrices]: Prices over the range of the ticks observed
+        '''
+        ticks = np.asarray(ticks, dtype=np.int64)
+        return cls(int(ticks.min()), int(ticks.max()), base_amount,
+                   base_token, quote_token)
+
+    def price(self, tick):
+        if self.low <= tick <= self.high:
+            return self.table[tick - self.low]
+
+        return get_quote_at_tick(tick, self.base_amount, self.base_token,
+                                 self.quote_token)
+
+    def prices(self, ticks):
+        '''
+        Output:
+          [ndarray]: Price at each tick, as python ints
+        '''
+        ticks = np.asarray(ticks, dtype=np.int64)
+        inside = (ticks >= self.low) & (ticks <= self.high)
+
+        out = np.empty(ticks.shape, dtype=object)
+        out[inside] = self.table[ticks[inside] - self.low]
+        out[~inside] = quotes_at_ticks(ticks[~inside], self.base_amount,
+                                       self.base_token, self.quote_token)
+
+        return out
@@ -0,0 +1,144 @@
+'''
+TWAP ticks and quotes of many Uniswap V3 pools over many windows, read in
+one request.
+
+UniswapV3Listener.see_ticks and listen_windows read every window of a pool
+with a single observe. PoolListener does the same for many pools at once
+off chain: it sends the observe of each pool as one JSON-RPC batch of
+eth_calls pinned to one block, and takes the TWAPs and quotes from the
+tick cumulatives with the exact port in scripts.tick_math. Providers not
+served over http get the calls one at a time.
+
+    listener = PoolListener([market_feed, ovl_feed], [600, 3600])
+    for twap in listener.listen():
+        print(twap.pool, twap.ticks, twap.quotes)
+'''
+from collections import namedtuple
+
+import requests
+from brownie import web3
+
+from scripts.tick_math import consult_tick, get_quote_at_tick
+
+# TWAPs of a pool at a block, or the error its observe reverted with
+Twap = namedtuple('Twap', ['pool', 'block', 'ticks', 'quotes', 'error'])
+
+
+def seconds_agos(windows):
+    return [0] + list(windows)
+
+
+def twap_ticks(tick_cumulatives, windows):
+    '''
+    OracleLibraryV2.consultWindows.
+
+    Inputs:
+      tick_cumulatives [list]: Tick cumulatives at seconds_agos(windows)
+      windows          [list]: Lengths of the windows in seconds
+
+    Output:
+      [list]: TWAP tick over each window
+    '''
+    return [consult_tick(tick_cumulatives[0] - tick_cumulatives[i + 1], w)
+            for i, w in enumerate(windows)]
+
+
+def batch_requests(method, params, timeout=30):
+    '''
+    Inputs:
+      method [str]:  JSON-RPC method
+      params [list]: Params of each request
+
+    Output:
+      [list]: JSON-RPC response to each request, with a result or an error
+    '''
+    payload = [{
+        'jsonrpc': '2.0',
+        'id': i,
+        'method': method,
+        'params': p,
+    } for i, p in enumerate(params)]
+
+    uri = getattr(web3.provider, 'endpoint_uri', None)
+
+    if uri is None or not str(uri).startswith('http'):
+        return [web3.provider.make_request(r['method'], r['params'])
+                for r in payload]
+
+    responses = requests.post(uri, json=payload, timeout=timeout).json()
+    return sorted(responses, key=lambda r: r['id'])
+
+
+def batch_call(calls, block='latest', timeout=30):
+    '''
+    Inputs:
+      calls [list]: (to, data) of each eth_call
+      block [str]:  Block to call at, hex or tag
+
+    Output:
+      [list]: JSON-RPC response to each call, with a result or an error
+    '''
+    return batch_requests(
+        'eth_call',
+        [[{'to': to, 'data': data}, block] for to, data in calls],
+        timeout)
+
+
+class PoolListener:
+    '''
+    Inputs:
+      pools     [list]: Uniswap V3 pool contracts
+      windows   [list]: Lengths of the TWAP windows in seconds
+      amount_in [int]:  Amount of base to quote
+      bases     [list]: Base token of each pool, token0 if None
+    '''
+    def __init__(self, pools, windows, amount_in=10**18, bases=None):
+        self.pools = list(pools)
+        self.windows = list(windows)
+        self.amount_in = amount_in
+
+        self.data = [pool.observe.encode_input(seconds_agos(self.windows))
+                     for pool in self.pools]
+
+        # (base, quote) of each pool, read once
+        self.tokens = []
+
+        for i, pool in enumerate(self.pools):
+            token0, token1 = pool.token0(), pool.token1()
+            base = token0 if bases is None else bases[i]
+            base_is_0 = str(base).lower() == str(token0).lower()
+            self.tokens.append((token0, token1) if base_is_0
+                               else (token1, token0))
+
+    def listen(self, block=None):
+        '''
+        Output:
+          [list]: Twap of each pool at block, the latest if None
+        '''
+        if block is None:
+            block = web3.eth.block_number
+
+        calls = [(pool.address, data)
+                 for pool, data in zip(self.pools, self.data)]
+        responses = batch_call(calls, hex(block))
+
+        twaps = []
+
+        for pool, (base, quote), response in zip(
+                self.pools, self.tokens, responses):
+            if 'error' in response:
+                twaps.append(Twap(pool.address, block, None, None,
+                                  response['error'].get('message')))
+                continue
+
+            tick_cumulatives, _ = pool.observe.decode_output(
+                response['result'])
+            ticks = twap_ticks(tick_cumulatives, self.windows)
+
+            twaps.append(Twap(
+                pool.address, block, ticks,
+                [get_quote_at_tick(t, self.amount_in, base, quote)
+                 for t in ticks],
+                None))
+
+        return twaps
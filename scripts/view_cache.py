@@ -0,0 +1,167 @@
+'''
+Block-scoped read-through cache for contract views.
+
+Keepers and dashboards read the same views, e.g. oiCap, pricePointCurrent,
+positions, marketInfo and the mothership's fee, many times in a block. A
+contract wrapped by a ViewCache memoizes its view calls by block number,
+address, selector and arguments. Each call is pinned to the block it is
+keyed by, so a cached result is the state at that block. Entries are
+dropped when a new block is seen, and the least recently used once the
+cache holds maxsize of them.
+
+    cache = ViewCache()
+    market = cache.wrap(market)
+    market.oiCap()     # eth_call
+    market.oiCap()     # cached until the next block
+    cache.stats()
+
+By default the block number is read before every view, which costs an
+eth_blockNumber in place of each cached eth_call. Services that can lag a
+block behind set poll to read it at most every poll seconds, or push new
+blocks from a block listener with new_block.
+'''
+import time
+from collections import OrderedDict
+
+from brownie import web3
+from brownie.network.contract import ContractCall, OverloadedMethod
+
+
+def freeze(value):
+    '''
+    Output:
+      Hashable form of a call argument
+    '''
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    return value
+
+
+class ViewCache:
+    '''
+    LRU cache of view results for the current block.
+    '''
+    def __init__(self, maxsize=4096, poll=0.):
+        self.maxsize = maxsize
+        self.poll = poll
+
+        self.entries = OrderedDict()
+
+        self.block = None
+        self.block_read = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def new_block(self, number):
+        '''
+        Sets the current block, dropping the entries of any other.
+        '''
+        if number != self.block:
+            if self.entries:
+                self.invalidations += 1
+            self.entries.clear()
+            self.block = number
+
+        self.block_read = time.monotonic()
+
+    def current_block(self):
+        if self.block_read is None \
+                or time.monotonic() - self.block_read >= self.poll:
+            self.new_block(web3.eth.block_number)
+
+        return self.block
+
+    def call(self, method, args):
+        '''
+        Inputs:
+          method [ContractCall]: View to call, or an overloaded method
+          args   [tuple]:        Arguments of the call
+
+        Output:
+          Result of the view at the current block
+        '''
+        if isinstance(method, OverloadedMethod):
+            method = method._get_fn_from_args(args)
+
+        if not isinstance(method, ContractCall):
+            return method(*args)
+
+        block = self.current_block()
+        key = (block, method._address, method.signature, freeze(args))
+
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        self.misses += 1
+        result = method.call(*args, block_identifier=block)
+
+        self.entries[key] = result
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+        return result
+
+    def wrap(self, contract):
+        '''
+        Output:
+          [CachedContract]: Contract whose views read through the cache
+        '''
+        return CachedContract(contract, self)
+
+    def stats(self):
+        calls = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / calls if calls else 0.,
+            'entries': len(self.entries),
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+
+
+class CachedMethod:
+    def __init__(self, method, cache):
+        self._method = method
+        self._cache = cache
+
+    def __call__(self, *args):
+        return self._cache.call(self._method, args)
+
+    def __getattr__(self, name):
+        return getattr(self._method, name)
+
+    def __repr__(self):
+        return f'<CachedMethod {self._method!r}>'
+
+
+class CachedContract:
+    '''
+    Contract proxy routing views through a ViewCache. Transactions and
+    other attributes pass through to the contract.
+    '''
+    def __init__(self, contract, cache):
+        self._contract = contract
+        self._cache = cache
+
+    def __getattr__(self, name):
+        attr = getattr(self._contract, name)
+
+        if isinstance(attr, (ContractCall, OverloadedMethod)):
+            return CachedMethod(attr, self._cache)
+
+        return attr
+
+    def __str__(self):
+        return str(self._contract)
+
+    def __repr__(self):
+        return f'<CachedContract {self._contract!r}>'
@@ -0,0 +1,242 @@
+'''
+Warm ganache chains with the mock Uniswap V3 feeds already loaded.
+
+Loading the recorded feeds into mock pools is the bulk of the work done
+before the first market test runs. This script loads them once into a
+ganache database and records where the pools live, keyed by a hash of the
+mock bytecode, the feed files and the loader. Tests attaching to a ganache
+served from that database find the pools through `cached_feeds` and skip
+loading. brownie takes its reset snapshot when it attaches, so module
+isolation resets to the warm chain rather than to an empty one.
+
+    python -m scripts.warm_chain build
+    python -m scripts.warm_chain serve [workers]
+    brownie test [-n workers]
+
+Any change to the keyed inputs produces a new key, and tests fall back to
+loading the feeds themselves until the chain is rebuilt.
+'''
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+
+import brownie
+from brownie import network, project, rpc, web3
+from brownie._config import CONFIG
+from brownie.network.rpc import ganache
+
+from scripts import mock_feeds
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FEEDS = os.path.join(BASE, 'feeds')
+FEED_FILES = [
+    'univ3_dai_weth_raw_uni_framed.json',
+    'univ3_dai_weth_reflected.json',
+    'univ3_axs_weth_raw_uni_framed.json',
+    'univ3_axs_weth_reflected.json',
+]
+
+WARM = os.path.join(BASE, 'build', 'warm')
+
+NETWORK = 'development'
+
+DAI = '0x6B175474E89094C44Da98b954EedeAC495271d0F'
+AXS = '0xBB0E17EF65F82Ab018d8EDd776e8DD940327B28b'
+WETH = '0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2'
+
+
+def cache_key():
+    '''
+    Output:
+      [str]: Hash of the mock pool bytecode, the feed files and the feed
+             loader
+    '''
+    key = hashlib.sha256()
+
+    for name in ['UniswapV3FactoryMock', 'UniswapV3OracleMock']:
+        key.update(getattr(brownie, name).bytecode.encode())
+
+    for name in FEED_FILES:
+        with open(os.path.join(FEEDS, name), 'rb') as f:
+            key.update(f.read())
+
+    key.update(inspect.getsource(mock_feeds).encode())
+
+    return key.hexdigest()[:16]
+
+
+def chain_path(key):
+    return os.path.join(WARM, key)
+
+
+def manifest_path(key):
+    return os.path.join(chain_path(key), 'feeds.json')
+
+
+def cached_feeds():
+    '''
+    Looks up the mock feeds on a warm chain.
+
+    Output:
+      [tuple]: (factory, market feed, depth feed) addresses, or None if the
+               connected chain was not served from the current warm chain
+    '''
+    path = manifest_path(cache_key())
+    if not os.path.exists(path):
+        return None
+
+    with open(path) as f:
+        feeds = json.load(f)
+
+    # the warm chain is identified by the hash of its last block
+    block = feeds['block']
+    if web3.eth.block_number < block \
+            or web3.eth.get_block(block).hash.hex() != feeds['hash']:
+        return None
+
+    return feeds['factory'], feeds['market'], feeds['depth']
+
+
+def load_feeds(feed_owner, feed_info):
+    '''
+    Deploys a mock factory with the market and depth feed pools and loads
+    their observations.
+
+    Inputs:
+      feed_owner [Account]: Account deploying and loading the pools
+      feed_info  [tuple]:   ((observations, shims), (observations, shims))
+                            for the market and depth feeds
+
+    Output:
+      [tuple]: (factory, market feed, depth feed) addresses
+    '''
+    (market_obs, market_shims), (depth_obs, depth_shims) = feed_info
+
+    factory = feed_owner.deploy(brownie.UniswapV3FactoryMock)
+
+    # TODO: place token0 and token1 into the json
+    factory.createPool(DAI, WETH, {'from': feed_owner})
+    factory.createPool(AXS, WETH, {'from': feed_owner})
+
+    market = brownie.interface.IUniswapV3OracleMock(factory.allPools(0))
+    depth = brownie.interface.IUniswapV3OracleMock(factory.allPools(1))
+
+    mock_feeds.load_observations(market, market_obs, market_shims, feed_owner)
+    mock_feeds.load_observations(depth, depth_obs, depth_shims, feed_owner)
+
+    return factory.address, market.address, depth.address
+
+
+def read_feed_info():
+    feeds = []
+    for name in FEED_FILES[0::2]:
+        with open(os.path.join(FEEDS, name)) as f:
+            feed = json.load(f)
+        feeds.append((feed['observations'], feed['shims']))
+    return tuple(feeds)
+
+
+def ganache_cmd(db):
+    return f"{CONFIG.networks[NETWORK]['cmd']} --db {db}"
+
+
+def launch(db):
+    '''
+    Connects to a ganache launched on a database.
+
+    Output:
+      [Process]: The ganache process
+    '''
+    # brownie launches ganache from the network cmd, here on the database
+    CONFIG.networks[NETWORK]['cmd'] = ganache_cmd(db)
+    network.connect(NETWORK)
+
+    # brownie.rpc is the Rpc instance
+    return rpc.process
+
+
+def build():
+    '''
+    Builds the warm chain for the current key, unless it already exists.
+    '''
+    key = cache_key()
+    path = chain_path(key)
+
+    if os.path.exists(manifest_path(key)):
+        print(f'warm chain {key} is up to date')
+        return
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+
+    proc = launch(os.path.join(path, 'chain'))
+
+    try:
+        factory, market, depth = load_feeds(brownie.accounts[6],
+                                            read_feed_info())
+        block = web3.eth.get_block('latest')
+    finally:
+        # let ganache close its database rather than killing it
+        network.disconnect(kill_rpc=False)
+        proc.terminate()
+        proc.wait()
+
+    with open(manifest_path(key), 'w') as f:
+        json.dump({
+            'factory': factory,
+            'market': market,
+            'depth': depth,
+            'block': block.number,
+            'hash': block.hash.hex(),
+        }, f)
+
+    print(f'warm chain {key} built')
+
+
+def serve(workers=1):
+    '''
+    Serves a copy of the warm chain per xdist worker, on consecutive ports
+    from the development port.
+    '''
+    key = cache_key()
+    if not os.path.exists(manifest_path(key)):
+        sys.exit(f'no warm chain for {key}, run build first')
+
+    port = CONFIG.networks[NETWORK]['cmd_settings']['port']
+    procs = []
+
+    try:
+        for i in range(workers):
+            db = os.path.join(chain_path(key), f'worker-{i}')
+            shutil.rmtree(db, ignore_errors=True)
+            shutil.copytree(os.path.join(chain_path(key), 'chain'), db)
+            settings = dict(CONFIG.networks[NETWORK]['cmd_settings'])
+            settings['port'] = port + i
+            procs.append(ganache.launch(ganache_cmd(db), **settings))
+
+        print(f'serving warm chain {key} on ports {port}-{port + workers - 1}')
+
+        for proc in procs:
+            proc.wait()
+    finally:
+        for proc in procs:
+            proc.terminate()
+
+
+def main(command='build', *args):
+    project.load(BASE)
+
+    if command == 'build':
+        build()
+    elif command == 'serve':
+        serve(*map(int, args))
+    else:
+        sys.exit(f'unknown command {command}')
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,164 @@
+import time
+
+import pytest
+from brownie import history, web3
+from brownie.test import output
+
+from scripts.gas_profile import merge_gas_profiles
+from scripts.gas_stacks import GasStacks
+from scripts.suite_profile import SuiteProfile, format_rows
+
+
+def is_worker(config):
+    return hasattr(config, 'workerinput')
+
+
+def is_master(config):
+    return not is_worker(config) and bool(
+        config.getoption('numprocesses', None))
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--gas-stacks', metavar='PATH',
+        help='write folded gas stacks of build, unwind, liquidate and update '
+             'transactions to PATH')
+    parser.addoption(
+        '--suite-profile', metavar='PATH',
+        help='write wall, setup and RPC time of each test, fixture and RPC '
+             'method to PATH as CSV')
+
+
+def pytest_configure(config):
+    config.gas_stacks = GasStacks() if config.getoption('--gas-stacks') \
+        else None
+    config.suite_profile = SuiteProfile() \
+        if config.getoption('--suite-profile') else None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    '''
+    Times a test from the setup of its fixtures to their teardown.
+    '''
+    profile = item.config.suite_profile
+    if profile is None:
+        yield
+        return
+
+    profile.wrap(web3.provider)
+    with profile.span('test', item.nodeid):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    start = time.perf_counter()
+    yield
+
+    profile = item.config.suite_profile
+    if profile is not None:
+        profile.row('test', item.nodeid)['setup'] += \
+            time.perf_counter() - start
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    '''
+    Times the setup of a fixture, after the fixtures it requests.
+    '''
+    profile = request.config.suite_profile
+    if profile is None:
+        yield
+        return
+
+    profile.wrap(web3.provider)
+    with profile.span('fixture', fixturedef.argname):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    '''
+    Folds the gas stacks of the transactions a test sends, before isolation
+    reverts them out of the history.
+    '''
+    start = len(history)
+    yield
+
+    if item.config.gas_stacks is not None:
+        for tx in history[start:]:
+            item.config.gas_stacks.add(tx)
+
+
+def pytest_sessionfinish(session):
+    '''
+    Ships the gas profile, stacks and suite profile of an xdist worker to
+    the master, or writes the stacks and suite profile when running in a
+    single process.
+    '''
+    config = session.config
+
+    if is_worker(config):
+        if config.getoption('--gas'):
+            config.workeroutput['gas_profile'] = history.gas_profile
+        if config.gas_stacks is not None:
+            config.workeroutput['gas_stacks'] = dict(config.gas_stacks.stacks)
+        if config.suite_profile is not None:
+            config.workeroutput['suite_profile'] = config.suite_profile.dump()
+        return
+
+    if config.gas_stacks is not None:
+        config.gas_stacks.write_folded(config.getoption('--gas-stacks'))
+    if config.suite_profile is not None:
+        config.suite_profile.write_csv(config.getoption('--suite-profile'))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    '''
+    Merges the gas profile, stacks and suite profile of a finished xdist
+    worker on the master.
+    '''
+    workeroutput = getattr(node, 'workeroutput', {})
+    merge_gas_profiles(history.gas_profile,
+                       workeroutput.get('gas_profile', {}))
+
+    if node.config.gas_stacks is not None:
+        node.config.gas_stacks.stacks.update(
+            workeroutput.get('gas_stacks', {}))
+
+    if node.config.suite_profile is not None:
+        node.config.suite_profile.merge(workeroutput.get('suite_profile', []))
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    '''
+    Reports the merged gas profile of all workers when running with -n, as
+    brownie only reports gas for a single process, the functions spending
+    the most gas in the folded stacks, and the slowest tests and fixtures.
+    '''
+    if is_master(config) and config.getoption('--gas'):
+        terminalreporter.section('Gas Profile')
+        for line in output._build_gas_profile_output():
+            terminalreporter.write_line(line)
+
+    if config.gas_stacks is not None and not is_worker(config):
+        terminalreporter.section('Gas Stacks')
+        terminalreporter.write_line(f"{'function':<56}{'self':>12}"
+                                    f"{'total':>12}")
+        for fn, self_gas, total_gas in config.gas_stacks.functions()[:20]:
+            terminalreporter.write_line(f'{fn:<56}{self_gas:>12}'
+                                        f'{total_gas:>12}')
+        terminalreporter.write_line(
+            f"folded stacks written to {config.getoption('--gas-stacks')}")
+
+    if config.suite_profile is not None and not is_worker(config):
+        for kind, title in [('test', 'Slowest Tests'),
+                            ('fixture', 'Slowest Fixtures'),
+                            ('rpc', 'RPC Methods')]:
+            terminalreporter.section(title)
+            for line in format_rows(config.suite_profile.table(kind), 10):
+                terminalreporter.write_line(line)
+        terminalreporter.write_line(
+            f"suite profile written to {config.getoption('--suite-profile')}")
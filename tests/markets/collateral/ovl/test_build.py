@@ -6,11 +6,6 @@ from brownie.test import given, strategy
 from pytest import approx, mark
 
 
-def print_logs(tx):
-    for i in range(len(tx.events['log'])):
-        print(tx.events['log'][i]['k'] + ": " + str(tx.events['log'][i]['v']))
-
-
 MIN_COLLATERAL = 1e14  # min amount to build
 TOKEN_DECIMALS = 18
 TOKEN_TOTAL_SUPPLY = 8000000
@@ -129,6 +124,7 @@ def test_build_success_zero_impact(ovl_collateral, token, mothership, market,
 
     # Check position attributes for PID
     (pos_market,
+     pos_feed,
      pos_islong,
      pos_lev,
      pos_price_idx,
@@ -137,6 +133,8 @@ def test_build_success_zero_impact(ovl_collateral, token, mothership, market,
      pos_cost) = ovl_collateral.positions(pid)
 
     assert pos_market == market
+
+    assert pos_feed == 0
     assert pos_islong == is_long
     assert pos_lev == leverage
     assert pos_price_idx == market.pricePointNextIndex() - 1
@@ -230,16 +228,16 @@ def test_build_max_leverage(
     # just to avoid failing min_collateral check because of fees
     trade_amt = MIN_COLLATERAL*2
     oi_adjusted_min = trade_amt * \
-        ovl_collateral.maxLeverage(market) * (1-SLIPPAGE_TOL)
+        ovl_collateral.maxLeverage(market, 0) * (1-SLIPPAGE_TOL)
 
     tx = ovl_collateral.build(
-        market, trade_amt, ovl_collateral.maxLeverage(market), is_long,
+        market, trade_amt, ovl_collateral.maxLeverage(market, 0), is_long,
         oi_adjusted_min, {'from': bob})
     assert isinstance(tx, brownie.network.transaction.TransactionReceipt)
 
     with brownie.reverts(EXPECTED_ERROR_MESSAGE):
         ovl_collateral.build(market, trade_amt,
-                             ovl_collateral.maxLeverage(market) + 1,
+                             ovl_collateral.maxLeverage(market, 0) + 1,
                              is_long, oi_adjusted_min, {'from': bob})
 
 
@@ -260,6 +258,39 @@ def test_build_reverts_when_leverage_is_zero(
                              is_long, 0, {'from': bob})
 
 
+def test_build_position_id(
+    ovl_collateral,
+    token,
+    market,
+    bob,
+    start_time,
+    collateral=1e18,
+    leverage=2,
+    is_long=True
+):
+    brownie.chain.mine(timestamp=start_time)
+
+    tx = ovl_collateral.build(market, collateral, leverage, is_long, 0,
+                              {'from': bob})
+    pid = tx.events['Build']['positionId']
+
+    price_point = market.pricePointNextIndex() - 1
+
+    # id derives from market, feed, side, leverage and entry price point
+    assert pid == ovl_collateral.positionId(market, 0, is_long, leverage,
+                                            price_point)
+
+    # a later price point gives the same side and leverage a new position
+    brownie.chain.mine(timedelta=60)
+    tx = ovl_collateral.build(market, collateral, leverage, is_long, 0,
+                              {'from': bob})
+    pid_next = tx.events['Build']['positionId']
+
+    assert pid_next != pid
+    assert pid_next == ovl_collateral.positionId(
+        market, 0, is_long, leverage, market.pricePointNextIndex() - 1)
+
+
 def test_build_cap(
     token,
     ovl_collateral,
@@ -775,6 +806,7 @@ def test_build_w_impact(
 
     # check position attributes for PID
     (pos_market,
+     pos_feed,
      pos_islong,
      pos_lev,
      pos_price_idx,
@@ -783,6 +815,8 @@ def test_build_w_impact(
      pos_cost) = ovl_collateral.positions(pid)
 
     assert pos_market == market
+
+    assert pos_feed == 0
     assert pos_islong == is_long
     assert pos_lev == leverage
     assert pos_price_idx == market.pricePointNextIndex() - 1
@@ -991,6 +1025,7 @@ def test_build_multiple_in_one_impact_window(
 
         # check position attributes for PID
         (pos_market,
+         pos_feed,
          pos_islong,
          pos_lev,
          pos_price_idx,
@@ -999,6 +1034,8 @@ def test_build_multiple_in_one_impact_window(
          pos_cost) = ovl_collateral.positions(pid)
 
         assert pos_market == market
+
+        assert pos_feed == 0
         assert pos_islong == is_long
         assert pos_lev == leverage
         assert pos_price_idx == market.pricePointNextIndex() - 1
@@ -1156,6 +1193,7 @@ def test_build_multiple_in_multiple_impact_windows(
 
         # check position attributes for PID
         (pos_market,
+         pos_feed,
          pos_islong,
          pos_lev,
          pos_price_idx,
@@ -1164,6 +1202,8 @@ def test_build_multiple_in_multiple_impact_windows(
          pos_cost) = ovl_collateral.positions(pid)
 
         assert pos_market == market
+
+        assert pos_feed == 0
         assert pos_islong == is_long
         assert pos_lev == leverage
         assert pos_price_idx == market.pricePointNextIndex() - 1
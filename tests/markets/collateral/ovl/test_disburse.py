@@ -3,11 +3,6 @@ from brownie.test import given, strategy
 from decimal import Decimal
 
 
-def print_logs(tx):
-    for i in range(len(tx.events['log'])):
-        print(tx.events['log'][i]['k'] + ": " + str(tx.events['log'][i]['v']))
-
-
 MIN_COLLATERAL_AMOUNT = 1e16  # min amount to build
 TOKEN_DECIMALS = 18
 TOKEN_TOTAL_SUPPLY = 8000000
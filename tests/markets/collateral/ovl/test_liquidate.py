@@ -3,11 +3,6 @@ import pytest
 from pytest import approx
 
 
-def print_logs(tx):
-    for i in range(len(tx.events['log'])):
-        print(tx.events['log'][i]['k'] + ": " + str(tx.events['log'][i]['v']))
-
-
 MIN_COLLATERAL = 1e14  # min amount to build
 COLLATERAL = 10*1e18
 TOKEN_DECIMALS = 18
@@ -67,7 +62,7 @@ def test_liquidate_success_zero_funding(
 
     market.setK(0, {'from': gov})
 
-    margin_maintenance = ovl_collateral.marginMaintenance(market) / 1e18
+    margin_maintenance = ovl_collateral.marginMaintenance(market, 0) / 1e18
 
     # Mine to the entry time then build
     brownie.chain.mine(timestamp=position["entry"]["timestamp"])
@@ -80,7 +75,7 @@ def test_liquidate_success_zero_funding(
         {'from': bob}
     )
     pos_id = tx_build.events['Build']['positionId']
-    (_, _, _, pos_price_idx, pos_oi_shares,
+    (_, _, _, _, pos_price_idx, pos_oi_shares,
      pos_debt, pos_cost) = ovl_collateral.positions(pos_id)
 
     # mine a bit more then update to settle
@@ -96,7 +91,7 @@ def test_liquidate_success_zero_funding(
     assert 'positionId' in tx_liq.events['Liquidate']
     assert tx_liq.events['Liquidate']['positionId'] == pos_id
 
-    (_, _, _, _, pos_oi_shares_after, _, _) = ovl_collateral.positions(pos_id)
+    pos_oi_shares_after = ovl_collateral.positions(pos_id)['oiShares']
 
     assert pos_oi_shares_after == 0
 
@@ -142,7 +137,7 @@ def test_liquidate_revert_not_liquidatable(
         {'from': bob}
     )
     pos_id = tx_build.events['Build']['positionId']
-    (_, _, _, pos_price_idx, pos_oi_shares,
+    (_, _, _, _, pos_price_idx, pos_oi_shares,
      pos_debt, pos_cost) = ovl_collateral.positions(pos_id)
 
     # mine a bit more then update to settle
@@ -159,7 +154,7 @@ def test_liquidate_revert_not_liquidatable(
 
     ovl_collateral.liquidate(pos_id, alice, {'from': alice})
 
-    (_, _, _, _, pos_oi_shares_after, _, _) = ovl_collateral.positions(pos_id)
+    pos_oi_shares_after = ovl_collateral.positions(pos_id)['oiShares']
 
     assert pos_oi_shares_after == 0
 
@@ -197,7 +192,7 @@ def test_liquidate_revert_unwind_after_liquidation(
         {'from': bob}
     )
     pos_id = tx_build.events['Build']['positionId']
-    (_, _, _, pos_price_idx, pos_oi_shares,
+    (_, _, _, _, pos_price_idx, pos_oi_shares,
      pos_debt, pos_cost) = ovl_collateral.positions(pos_id)
 
     # mine a bit more then update to settle
@@ -209,7 +204,7 @@ def test_liquidate_revert_unwind_after_liquidation(
 
     ovl_collateral.liquidate(pos_id, alice, {'from': alice})
 
-    (_, _, _, _, pos_oi_shares_after, _, _) = ovl_collateral.positions(pos_id)
+    pos_oi_shares_after = ovl_collateral.positions(pos_id)['oiShares']
 
     assert pos_oi_shares_after == 0
 
@@ -251,7 +246,7 @@ def test_liquidate_pnl_burned(
         {'from': bob}
     )
     pos_id = tx_build.events['Build']['positionId']
-    (_, _, _, pos_price_idx, pos_oi_shares,
+    (_, _, _, _, pos_price_idx, pos_oi_shares,
      pos_debt, pos_cost) = ovl_collateral.positions(pos_id)
 
     # mine a bit more then update to settle
@@ -309,7 +304,7 @@ def test_liquidate_oi_removed(
         {'from': bob}
     )
     pos_id = tx_build.events['Build']['positionId']
-    (_, _, _, pos_price_idx, pos_oi_shares,
+    (_, _, _, _, pos_price_idx, pos_oi_shares,
      pos_debt, pos_cost) = ovl_collateral.positions(pos_id)
 
     oi_before = market.oiLong() if position["is_long"] else market.oiShort()
@@ -351,7 +346,7 @@ def test_liquidate_zero_value(
         {'from': bob}
     )
     pos_id = tx_build.events['Build']['positionId']
-    (_, _, _, pos_price_idx, pos_oi_shares,
+    (_, _, _, _, pos_price_idx, pos_oi_shares,
      pos_debt, pos_cost) = ovl_collateral.positions(pos_id)
 
     oi_before = market.oiLong() if position["is_long"] else market.oiShort()
@@ -393,7 +388,7 @@ def test_liquidate_rewards_and_fees(
 
     market.setK(0, {'from': gov})
 
-    margin_reward_rate = ovl_collateral.marginRewardRate(market) / 1e18
+    margin_reward_rate = ovl_collateral.marginRewardRate(market, 0) / 1e18
 
     # Mine to the entry time then build
     brownie.chain.mine(timestamp=position["entry"]["timestamp"])
@@ -406,7 +401,7 @@ def test_liquidate_rewards_and_fees(
         {'from': bob}
     )
     pos_id = tx_build.events['Build']['positionId']
-    (_, _, _, pos_price_idx, pos_oi_shares,
+    (_, _, _, _, pos_price_idx, pos_oi_shares,
      pos_debt, pos_cost) = ovl_collateral.positions(pos_id)
 
     liquidations_prior = ovl_collateral.liquidations()
@@ -449,7 +444,7 @@ def test_liquidate_with_funding(
 
     brownie.chain.mine(timestamp=start_time)
 
-    margin_maintenance = ovl_collateral.marginMaintenance(market) / 1e18
+    margin_maintenance = ovl_collateral.marginMaintenance(market, 0) / 1e18
 
     # Mine to the entry time then build
     brownie.chain.mine(timestamp=position["entry"]["timestamp"])
@@ -462,7 +457,7 @@ def test_liquidate_with_funding(
         {'from': bob}
     )
     pos_id = tx_build.events['Build']['positionId']
-    (_, _, _, pos_price_idx, pos_oi_shares,
+    (_, _, _, _, pos_price_idx, pos_oi_shares,
      pos_debt, pos_cost) = ovl_collateral.positions(pos_id)
 
     # build a position for alice that take up 1/2 the OI of bob
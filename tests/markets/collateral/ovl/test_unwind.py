@@ -13,11 +13,6 @@ OI_CAP = 800000e18
 SLIPPAGE_TOL = 0.2
 
 
-def print_logs(tx):
-    for i in range(len(tx.events['log'])):
-        print(tx.events['log'][i]['k'] + ": " + str(tx.events['log'][i]['v']))
-
-
 def get_collateral(collateral, leverage, fee):
     FL = fee*leverage
     fee_offset = MIN_COLLATERAL*(FL/(FEE_RESOLUTION - FL))
@@ -86,7 +81,7 @@ def test_unwind_oi_removed(
     pid = tx_build.events['Build']['positionId']
     poi_build = tx_build.events['Build']['oi']
 
-    (_, _, _, price_point, oi_shares_build,
+    (_, _, _, _, price_point, oi_shares_build,
         debt_build, cost_build) = ovl_collateral.positions(pid)
 
     # TODO: When this changed to compoundingPeriod - 10 there was a problem.
@@ -103,7 +98,7 @@ def test_unwind_oi_removed(
         {"from": bob}
     )
 
-    (_, _, _, _, oi_shares_unwind, _, _) = ovl_collateral.positions(pid)
+    oi_shares_unwind = ovl_collateral.positions(pid)['oiShares']
 
     poi_unwind = tx_unwind.events['Unwind']['oi']
 
@@ -162,14 +157,14 @@ def test_unwind_expected_fee(
 
     # Position info
     pid = tx_build.events['Build']['positionId']
-    (_, _, _, price_point, oi_shares_pos,
+    (_, _, _, _, price_point, oi_shares_pos,
      debt_pos, _) = ovl_collateral.positions(pid)
 
     bob_balance = ovl_collateral.balanceOf(bob, pid)
 
     chain.mine(timestamp=mine_time+1)
 
-    (oi, oi_shares, price_frame) = market.positionInfo(is_long, price_point)
+    (oi, oi_shares, price_frame) = market.positionInfo(0, is_long, price_point)
 
     exit_index = market.pricePointNextIndex()
 
@@ -284,9 +279,9 @@ def test_partial_unwind(
     alice_pid = alice_tx_build.events['Build']['positionId']
     alice_poi_build = alice_tx_build.events['Build']['oi']
 
-    (_, _, _, _, bob_oi_shares_build, _, _) = ovl_collateral.positions(bob_pid)
+    bob_oi_shares_build = ovl_collateral.positions(bob_pid)['oiShares']
 
-    (_, _, _, _, alice_oi_shares_build, _, _) = ovl_collateral.positions(alice_pid)  # noqa: E501
+    alice_oi_shares_build = ovl_collateral.positions(alice_pid)['oiShares']
 
     chain.mine(timedelta=15)
 
@@ -362,7 +357,7 @@ def test_unwind_after_transfer(
     pid = tx_build.events['Build']['positionId']
     pos_oi_build = tx_build.events['Build']['oi']
 
-    (_, _, _, price_point, oi_shares_build, debt_build,
+    (_, _, _, _, price_point, oi_shares_build, debt_build,
      cost_build) = ovl_collateral.positions(pid)
 
     chain.mine(timedelta=market.compoundingPeriod()+1)
@@ -461,14 +456,14 @@ def test_unwind_pnl_mint_burn(
     # Build position info
     pid = tx_build.events['Build']['positionId']
     tx_build.events['Build']['oi']
-    (_, _, _, price_point, oi_shares_pos, debt_pos,
+    (_, _, _, _, price_point, oi_shares_pos, debt_pos,
      cost_pos) = ovl_collateral.positions(pid)
 
     bob_balance = ovl_collateral.balanceOf(bob, pid)
 
     total_pos_shares = ovl_collateral.totalSupply(pid)
 
-    (oi, oi_shares, price_frame) = market.positionInfo(is_long, price_point)
+    (oi, oi_shares, price_frame) = market.positionInfo(0, is_long, price_point)
 
     # State prior to unwind
     exit_price_ix = market.pricePointNextIndex()
@@ -516,8 +511,8 @@ def test_unwind_pnl_mint_burn(
         value_adjusted = 0
         fee = notional - debt if notional > debt else 0
 
-    # check expected pnl matches actual
-    exp_pnl = value_adjusted - cost
+    # check expected pnl matches actual, the fee is minted for the fee pot
+    exp_pnl = value_adjusted + fee - cost
 
     for _, v in enumerate(tx_unwind.events['Transfer']):
         if v['to'] == '0x0000000000000000000000000000000000000000':
@@ -8,14 +8,6 @@ from pytest import approx
 ONE_BLOCK = 13
 
 
-def print_logs(tx):
-    for i in range(len(tx.events['log'])):
-        print(
-            tx.events['log'][i]['k'] + ": "
-            + str(tx.events['log'][i]['v'])
-        )
-
-
 def test_sanity(comptroller):
     pass
 
@@ -9,6 +9,7 @@ from brownie import (
     interface,
     UniTest
 )
+from scripts.warm_chain import cached_feeds, load_feeds
 
 TOKEN_DECIMALS = 18
 TOKEN_TOTAL_SUPPLY = 8000000e18
@@ -23,6 +24,8 @@ PRICE_WINDOW_MICRO = 600
 
 COMPOUND_PERIOD = 600
 
+OVL_PRICE_PERIOD = 600
+
 IMPACT_WINDOW = PRICE_WINDOW_MICRO
 
 LAMBDA = .6e18
@@ -201,37 +204,18 @@ def feed_infos():
 
 
 def get_uni_feeds(feed_owner, feed_info):
-
-    market_obs = feed_info.market_info[0]
-    market_shims = feed_info.market_info[1]
-    depth_obs = feed_info.depth_info[0]
-    depth_shims = feed_info.depth_info[1]
-
-    UniswapV3MockFactory = getattr(brownie, 'UniswapV3FactoryMock')
-    IUniswapV3OracleMock = getattr(interface, 'IUniswapV3OracleMock')
-
-    uniswapv3_factory = feed_owner.deploy(UniswapV3MockFactory)
-
-    market_token0 = "0x6B175474E89094C44Da98b954EedeAC495271d0F"
-    market_token1 = WRAPPED_ETH_ADDR
-    depth_token0 = "0xBB0E17EF65F82Ab018d8EDd776e8DD940327B28b"
-    depth_token1 = WRAPPED_ETH_ADDR
-
-    # TODO: place token0 and token1 into the json
-    uniswapv3_factory.createPool(market_token0, market_token1)
-    uniswapv3_factory.createPool(depth_token0, depth_token1)
-
-    market_mock = IUniswapV3OracleMock(uniswapv3_factory.allPools(0))
-    depth_mock = IUniswapV3OracleMock(uniswapv3_factory.allPools(1))
-
-    market_mock.loadObservations(
-        market_obs, market_shims, {'from': feed_owner})
-
-    depth_mock.loadObservations(depth_obs, depth_shims, {'from': feed_owner})
+    '''
+    Reuses the mock feeds of a warm chain served by scripts/warm_chain.py,
+    otherwise deploys and loads them.
+    '''
+    feeds = cached_feeds() or load_feeds(feed_owner, (
+        feed_info.market_info[:2],
+        feed_info.depth_info[:2],
+    ))
 
     chain.mine(timestamp=feed_info.market_info[2]['timestamp'][0])
 
-    return uniswapv3_factory.address, market_mock.address, depth_mock.address, market_token1   # noqa: E501
+    return feeds + (WRAPPED_ETH_ADDR,)
 
 
 @pytest.fixture(scope="module")
@@ -370,6 +354,9 @@ def create_mothership(token, feed_infos, fees, alice, bob, gov, feed_owner,
         # function explicitly
         market.setEverything(*ovlm_args[4:], {"from": gov})
 
+        # Governor sets how often the market reads the OVL price for depth
+        market.setOvlPricePeriod(OVL_PRICE_PERIOD, {"from": gov})
+
         # Governor makes call to mothership contract, making it aware of the
         # new market contract
         # TODO: check that call fails if market contract already accounted for
@@ -383,7 +370,7 @@ def create_mothership(token, feed_infos, fees, alice, bob, gov, feed_owner,
 
         # Governor sets the market information which includes the maintenance
         # margin, margin reward rate, and max leverage
-        ovl_collateral.setMarketInfo(market, *ovlc_args, {"from": gov})
+        ovl_collateral.setMarketInfo(market, 0, *ovlc_args, {"from": gov})
 
         # Governor makes call to mothership contract, making it aware of the
         # new collateral contract
@@ -0,0 +1,98 @@
+import brownie
+from brownie import OverlayV1UniswapV3MarketZeroLambdaShim, chain
+from pytest import approx
+
+LMBDA = .6e18
+STATIC_CAP = 800000e18
+BRRRR_EXPECTED = 26320e18
+BRRRR_WINDOW_MACRO = 2592000
+BRRRR_WINDOW_MICRO = 86400
+
+# the macro OVL TWAP moves less than 0.35% over the 600s price period
+REL_TOL = 5e-3
+
+WRAPPED_ETH_ADDR = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+
+
+def set_lmbda(market, gov):
+    market.setComptrollerParams(LMBDA, STATIC_CAP, BRRRR_EXPECTED,
+                                BRRRR_WINDOW_MACRO, BRRRR_WINDOW_MICRO,
+                                {"from": gov})
+
+
+def test_ovl_price_read_once_per_period(market, gov, start_time):
+
+    brownie.chain.mine(timestamp=start_time)
+
+    ovl_feed = market.ovlFeed()
+    period = market.ovlPricePeriod()
+    assert period > 0
+
+    def reads_ovl_feed(tx):
+        return any(c['to'] == ovl_feed for c in tx.subcalls)
+
+    tx = market.update({"from": gov})
+    refreshed = tx.timestamp
+
+    assert reads_ovl_feed(tx)
+    assert market.ovlPriceUpdated() == refreshed
+    assert market.ovlPrice() == market.fetchOvlPrice()
+
+    chain.mine(timedelta=period // 2)
+    tx = market.update({"from": gov})
+
+    assert not reads_ovl_feed(tx)
+    assert market.ovlPriceUpdated() == refreshed
+
+    chain.mine(timedelta=period)
+    tx = market.update({"from": gov})
+
+    assert reads_ovl_feed(tx)
+    assert market.ovlPriceUpdated() == tx.timestamp
+
+
+def test_ovl_price_period_zero_reads_every_update(market, gov, start_time):
+
+    brownie.chain.mine(timestamp=start_time)
+
+    market.setOvlPricePeriod(0, {"from": gov})
+
+    for _ in range(3):
+        chain.mine(timedelta=60)
+        tx = market.update({"from": gov})
+        assert any(c['to'] == market.ovlFeed() for c in tx.subcalls)
+
+    assert market.ovlPriceUpdated() == 0
+
+
+def test_cap_with_cached_ovl_price_within_tolerance(mothership, market, gov,
+                                                    start_time):
+
+    brownie.chain.mine(timestamp=start_time)
+
+    market = OverlayV1UniswapV3MarketZeroLambdaShim.at(market)
+    set_lmbda(market, gov)
+
+    # the same market reading the OVL price on every update
+    live = gov.deploy(OverlayV1UniswapV3MarketZeroLambdaShim, mothership,
+                      market.ovlFeed(), market.marketFeed(), market.quote(),
+                      WRAPPED_ETH_ADDR, 1e18, market.macroWindow(),
+                      market.microWindow(), market.priceFrameCap())
+    set_lmbda(live, gov)
+
+    assert live.ovlPricePeriod() == 0
+
+    # two hours of updates two minutes apart
+    for _ in range(60):
+
+        chain.mine(timedelta=120)
+        market.update({"from": gov})
+
+        assert market.ovlPrice() == approx(market.fetchOvlPrice(),
+                                           rel=REL_TOL)
+
+        _, _, depth_live = live.fetchPricePoint()
+
+        assert market.depth() == approx(depth_live, rel=REL_TOL)
+        assert market.oiCap() == approx(min(STATIC_CAP, depth_live),
+                                        rel=REL_TOL)
@@ -1,8 +1,15 @@
 import brownie
+import pytest
 from brownie import chain
 from brownie.test import given, strategy
 from pytest import approx
 
+from scripts.fixed_point import ONE, mul_up, pow_up_int
+from scripts.overlay_model import MarketModel
+
+# zero, one, two, odd and a year of ten minute compoundings
+EPOCHS = [0, 1, 2, 7, 52560]
+
 
 @given(
   compoundings=strategy('uint256', min_value=1, max_value=100),
@@ -50,3 +57,38 @@ def test_funding_total_imbalance(bob, market, oi, ovl_collateral, start_time,
 
     assert oi_after_payment == approx(
             expected_oi_after_payment, rel=1e-04), 'oi after funding payment different than expected'  # noqa: E501
+
+
+@pytest.mark.parametrize('epochs', EPOCHS)
+def test_pow_up_int_matches_model(market, epochs):
+    '''
+    Test that the funding factor (1 - 2k)^n is raised by squaring to the
+    wei of the python reference.
+    '''
+    market = brownie.OverlayV1UniswapV3MarketZeroLambdaShim.at(market)
+
+    factor = ONE - mul_up(market.k(), 2 * ONE)
+
+    assert market.viewPowUpInt(factor, epochs) \
+        == pow_up_int(factor, epochs)
+
+
+@pytest.mark.parametrize('epochs', EPOCHS)
+@pytest.mark.parametrize('oi_long,oi_short', [
+    (0, 0),
+    (10**22, 0),
+    (0, 10**22),
+    (3 * 10**21 + 1, 10**21),
+    (10**21, 10**21),
+])
+def test_compute_funding_matches_model(market, epochs, oi_long, oi_short):
+    '''
+    Test that funding paid on one and two sided books is that of the
+    python reference, to the wei.
+    '''
+    market = brownie.OverlayV1UniswapV3MarketZeroLambdaShim.at(market)
+
+    k = market.k()
+
+    assert market.viewFunding(oi_long, oi_short, epochs, k) \
+        == MarketModel.compute_funding(oi_long, oi_short, epochs, k)
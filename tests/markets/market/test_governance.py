@@ -1,8 +1,3 @@
-def print_logs(tx):
-    for i in range(len(tx.events['log'])):
-        print(tx.events['log'][i]['k'] + ": " + str(tx.events['log'][i]['v']))
-
-
 def test_set_static_cap(market, gov):
     # test updating _staticCap only in setComptrollerParams func
     input_static_cap = int(800000 * 1e19)
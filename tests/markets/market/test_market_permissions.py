@@ -1,11 +1,6 @@
 import brownie
 
 
-def print_logs(tx):
-    for i in range(len(tx.events['log'])):
-        print(tx.events['log'][i]['k'] + ": " + str(tx.events['log'][i]['v']))
-
-
 def test_only_gov_can_update_market(market, token, bob, alice, rewards, feed_owner, fees,  # noqa: E501
                                     comptroller):
     # ensure only gov can update market
@@ -0,0 +1,240 @@
+import brownie
+from brownie import (
+    OverlayV1OVLCollateral,
+    OverlayV1UniswapV3MarketZeroLambdaShim,
+    OverlayV1UniswapV3MultiplexMarket,
+    interface,
+    reverts
+)
+from pytest import approx
+
+PRICE_WINDOW_MACRO = 3600
+PRICE_WINDOW_MICRO = 600
+PRICE_FRAME_CAP = 5e18
+
+K = 343454218783234
+PBNJ = .00573e18
+COMPOUND_PERIOD = 600
+STATIC_CAP = 800000e18
+BRRRR_EXPECTED = 26320e18
+BRRRR_WINDOW_MACRO = 2592000
+BRRRR_WINDOW_MICRO = 86400
+
+MARGIN_MAINTENANCE = .06e18
+MARGIN_REWARD_RATE = .5e18
+MAX_LEVERAGE = 100
+
+COLLATERAL = 1e18
+
+WRAPPED_ETH_ADDR = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+
+
+def deploy_multiplex(gov, mothership, ovl_feed, feeds, quotes):
+    return gov.deploy(OverlayV1UniswapV3MultiplexMarket, mothership,
+                      ovl_feed, feeds, quotes, WRAPPED_ETH_ADDR,
+                      [1e18 for _ in feeds], PRICE_WINDOW_MACRO,
+                      PRICE_WINDOW_MICRO, PRICE_FRAME_CAP)
+
+
+def feed_tick(feed, window, block='latest'):
+    '''
+    Inputs:
+      feed   [Contract]: IUniswapV3OracleMock pool
+      window [int]:      Seconds to average the feed over
+      block  [int]:      Block to read the feed at
+
+    Output:
+      [int]: Feed tick, truncated toward zero like the market
+    '''
+    ticks, _ = feed.observe([0, window], block_identifier=block)
+    return int((ticks[0] - ticks[1]) / window)
+
+
+def feeds_of(market):
+    market_feed = interface.IUniswapV3OracleMock(market.marketFeed())
+    ovl_feed = interface.IUniswapV3OracleMock(market.ovlFeed())
+    return market_feed, ovl_feed
+
+
+def live_multiplex(gov, token, mothership, feeds, ovl_feed, traders):
+    '''
+    Deploys a multiplex market on feeds with a collateral manager of its own
+    and enables both, with the same market info on every feed.
+
+    Output:
+      [tuple]: Multiplex market and collateral manager
+    '''
+    multiplex = deploy_multiplex(gov, mothership, ovl_feed, feeds,
+                                 [WRAPPED_ETH_ADDR for _ in feeds])
+
+    multiplex.setEverything(K, PBNJ, COMPOUND_PERIOD, 0, STATIC_CAP,
+                            BRRRR_EXPECTED, BRRRR_WINDOW_MACRO,
+                            BRRRR_WINDOW_MICRO, {"from": gov})
+    mothership.initializeMarket(multiplex, {"from": gov})
+
+    collateral = gov.deploy(OverlayV1OVLCollateral, "uri", mothership)
+
+    for feed in range(len(feeds)):
+        collateral.setMarketInfo(multiplex, feed, MARGIN_MAINTENANCE,
+                                 MARGIN_REWARD_RATE, MAX_LEVERAGE,
+                                 {"from": gov})
+
+    mothership.initializeCollateral(collateral, {"from": gov})
+    multiplex.addCollateral(collateral, {"from": gov})
+
+    for trader in traders:
+        token.approve(collateral, 1e50, {"from": trader})
+
+    return multiplex, collateral
+
+
+def test_feeds_price_their_own_pools(mothership, market, gov, start_time):
+
+    brownie.chain.mine(timestamp=start_time)
+
+    market_feed, ovl_feed = feeds_of(market)
+
+    multiplex = deploy_multiplex(gov, mothership, ovl_feed,
+                                 [market_feed, ovl_feed],
+                                 [WRAPPED_ETH_ADDR, WRAPPED_ETH_ADDR])
+
+    assert multiplex.feedsLength() == 2
+    assert multiplex.feeds(0)['pool'] == market_feed
+    assert multiplex.feeds(1)['pool'] == ovl_feed
+
+    for i, feed in enumerate([market_feed, ovl_feed]):
+
+        micro, macro, _ = multiplex.fetchPricePoint(i)
+
+        assert macro == feed_tick(feed, PRICE_WINDOW_MACRO)
+        assert micro == feed_tick(feed, PRICE_WINDOW_MICRO)
+
+    # feed 0 prices like a single feed market on its pool
+    market = OverlayV1UniswapV3MarketZeroLambdaShim.at(market)
+    assert multiplex.fetchPricePoint(0)[:2] == market.fetchPricePoint()[:2]
+
+
+def test_update_realizes_a_price_point_per_feed(mothership, market, gov,
+                                                start_time):
+
+    brownie.chain.mine(timestamp=start_time)
+
+    market_feed, ovl_feed = feeds_of(market)
+
+    multiplex = deploy_multiplex(gov, mothership, ovl_feed,
+                                 [market_feed, ovl_feed],
+                                 [WRAPPED_ETH_ADDR, WRAPPED_ETH_ADDR])
+
+    events = multiplex.tx.events['NewPricePoint']
+    assert len(events) == 2
+    assert events[0]['bid'] != events[1]['bid']
+
+    brownie.chain.mine(timedelta=PRICE_WINDOW_MICRO)
+    tx = multiplex.update({"from": gov})
+
+    feeds_read = {c['to'] for c in tx.subcalls}
+
+    assert market_feed.address in feeds_read
+    assert ovl_feed.address in feeds_read
+
+    # one update, one price point index across the feeds
+    assert multiplex.pricePointNextIndex() == 2
+    assert len(tx.events['NewPricePoint']) == 2
+
+    dai_bid, _, _ = multiplex.pricePoints(0, 1)
+    axs_bid, _, _ = multiplex.pricePoints(1, 1)
+
+    assert tx.events['NewPricePoint'][0]['bid'] == dai_bid
+    assert tx.events['NewPricePoint'][1]['bid'] == axs_bid
+    assert dai_bid != axs_bid
+
+
+def test_feeds_keep_their_own_oi(mothership, market, token, gov, alice, bob,
+                                 start_time):
+    '''
+    Test that positions built through the collateral manager on one feed of
+    a multiplex market book open interest on that feed only, are keyed by
+    their feed, and unwind from it.
+    '''
+    brownie.chain.mine(timestamp=start_time)
+
+    market_feed, ovl_feed = feeds_of(market)
+
+    multiplex, collateral = live_multiplex(
+        gov, token, mothership, [market_feed, ovl_feed], ovl_feed,
+        [alice, bob])
+
+    tx_long = collateral.build(multiplex, 1, COLLATERAL, 1, True, 0,
+                               {"from": bob})
+    entry = multiplex.pricePointNextIndex() - 1
+
+    tx_short = collateral.build(multiplex, 0, COLLATERAL, 2, False, 0,
+                                {"from": alice})
+
+    long_pid = tx_long.events['Build']['positionId']
+    short_pid = tx_short.events['Build']['positionId']
+
+    assert tx_long.events['Build']['feed'] == 1
+    assert collateral.positions(long_pid)['feed'] == 1
+    assert collateral.positions(short_pid)['feed'] == 0
+
+    assert long_pid == collateral.positionId(multiplex, 1, True, 1, entry)
+    assert long_pid != collateral.positionId(multiplex, 0, True, 1, entry)
+
+    long_oi = tx_long.events['Build']['oi']
+    short_oi = tx_short.events['Build']['oi']
+
+    assert multiplex.oiLong(1) == long_oi
+    assert multiplex.oiShort(1) == 0
+    assert multiplex.oiLongShares(1) == long_oi
+
+    assert multiplex.oiShort(0) == short_oi
+    assert multiplex.oiLong(0) == 0
+    assert multiplex.oiShortShares(0) == short_oi
+
+    # a funding epoch pays on each feed's book, one sided books draw down
+    brownie.chain.mine(timedelta=COMPOUND_PERIOD)
+    tx = multiplex.update({"from": gov})
+
+    funding = tx.events['FundingPaid']
+    assert len(funding) == 2
+    assert funding[0]['oiShort'] == multiplex.oiShort(0) < short_oi
+    assert funding[1]['oiLong'] == multiplex.oiLong(1) < long_oi
+
+    assert collateral.value(long_pid) > 0
+
+    collateral.unwind(long_pid, collateral.balanceOf(bob, long_pid),
+                      {"from": bob})
+
+    assert multiplex.oiLong(1) == approx(0, abs=1e3)
+    assert multiplex.oiLongShares(1) == 0
+    assert multiplex.oiShort(0) == funding[0]['oiShort']
+    assert collateral.positions(long_pid)['oiShares'] == 0
+
+
+def test_build_needs_a_feed(mothership, market, token, gov, bob, start_time):
+
+    brownie.chain.mine(timestamp=start_time)
+
+    market_feed, ovl_feed = feeds_of(market)
+
+    multiplex, collateral = live_multiplex(
+        gov, token, mothership, [market_feed, ovl_feed], ovl_feed, [bob])
+
+    collateral.setMarketInfo(multiplex, 2, MARGIN_MAINTENANCE,
+                             MARGIN_REWARD_RATE, MAX_LEVERAGE, {"from": gov})
+
+    with reverts("OVLV1:!feed"):
+        collateral.build(multiplex, 2, COLLATERAL, 1, True, 0, {"from": bob})
+
+
+def test_feed_must_quote_in_its_pool(mothership, market, gov, start_time):
+
+    brownie.chain.mine(timestamp=start_time)
+
+    market_feed, ovl_feed = feeds_of(market)
+
+    # the AXS/WETH pool does not quote in DAI
+    with reverts("OVLV1:!quote"):
+        deploy_multiplex(gov, mothership, ovl_feed, [market_feed, ovl_feed],
+                         [WRAPPED_ETH_ADDR, market_feed.token0()])
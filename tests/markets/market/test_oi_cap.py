@@ -0,0 +1,85 @@
+import brownie
+from brownie import chain
+
+OI_CAP = 800000e18
+
+
+def test_update_skips_cap(market, gov, start_time):
+
+    brownie.chain.mine(timestamp=start_time)
+
+    tx = market.update({"from": gov})
+
+    (memoized, _, _) = market.brrrrdThen()
+    assert memoized != tx.timestamp
+
+
+def test_build_memoizes_brrrrd_unwind_skips_cap(
+        ovl_collateral,
+        market,
+        token,
+        bob,
+        start_time):
+
+    brownie.chain.mine(timestamp=start_time)
+
+    collateral = 1e18
+    token.approve(ovl_collateral, 3 * collateral, {"from": bob})
+
+    # the first build rolls in the first brrrrd roller, filed at time zero,
+    # which is then the start of the macro window, so the memo is cleared
+    tx_build = ovl_collateral.build(market, collateral, 1, True, 0,
+                                    {"from": bob})
+
+    (memoized, _, _) = market.brrrrdThen()
+    assert memoized == 0
+
+    chain.mine(timedelta=600)
+
+    tx_build = ovl_collateral.build(market, collateral, 1, True, 0,
+                                    {"from": bob})
+
+    pid = tx_build.events['Build']['positionId']
+    oi_shares = ovl_collateral.balanceOf(bob, pid)
+
+    (memoized, _, _) = market.brrrrdThen()
+    assert memoized == tx_build.timestamp
+
+    chain.mine(timedelta=600)
+
+    tx_unwind = ovl_collateral.unwind(pid, oi_shares, {"from": bob})
+
+    (memoized, _, _) = market.brrrrdThen()
+    assert memoized < tx_unwind.timestamp
+
+
+def test_roll_keeps_brrrrd_memo(ovl_collateral, market, token, bob, gov,
+                                start_time):
+    '''
+    Test that the first build of a brrrrd micro window keeps the memo, since
+    rolling in the last window's roller leaves the macro window start be.
+    '''
+    market = brownie.OverlayV1UniswapV3MarketZeroLambdaShim.at(market)
+
+    # micro windows short enough to roll within the feeds
+    market.setComptrollerParams(market.lmbda(), OI_CAP,
+                                market.brrrrdExpected(), 3600, 600,
+                                {"from": gov})
+
+    brownie.chain.mine(timestamp=start_time)
+
+    collateral = 1e18
+    token.approve(ovl_collateral, 2 * collateral, {"from": bob})
+
+    ovl_collateral.build(market, collateral, 1, True, 0, {"from": bob})
+
+    chain.mine(timestamp=market.brrrrdFiling() + 1)
+    cycloid = market.brrrrdCycloid()
+
+    tx_build = ovl_collateral.build(market, collateral, 1, True, 0,
+                                    {"from": bob})
+
+    assert market.brrrrdCycloid() == cycloid + 1
+
+    (memoized, _, _) = market.brrrrdThen()
+    assert memoized == tx_build.timestamp
@@ -0,0 +1,121 @@
+import brownie
+from brownie import chain, reverts
+
+RING = 4
+
+
+def update_blocks(market, gov, n, timedelta=60):
+    for _ in range(n):
+        chain.mine(timedelta=timedelta)
+        tx = market.update({"from": gov})
+    return tx
+
+
+def test_set_ring_once(market, gov):
+
+    with reverts("OVLV1:!ring"):
+        market.setPricePointRing(0, {"from": gov})
+
+    start = market.pricePointNextIndex()
+    market.setPricePointRing(RING, {"from": gov})
+
+    assert market.pricePointRing() == RING
+    assert market.pricePointRingFrom() == start
+
+    with reverts("OVLV1:ring"):
+        market.setPricePointRing(RING, {"from": gov})
+
+
+def test_ring_keeps_referenced_price_points(
+        ovl_collateral,
+        market,
+        token,
+        gov,
+        bob,
+        start_time):
+
+    brownie.chain.mine(timestamp=start_time)
+
+    market.setPricePointRing(RING, {"from": gov})
+    update_blocks(market, gov, 2)
+
+    collateral = 1e18
+    token.approve(ovl_collateral, collateral, {"from": bob})
+    tx = ovl_collateral.build(market, collateral, 1, True, 0,
+                              {"from": bob})
+
+    pid = tx.events['Build']['positionId']
+    (_, _, _, _, entry, _, _, _) = ovl_collateral.positions(pid)
+
+    assert market.isPricePointReferenced(entry)
+    entry_price = market.pricePoints(entry)
+
+    update_blocks(market, gov, 1)
+    unreferenced = market.pricePointNextIndex() - 1
+    assert not market.isPricePointReferenced(unreferenced)
+
+    # wrap the ring twice over
+    update_blocks(market, gov, 2 * RING)
+
+    assert market.pricePointNextIndex() > entry + RING
+    assert market.pricePoints(entry) == entry_price
+
+    with reverts("OVLV1:pruned"):
+        market.pricePoints(unreferenced)
+
+    # price points from before the ring are left in place
+    assert market.pricePoints(0)[0] > 0
+
+
+def test_ring_frees_released_price_points(
+        ovl_collateral,
+        market,
+        token,
+        gov,
+        bob,
+        start_time):
+    '''
+    Test that a checkpoint is freed once the position holding its price
+    point exits, so that evicting referenced price points over and over
+    neither keeps their checkpoints nor costs more gas.
+    '''
+    brownie.chain.mine(timestamp=start_time)
+
+    market.setPricePointRing(RING, {"from": gov})
+    update_blocks(market, gov, 2)
+
+    collateral = 1e18
+    token.approve(ovl_collateral, 1e50, {"from": bob})
+
+    gas = []
+
+    for _ in range(5):
+        tx = ovl_collateral.build(market, collateral, 1, True, 0,
+                                  {"from": bob})
+
+        pid = tx.events['Build']['positionId']
+        (_, _, _, _, entry, _, _, _) = ovl_collateral.positions(pid)
+        entry_price = market.pricePoints(entry)
+
+        # an update a compounding period, so each pays funding once
+        tx = update_blocks(market, gov, RING, timedelta=600)
+        gas.append(tx.gas_used)
+
+        assert market.pricePointNextIndex() == entry + RING + 1
+        assert market.pricePoints(entry) == entry_price
+
+        shares = ovl_collateral.balanceOf(bob, pid)
+        ovl_collateral.unwind(pid, shares // 2, {"from": bob})
+
+        assert market.isPricePointReferenced(entry)
+        assert market.pricePoints(entry) == entry_price
+
+        ovl_collateral.unwind(pid, shares - shares // 2, {"from": bob})
+
+        assert not market.isPricePointReferenced(entry)
+
+        with reverts("OVLV1:pruned"):
+            market.pricePoints(entry)
+
+    # each eviction checkpoints into a freed slot at the same cost
+    assert max(gas) - min(gas) < 5000
@@ -0,0 +1,350 @@
+import copy
+
+import brownie
+from brownie import chain
+from brownie.exceptions import VirtualMachineError
+from brownie.test import given
+from hypothesis import settings, strategies
+
+from scripts.overlay_model import (
+    CollateralModel,
+    MarketModel,
+    ModelRevert,
+)
+
+MAX_COLLATERAL = 10000 * 10**18
+MAX_STEPS = 25
+
+ACTIONS = strategies.lists(
+    strategies.one_of(
+        strategies.tuples(
+            strategies.just('build'),
+            strategies.integers(min_value=0, max_value=1),
+            strategies.integers(min_value=0, max_value=MAX_COLLATERAL),
+            strategies.integers(min_value=1, max_value=100),
+            strategies.booleans(),
+        ),
+        strategies.tuples(
+            strategies.just('unwind'),
+            strategies.integers(min_value=0, max_value=2**16),
+            strategies.integers(min_value=1, max_value=100),
+        ),
+        strategies.tuples(
+            strategies.just('liquidate'),
+            strategies.integers(min_value=0, max_value=2**16),
+        ),
+        strategies.tuples(
+            strategies.just('mine'),
+            strategies.integers(min_value=1, max_value=1800),
+        ),
+        strategies.tuples(strategies.just('update')),
+        strategies.tuples(
+            strategies.just('setK'),
+            strategies.integers(min_value=0, max_value=10**15),
+        ),
+        strategies.tuples(
+            strategies.just('setSpread'),
+            strategies.integers(min_value=0, max_value=10**16),
+        ),
+    ),
+    min_size=1,
+    max_size=MAX_STEPS,
+)
+
+
+class Unpriced(Exception):
+    '''
+    The model needs a price point the chain never realized, e.g. the exit
+    price of a transaction that reverted.
+    '''
+
+
+class Harness:
+    '''
+    Runs actions against the contracts and the reference model in lockstep,
+    comparing every piece of observable state in wei after each step.
+    '''
+    def __init__(self, market, ovl_collateral, mothership, token, traders,
+                 liquidator, gov):
+        assert market.lmbda() == 0, 'model covers zero lambda markets'
+
+        self.market = market
+        self.collateral = ovl_collateral
+        self.token = token
+        self.traders = traders
+        self.liquidator = liquidator
+        self.gov = gov
+        self.where = 'setup'
+
+        market_model = MarketModel(
+            market.address,
+            market.k(),
+            market.pbnj(),
+            market.compoundingPeriod(),
+            market.compounded(),
+            market.updated(),
+            market.pricePointNextIndex(),
+            market.oiCap(),
+            market.priceFrameCap(),
+            oi_long=market.oiLong(),
+            oi_short=market.oiShort(),
+            oi_long_shares=market.oiLongShares(),
+            oi_short_shares=market.oiShortShares(),
+        )
+
+        accounts = [t.address for t in traders] + [liquidator.address]
+
+        self.model = CollateralModel(
+            market_model,
+            mothership.fee(),
+            ovl_collateral.marginMaintenance(market, 0),
+            ovl_collateral.marginRewardRate(market, 0),
+            ovl_collateral.maxLeverage(market, 0),
+            {a: token.balanceOf(a) for a in accounts},
+            token.totalSupply(),
+            fees=ovl_collateral.fees(),
+            liquidations=ovl_collateral.liquidations(),
+        )
+
+    def assert_wei(self, name, actual, expected):
+        assert actual == expected, (
+            f'{self.where}: {name} diverged by {actual - expected} wei '
+            f'(chain {actual}, model {expected})'
+        )
+
+    def prices(self, index):
+        if index >= self.market.pricePointNextIndex():
+            raise Unpriced(index)
+        bid, ask, _ = self.market.pricePoints(index)
+        return bid, ask
+
+    def unrealized_prices(self, tx):
+        '''
+        Prices of the realized price points and of the next one, which a
+        reverted transaction fetched but never realized. The next one is
+        fetched at the transaction's block, so at its timestamp.
+        '''
+        next_index = self.market.pricePointNextIndex()
+
+        fetched = self.market.fetchPricePoint(
+            block_identifier=tx.block_number)
+        bid, ask, _ = self.market.readPricePoint['tuple'](
+            fetched, block_identifier=tx.block_number)
+
+        def prices(index):
+            return (bid, ask) if index == next_index else self.prices(index)
+
+        return prices
+
+    def transact(self, fn, *args):
+        try:
+            return fn(*args), None
+        except VirtualMachineError as e:
+            return brownie.network.history[-1], e.revert_msg
+
+    def apply(self, step, reason):
+        '''
+        Applies a step to the model, rolling it back where the model
+        reverts, and checks chain and model agree on reverting.
+        '''
+        snapshot = copy.deepcopy(self.model)
+        self.model.market.funding_paid = []
+
+        try:
+            result = step(self.model)
+        except ModelRevert as e:
+            self.model = snapshot
+            assert reason is not None, \
+                f'{self.where}: model reverted with {e.reason!r}, ' \
+                'chain did not'
+            if e.reason is not None:
+                assert reason == e.reason, \
+                    f'{self.where}: chain reverted with {reason!r}, ' \
+                    f'model with {e.reason!r}'
+            return None
+        except Unpriced:
+            assert reason is not None, \
+                f'{self.where}: chain did not realize a price point'
+            self.model = snapshot
+            return None
+
+        if reason is not None:
+            self.model = snapshot
+        assert reason is None, \
+            f'{self.where}: chain reverted with {reason!r}, model did not'
+
+        return result
+
+    def check_funding(self, tx):
+        paid = [
+            (e['oiLong'], e['oiShort'], e['fundingPaid'])
+            for e in tx.events['FundingPaid']
+        ] if 'FundingPaid' in tx.events else []
+
+        assert len(paid) == len(self.model.market.funding_paid), \
+            f'{self.where}: funding paid {len(paid)} times on chain, ' \
+            f'{len(self.model.market.funding_paid)} in the model'
+
+        for actual, expected in zip(paid, self.model.market.funding_paid):
+            self.assert_wei('FundingPaid.oiLong', actual[0], expected[0])
+            self.assert_wei('FundingPaid.oiShort', actual[1], expected[1])
+            self.assert_wei('FundingPaid.fundingPaid', actual[2], expected[2])
+
+    def run(self, step, action):
+        self.where = f'step {step} {action}'
+        getattr(self, action[0])(*action[1:])
+        self.check()
+
+    def build(self, trader, collateral, leverage, is_long):
+        trader = self.traders[trader]
+
+        tx, reason = self.transact(
+            self.collateral.build, self.market, collateral, leverage,
+            is_long, 0, {'from': trader})
+
+        result = self.apply(
+            lambda m: m.build(tx.timestamp, trader.address, collateral,
+                              leverage, is_long),
+            reason)
+
+        if result is None:
+            return
+
+        pid, oi, debt = result
+        self.assert_wei('Build.positionId',
+                        tx.events['Build']['positionId'], pid)
+        self.assert_wei('Build.oi', tx.events['Build']['oi'], oi)
+        self.assert_wei('Build.debt', tx.events['Build']['debt'], debt)
+        self.check_funding(tx)
+
+    def unwind(self, pick, percent):
+        held = sorted(
+            (account, pid) for (account, pid), shares
+            in self.model.shares.items() if shares > 0
+        )
+        if not held:
+            return
+
+        account, pid = held[pick % len(held)]
+        trader = next(t for t in self.traders if t.address == account)
+        shares = max(1, self.model.share_balance(account, pid)
+                     * percent // 100)
+
+        tx, reason = self.transact(
+            self.collateral.unwind, pid, shares, {'from': trader})
+
+        result = self.apply(
+            lambda m: m.unwind(tx.timestamp, account, pid, shares,
+                               self.prices),
+            reason)
+
+        if result is None:
+            return
+
+        oi, debt = result
+        self.assert_wei('Unwind.oi', tx.events['Unwind']['oi'], oi)
+        self.assert_wei('Unwind.debt', tx.events['Unwind']['debt'], debt)
+        self.check_funding(tx)
+
+    def liquidate(self, pick):
+        pids = sorted(self.model.positions)
+        if not pids:
+            return
+
+        pid = pids[pick % len(pids)]
+
+        tx, reason = self.transact(
+            self.collateral.liquidate, pid, self.liquidator,
+            {'from': self.liquidator})
+
+        # the exit price of a reverted liquidation is never realized, so the
+        # model reads it as the reverted transaction did
+        prices = self.unrealized_prices(tx) \
+            if reason == 'OVLV1:!liquidatable' else self.prices
+
+        result = self.apply(
+            lambda m: m.liquidate(tx.timestamp, pid, self.liquidator.address,
+                                  prices),
+            reason)
+
+        if result is None:
+            return
+
+        self.assert_wei('Liquidate.reward',
+                        tx.events['Liquidate']['reward'], result)
+        self.check_funding(tx)
+
+    def mine(self, seconds):
+        chain.mine(timedelta=seconds)
+
+    def update(self):
+        tx = self.market.update({'from': self.gov})
+        self.apply(lambda m: m.market.update(tx.timestamp), None)
+        self.check_funding(tx)
+
+    def setK(self, k):
+        self.market.setK(k, {'from': self.gov})
+        self.model.market.k = k
+
+    def setSpread(self, pbnj):
+        self.market.setSpread(pbnj, {'from': self.gov})
+        self.model.market.pbnj = pbnj
+
+    def check(self):
+        market = self.model.market
+
+        self.assert_wei('k', self.market.k(), market.k)
+        self.assert_wei('pbnj', self.market.pbnj(), market.pbnj)
+        self.assert_wei('updated', self.market.updated(), market.updated)
+        self.assert_wei('compounded', self.market.compounded(),
+                        market.compounded)
+        self.assert_wei('pricePointNextIndex',
+                        self.market.pricePointNextIndex(),
+                        market.price_points)
+        self.assert_wei('oiLongShares', self.market.oiLongShares(),
+                        market.oi_long_shares)
+        self.assert_wei('oiShortShares', self.market.oiShortShares(),
+                        market.oi_short_shares)
+
+        self.assert_wei('fees', self.collateral.fees(), self.model.fees)
+        self.assert_wei('liquidations', self.collateral.liquidations(),
+                        self.model.liquidations)
+        self.assert_wei('totalSupply', self.token.totalSupply(),
+                        self.model.total_supply)
+
+        for account, balance in self.model.balances.items():
+            self.assert_wei(f'balanceOf({account})',
+                            self.token.balanceOf(account), balance)
+
+        for (account, pid), shares in self.model.shares.items():
+            self.assert_wei(f'shares({account}, {pid})',
+                            self.collateral.balanceOf(account, pid), shares)
+
+        for pid, pos in self.model.positions.items():
+            actual = self.collateral.positions(pid)
+            for name, a, e in zip(
+                    ('market', 'feed', 'isLong', 'leverage', 'pricePoint',
+                     'oiShares', 'debt', 'cost'),
+                    actual, pos.info()):
+                if isinstance(e, int) and not isinstance(e, bool):
+                    self.assert_wei(f'positions({pid}).{name}', a, e)
+                else:
+                    assert a == e, f'{self.where}: positions({pid}).{name}'
+
+
+@settings(max_examples=20, deadline=None)
+@given(actions=ACTIONS)
+def test_contracts_match_model(market, ovl_collateral, mothership, token,
+                               gov, alice, bob, start_time, actions):
+    '''
+    Runs random action sequences against the contracts and the reference
+    model in scripts/overlay_model.py. Hypothesis shrinks a diverging
+    sequence; the failure names the step and the divergence in wei.
+    '''
+    brownie.chain.mine(timestamp=start_time)
+
+    harness = Harness(market, ovl_collateral, mothership, token,
+                      [alice, bob], gov, gov)
+
+    for step, action in enumerate(actions):
+        harness.run(step, action)
@@ -0,0 +1,77 @@
+import asyncio
+
+from brownie import (
+    OverlayV1OVLCollateral,
+    OverlayV1UniswapV3MarketZeroLambdaShim,
+    chain
+)
+from scripts.event_pipeline import Event, EventPipeline, Subscription
+
+
+def drain(subscription):
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+def test_slow_consumer_drops_oldest():
+    '''
+    Test that a full subscription drops its oldest event for the newest,
+    and skips events it is not subscribed to.
+    '''
+    async def publish():
+        subscription = Subscription(['Build'], maxsize=2)
+        for block in range(5):
+            subscription.put(Event('Build', None, block, None, 0, {}))
+        subscription.put(Event('Unwind', None, 5, None, 0, {}))
+        return subscription
+
+    subscription = asyncio.run(publish())
+
+    assert [e.block_number for e in drain(subscription)] == [3, 4]
+    assert subscription.dropped == 3
+
+
+def test_pipeline_streams_events(market, ovl_collateral, bob, start_time):
+    '''
+    Test that the pipeline publishes the market and collateral manager
+    events of a block range, decoded as brownie decodes them.
+    '''
+    contracts = [
+        OverlayV1UniswapV3MarketZeroLambdaShim.at(market.address),
+        OverlayV1OVLCollateral.at(ovl_collateral.address),
+    ]
+
+    chain.mine(timestamp=start_time)
+    start = chain.height + 1
+
+    tx_build = ovl_collateral.build(market, 1e18, 1, True, 0, {'from': bob})
+
+    chain.mine(timedelta=1200)
+    tx_update = market.update({'from': bob})
+
+    async def stream():
+        pipeline = EventPipeline(contracts, poll=0, max_range=1)
+        everything = pipeline.subscribe()
+        builds = pipeline.subscribe(['Build'])
+
+        await pipeline.run(start, chain.height)
+
+        return pipeline, drain(everything), drain(builds)
+
+    pipeline, events, builds = asyncio.run(stream())
+
+    assert pipeline.block == chain.height
+
+    assert [e.name for e in builds] == ['Build']
+    assert builds[0].args == dict(tx_build.events['Build'])
+    assert builds[0].transaction_hash.hex() == tx_build.txid
+
+    names = [e.name for e in events]
+    assert 'NewPricePoint' in names
+    assert 'FundingPaid' in names
+
+    funding = [e for e in events if e.name == 'FundingPaid'][-1]
+    assert funding.block_number == tx_update.block_number
+    assert funding.args == dict(tx_update.events['FundingPaid'])
@@ -0,0 +1,49 @@
+import brownie
+from brownie import chain
+from brownie.test import given, strategy
+
+from scripts.fixed_point import (
+    E,
+    INVERSE_E,
+    ONE,
+    div_down,
+    mul_down,
+    mul_up,
+    pow_up,
+)
+
+ONE_BLOCK = 13
+
+
+@given(pbnj=strategy('uint256', min_value=1, max_value=.1e18))
+def test_spread_matches_chain(market, gov, pbnj):
+    '''
+    Test that bid and ask of a price point are its price spread by
+    pow_up(INVERSE_E, pbnj) and pow_up(E, pbnj), to the wei.
+    '''
+    market = brownie.OverlayV1UniswapV3MarketZeroLambdaShim.at(market)
+    read = market.readPricePoint['tuple']
+
+    market.setSpread(0, {'from': gov})
+    price, _, _ = read((0, 0, 0))
+
+    market.setSpread(pbnj, {'from': gov})
+    bid, ask, _ = read((0, 0, 0))
+
+    assert bid == mul_down(price, pow_up(INVERSE_E, pbnj))
+    assert ask == mul_up(price, pow_up(E, pbnj))
+
+
+@given(oi=strategy('uint256', min_value=1, max_value=1e24))
+def test_impact_matches_chain(comptroller, oi):
+    '''
+    Test that the impact of a first build is 1 - INVERSE_E.powUp of lambda
+    times its pressure on the cap, to the wei.
+    '''
+    chain.mine(timedelta=ONE_BLOCK)
+
+    cap = comptroller.oiCap()
+    power = mul_down(comptroller.lmbda(), div_down(oi, cap))
+
+    assert comptroller.viewImpact(True, oi) \
+        == ONE - pow_up(INVERSE_E, power)
@@ -0,0 +1,57 @@
+import json
+import os
+
+from brownie import UniswapV3FactoryMock, chain, interface
+from pytest import approx
+from scripts.frame_feeds import ONE_DAY, frame, load_raw, observe, reflect
+from scripts.mock_feeds import load_observations
+
+FEEDS = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                     '../../feeds')
+
+
+def read(name):
+    with open(os.path.normpath(os.path.join(FEEDS, name))) as f:
+        return json.load(f)
+
+
+def test_frame_matches_fixtures():
+    '''
+    Test that framing the first day of the raw feeds reproduces the framed
+    and reflected fixtures the market tests load, without a chain.
+    '''
+    for feed in ['univ3_dai_weth', 'univ3_axs_weth']:
+        framed = frame(load_raw(os.path.join(FEEDS, feed + '_raw_uni.json')))
+
+        assert framed == read(feed + '_raw_uni_framed.json')
+
+        reflected = reflect(framed)
+        expected = read(feed + '_reflected.json')
+
+        assert reflected['timestamp'] == expected['timestamp']
+        for key in ['one_hr', 'ten_min', 'spot', 'bids', 'asks']:
+            assert reflected[key] == approx(expected[key], rel=1e-12)
+
+
+def test_observe_matches_mock(feed_owner):
+    '''
+    Test that observe on a framed window, away from the start of the raw
+    feed, gives the tick cumulatives the mock pool does.
+    '''
+    raw = load_raw(os.path.join(FEEDS, 'univ3_dai_weth_raw_uni.json'))
+    framed = frame(raw, offset=ONE_DAY, length=ONE_DAY // 4)
+
+    obs, shims = framed['observations'], framed['shims']
+
+    factory = feed_owner.deploy(UniswapV3FactoryMock)
+    factory.createPool(feed_owner, feed_owner)
+    pool = interface.IUniswapV3OracleMock(factory.allPools(0))
+
+    load_observations(pool, obs, shims, feed_owner)
+
+    seconds_agos = [3600, 600, 1, 0]
+
+    for time in range(obs[0][0] + 3600, obs[-1][0] + 600, 997):
+        chain.mine(timestamp=time)
+        tick_cumulatives, _ = pool.observe(seconds_agos)
+        assert list(tick_cumulatives) == observe(framed, time, seconds_agos)
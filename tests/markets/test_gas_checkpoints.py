@@ -0,0 +1,133 @@
+import brownie
+import pytest
+from brownie import chain
+from hexbytes import HexBytes
+from scripts.gas_checkpoints import TOPIC, Checkpoints, instrument, load
+
+MARKET = '0x' + '11' * 20
+COLLATERAL = '0x' + '22' * 20
+
+
+class Receipt:
+    '''
+    Logs of a transaction logging (address, label, gasleft) checkpoints.
+    '''
+    def __init__(self, *checkpoints):
+        self.logs = [{
+            'address': address,
+            'topics': [HexBytes(TOPIC),
+                       HexBytes(label.encode().ljust(32, b'\0'))],
+            'data': HexBytes(gas.to_bytes(32, 'big')),
+        } for address, label, gas in checkpoints]
+
+
+def test_instrument():
+    '''
+    Test that markers are rewritten into GasCheckpoint logs and everything
+    else is left as is.
+    '''
+    source = '\n'.join([
+        '        update();',
+        '        // @checkpoint enterOI.update',
+        '        // plain comment',
+    ])
+
+    assert instrument(source).split('\n') == [
+        '        update();',
+        f'        assembly {{ mstore(0x00, gas()) log2(0x00, 0x20, {TOPIC}, '
+        '"enterOI.update") }',
+        '        // plain comment',
+    ]
+
+    with pytest.raises(ValueError):
+        instrument('// @checkpoint ' + 'x' * 16 + '.' + 'y' * 16)
+
+
+def test_checkpoints_charge_steps_within_stage():
+    '''
+    Test that a step is charged the gas since the previous checkpoint of
+    its stage in the same contract, across checkpoints of nested stages.
+    '''
+    checkpoints = Checkpoints()
+    checkpoints.add(Receipt(
+        (COLLATERAL, 'build.start', 100000),
+        (MARKET, 'enterOI.start', 90000),
+        (MARKET, 'update.start', 89000),
+        (MARKET, 'update.payFunding', 80000),
+        (MARKET, 'enterOI.update', 79500),
+        (MARKET, 'enterOI.addOi', 70000),
+        (COLLATERAL, 'build.enterOI', 68000),
+        (COLLATERAL, 'build.mint', 40000),
+    ))
+
+    assert dict(checkpoints.stages) == {
+        'build': [60000],
+        'enterOI': [20000],
+        'update': [9000],
+    }
+    assert dict(checkpoints.steps) == {
+        ('update', 'payFunding'): [9000],
+        ('enterOI', 'update'): [10500],
+        ('enterOI', 'addOi'): [9500],
+        ('build', 'enterOI'): [32000],
+        ('build', 'mint'): [28000],
+    }
+
+    assert [row[0] for row in checkpoints.summary()] == [
+        'build', '  enterOI', '  mint',
+        'enterOI', '  update', '  addOi',
+        'update', '  payFunding',
+    ]
+
+
+def test_production_build_has_no_checkpoints():
+    '''
+    Test that the production artifacts carry no checkpoint logs.
+    '''
+    for name in ['OverlayV1OVLCollateral',
+                 'OverlayV1UniswapV3MarketZeroLambdaShim']:
+        assert TOPIC[2:] not in getattr(brownie, name).bytecode
+
+
+def test_instrumented_build_unwind(create_mothership, bob):
+    '''
+    Test that a build and unwind on the instrumented contracts log the
+    checkpoints of each stage, with the gas of the market's stages inside
+    the collateral manager's steps that call them.
+    '''
+    instrumented = load()
+
+    mothership = create_mothership(
+        ovlm_type=instrumented.OverlayV1UniswapV3MarketZeroLambdaShim,
+        ovlc_type=instrumented.OverlayV1OVLCollateral,
+    )
+    market = mothership.allMarkets(0)
+    collateral = instrumented.OverlayV1OVLCollateral.at(
+        mothership.allCollaterals(0))
+
+    chain.mine(timedelta=200)
+    tx_build = collateral.build(market, 1e18, 1, True, 0, {'from': bob})
+
+    position = tx_build.return_value
+
+    chain.mine(timedelta=600)
+    tx_unwind = collateral.unwind(
+        position, collateral.balanceOf(bob, position), {'from': bob})
+
+    checkpoints = Checkpoints()
+    checkpoints.add(tx_build)
+    checkpoints.add(tx_unwind)
+
+    stages = checkpoints.stages
+    steps = checkpoints.steps
+
+    assert set(stages) == {'build', 'enterOI', 'update', 'intake', 'unwind',
+                           'exitData'}
+    assert len(stages['update']) == 2
+
+    assert steps[('build', 'enterOI')][0] > stages['enterOI'][0]
+    assert steps[('enterOI', 'update')][0] > stages['update'][0]
+    assert steps[('enterOI', 'intake')][0] > stages['intake'][0]
+    assert steps[('unwind', 'exitData')][0] > stages['exitData'][0]
+
+    assert checkpoints.report()
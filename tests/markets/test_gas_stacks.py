@@ -0,0 +1,24 @@
+import brownie
+from scripts.gas_stacks import GasStacks
+
+
+def test_build_stacks(ovl_collateral, market, bob, start_time):
+    '''
+    Test that the stacks of a build sum to the gas its trace spent and
+    reach the market's update through enterOI.
+    '''
+    brownie.chain.mine(timestamp=start_time)
+
+    tx = ovl_collateral.build(market, 1e18, 1, True, 0, {'from': bob})
+
+    stacks = GasStacks()
+    stacks.add(tx)
+
+    trace = tx.trace
+    assert sum(stacks.stacks.values()) \
+        == trace[0]['gas'] - trace[-1]['gas'] + trace[-1]['gasCost']
+
+    fns = {fn for fn, _, _ in stacks.functions()}
+    assert any(fn.endswith('.enterOI') for fn in fns)
+    assert any(fn.endswith('.update') for fn in fns)
+    assert any(fn.endswith('.fetchPricePoint') for fn in fns)
@@ -0,0 +1,101 @@
+import json
+import os
+
+import pytest
+from brownie import UniswapV3FactoryMock, interface
+from scripts.influx_feeds import Q128, convert, frame, read_rows
+from scripts.mock_feeds import load_observations
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'fixtures')
+
+LIQUIDITY = 10**24
+
+
+def test_convert_fixture(feed_owner, tmp_path):
+    '''
+    Test that converting the ETH/DAI export gives a framed feed whose shim
+    ticks reproduce the exported tick cumulatives, and that loads into a
+    mock pool as is.
+    '''
+    dst = tmp_path / 'eth_dai_framed.json'
+
+    count = convert(os.path.join(FIXTURES, 'uniswapv3_eth_dai.csv'), dst,
+                    LIQUIDITY)
+
+    with open(dst) as f:
+        feed = json.load(f)
+
+    obs, shims = feed['observations'], feed['shims']
+
+    assert count == len(obs) == len(shims)
+    assert [s[3] for s in shims] == list(range(1, count + 1))
+
+    for ob, following, shim in zip(obs, obs[1:], shims):
+        elapsed = following[0] - ob[0]
+        growth = following[1] - ob[1]
+
+        assert shim[2] * elapsed <= growth < (shim[2] + 1) * elapsed
+        assert following[2] - ob[2] == (elapsed << 128) // LIQUIDITY
+
+    factory = feed_owner.deploy(UniswapV3FactoryMock)
+    factory.createPool(feed_owner, feed_owner)
+    pool = interface.IUniswapV3OracleMock(factory.allPools(0))
+
+    load_observations(pool, obs, shims, feed_owner)
+
+    assert pool.cardinality() == count
+    assert pool.observations(count - 1) == obs[-1]
+    assert pool.shims(count - 1) == shims[-1]
+
+
+def test_frame_pivots_fields():
+    '''
+    Test that rows of several fields are pivoted per timestamp, with
+    liquidity derived from seconds per liquidity where not exported.
+    '''
+    liquidity = 3 * 10**21
+    lines = ['_time,_field,_value']
+
+    tick_cumulative = spl = 0
+    for i, tick in enumerate([-200, -201, -199, -199]):
+        time = f'2021-05-04T20:{10 * i:02d}:00Z'
+        lines.append(f'{time},tickCumulative,{tick_cumulative}')
+        lines.append(f'{time},secondsPerLiquidityCumulativeX128,{spl}')
+        tick_cumulative += tick * 600
+        spl += 600 * Q128 // liquidity
+
+    observations, shims = zip(*frame(read_rows(lines)))
+
+    assert [s[2] for s in shims] == [-200, -201, -199, -199]
+    assert all(abs(s[1] - liquidity) <= liquidity // 10**9 for s in shims)
+    assert [o[2] for o in observations] \
+        == [i * (600 * Q128 // liquidity) for i in range(4)]
+
+
+def test_read_rows_out_of_order():
+    '''
+    Test that exports not ordered by time are rejected rather than pivoted
+    into a wrong feed.
+    '''
+    lines = [
+        '_time,_field,_value',
+        '2021-05-04T20:10:00Z,tickCumulative,10',
+        '2021-05-04T20:00:00Z,tickCumulative,0',
+    ]
+
+    with pytest.raises(ValueError):
+        list(read_rows(lines))
+
+
+def test_convert_rejects_wide_export(tmp_path):
+    '''
+    Test that an export without _time/_field/_value columns is rejected
+    rather than converted into an empty feed.
+    '''
+    dst = tmp_path / 'dai_weth_framed.json'
+
+    with pytest.raises(ValueError, match='_time, _field, _value'):
+        convert(os.path.join(FIXTURES, 'uniswap_v3_DAI_WETH.csv'), dst)
+
+    assert not dst.exists()
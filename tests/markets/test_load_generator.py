@@ -0,0 +1,99 @@
+import brownie
+import pytest
+
+from scripts.load_generator import (
+    LoadGenerator,
+    Sent,
+    revert_reason,
+    summarize,
+    trader_accounts
+)
+
+MESSAGE = 'VM Exception while processing transaction: revert OVLV1:>cap'
+
+# Error('OVLV1:collat<min')
+ERROR = '0x08c379a0' + (32).to_bytes(32, 'big').hex() \
+    + (16).to_bytes(32, 'big').hex() + b'OVLV1:collat<min'.hex().ljust(64, '0')
+
+
+def test_revert_reason():
+    assert revert_reason({'error': {'message': MESSAGE}}) == 'OVLV1:>cap'
+    assert revert_reason({'result': ERROR}) == 'OVLV1:collat<min'
+    assert revert_reason({'error': {'message': 'execution reverted',
+                                    'data': ERROR}}) == 'OVLV1:collat<min'
+    assert revert_reason({'error': {'message': 'out of gas'}}) == 'out of gas'
+    assert revert_reason({'result': '0x'}) == 'revert'
+
+
+def test_summarize():
+    sent = [
+        Sent('build', 'a', 0., .1, 1, 300000, None, 1, True),
+        Sent('build', 'a', 0., .2, 1, 200000, None, 2, False),
+        Sent('build', 'b', 0., .3, 0, 50000, 'OVLV1:>cap', 3, False),
+        Sent('build', 'b', 0., .4, 0, None, 'OVLV1:>cap', None, False),
+    ]
+
+    summary = summarize(sent, 2.)
+
+    assert summary['txs'] == 4
+    assert summary['tx_per_s'] == 2.
+    assert summary['blocks'] == 3
+    assert summary['latency']['max'] == .4
+
+    build = summary['build']
+    assert build['revert_rate'] == .5
+    assert build['reverts'] == {'OVLV1:>cap': 2}
+    assert build['gas']['p50'] == 200000
+    assert build['gas_updating']['p50'] == 300000
+    assert 'unwind' not in summary
+
+
+def test_load_generator(market, ovl_collateral, token, gov):
+    '''
+    Test that concurrent traders build, unwind and liquidate, that the
+    keeper pays for market updates, and that every transaction is recorded.
+    '''
+    market = brownie.OverlayV1UniswapV3MarketZeroLambdaShim.at(market)
+    collateral = brownie.OverlayV1OVLCollateral.at(ovl_collateral)
+
+    traders = trader_accounts(4, token, collateral, gov)
+    assert all(trader.balance() == 0 for trader in traders)
+
+    generator = LoadGenerator(market, collateral, traders, keeper=gov,
+                              amounts=(10**18, 10**20), seed=1)
+    summary = generator.run(5)
+
+    assert summary['txs'] == len(generator.sent) > 0
+    assert summary['tx_per_s'] > 0
+    assert summary['build']['revert_rate'] < 1
+    assert summary['update']['txs'] > 0
+
+    assert {s.account for s in generator.sent} \
+        <= {str(t) for t in traders} | {str(gov)}
+    assert all(s.reason for s in generator.sent if not s.status)
+
+
+def test_load_generator_reverts(market, ovl_collateral, token, gov):
+    '''
+    Test that builds below the minimum collateral are counted by reason.
+    '''
+    market = brownie.OverlayV1UniswapV3MarketZeroLambdaShim.at(market)
+    collateral = brownie.OverlayV1OVLCollateral.at(ovl_collateral)
+
+    traders = trader_accounts(2, token, collateral, gov)
+
+    generator = LoadGenerator(market, collateral, traders,
+                              amounts=(10**13, 10**13), mix=(1, 0, 0))
+    build = generator.run(2)['build']
+
+    assert build['revert_rate'] == 1
+    assert build['reverts'] == {'OVLV1:collat<min': build['txs']}
+
+
+def test_trader_accounts_checks_ether(ovl_collateral, token, gov):
+    '''
+    Test that traders are not sent more ether than gov holds.
+    '''
+    with pytest.raises(ValueError):
+        trader_accounts(2, token, ovl_collateral, gov,
+                        ether=gov.balance() // 2 + 1)
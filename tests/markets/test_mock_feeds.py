@@ -0,0 +1,113 @@
+import pytest
+from brownie import UniswapV3FactoryMock, chain, interface, rpc
+from brownie._config import CONFIG
+from scripts import warm_chain
+from scripts.mock_feeds import OBSERVATION_GAS, chunk_size, load_observations
+from scripts.warm_chain import NETWORK, load_feeds
+
+
+def create_pools(feed_owner, n):
+    factory = feed_owner.deploy(UniswapV3FactoryMock)
+    pools = []
+    for i in range(n):
+        factory.createPool(feed_owner, feed_owner)
+        pools.append(interface.IUniswapV3OracleMock(factory.allPools(i)))
+    return pools
+
+
+def test_load_observations_chunked(feed_owner, feed_infos):
+    '''
+    Test that loading a feed in gas bounded chunks of packed observations
+    leaves the mock pool with the same observations, shims and cardinality
+    as the raw feed.
+    '''
+    obs, shims, _ = feed_infos.market_info
+
+    pool, = create_pools(feed_owner, 1)
+
+    gas_limit = 120 * OBSERVATION_GAS
+    chunk = chunk_size(gas_limit)
+
+    txs = load_observations(pool, obs, shims, feed_owner, gas_limit=gas_limit)
+
+    assert 1 < len(txs) == -(-len(obs) // chunk)
+    assert pool.cardinality() == len(obs)
+
+    for i in [0, chunk - 1, chunk, len(obs) - 1]:
+        assert pool.observations(i) == obs[i]
+        assert pool.shims(i) == shims[i]
+
+
+def test_observe_indexed_matches_search(feed_owner, feed_infos):
+    '''
+    Test that observe on an indexed pool returns the same accumulators as the
+    binary search over an unindexed pool, for the windows the markets use.
+    '''
+    obs, shims, reflection = feed_infos.market_info
+
+    searched, indexed = create_pools(feed_owner, 2)
+
+    load_observations(searched, obs, shims, feed_owner, indexed=False)
+    load_observations(indexed, obs, shims, feed_owner)
+
+    assert searched.indexInterval() == 0
+    assert indexed.indexInterval() > 0
+    assert indexed.indexStart() == obs[0][0]
+
+    seconds_ago = [3600, 600, 1, 0]
+
+    # observation timestamps themselves and points between them
+    timestamps = [ob[0] for ob in obs if ob[0] >= reflection['timestamp'][0]]
+    timestamps += reflection['timestamp']
+
+    for timestamp in sorted(set(timestamps))[::7]:
+        chain.mine(timestamp=timestamp)
+        assert indexed.observe(seconds_ago) == searched.observe(seconds_ago)
+
+
+def test_load_feeds(feed_owner, feed_infos):
+    '''
+    Test that the feeds a warm chain is built from are fully loaded.
+    '''
+    factory, market, depth = load_feeds(feed_owner, (
+        feed_infos.market_info[:2],
+        feed_infos.depth_info[:2],
+    ))
+
+    assert UniswapV3FactoryMock.at(factory).allPools(0) == market
+    assert UniswapV3FactoryMock.at(factory).allPools(1) == depth
+
+    for pool, info in [(market, feed_infos.market_info),
+                       (depth, feed_infos.depth_info)]:
+        obs, shims, _ = info
+        pool = interface.IUniswapV3OracleMock(pool)
+        assert pool.cardinality() == len(obs)
+        assert pool.observations(len(obs) - 1) == obs[-1]
+
+
+def test_build_finds_ganache_process(monkeypatch, tmp_path):
+    '''
+    Test that building a warm chain gets as far as loading the feeds, with
+    the process of the ganache it launched in hand. The running ganache
+    stands in for the launched one.
+    '''
+    monkeypatch.setitem(CONFIG.networks[NETWORK], 'cmd',
+                        CONFIG.networks[NETWORK]['cmd'])
+    monkeypatch.setattr(warm_chain, 'WARM', str(tmp_path))
+    monkeypatch.setattr(warm_chain.network, 'connect', lambda _: None)
+    monkeypatch.setattr(warm_chain.network, 'disconnect',
+                        lambda kill_rpc: None)
+
+    assert warm_chain.launch(str(tmp_path)) is rpc.process is not None
+
+    # the running ganache is left alone
+    monkeypatch.setattr(rpc.process, 'terminate', lambda: None)
+    monkeypatch.setattr(rpc.process, 'wait', lambda: None)
+
+    def load_feeds(feed_owner, feed_info):
+        raise RuntimeError('loading')
+
+    monkeypatch.setattr(warm_chain, 'load_feeds', load_feeds)
+
+    with pytest.raises(RuntimeError, match='loading'):
+        warm_chain.build()
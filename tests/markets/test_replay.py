@@ -0,0 +1,97 @@
+import brownie
+from brownie import chain
+
+from scripts.replay import (
+    Order,
+    Replay,
+    load_orders,
+    synthetic_orders,
+    write_orders
+)
+
+ACCOUNTS = ['0x' + '11' * 20, '0x' + '22' * 20]
+
+COLLATERAL = 10**19
+
+
+def test_synthetic_orders(tmp_path):
+    '''
+    Test that a synthetic flow is seeded, by timestamp, and only unwinds or
+    liquidates positions built before, and that it round trips a csv.
+    '''
+    orders = synthetic_orders(0, 86400, ACCOUNTS, builds=50, seed=1)
+
+    assert orders == synthetic_orders(0, 86400, ACCOUNTS, builds=50, seed=1)
+    assert orders != synthetic_orders(0, 86400, ACCOUNTS, builds=50, seed=2)
+    assert [o.timestamp for o in orders] == sorted(o.timestamp for o in orders)
+
+    built = {}
+
+    for order in orders:
+        if order.action == 'build':
+            built[order.position] = order.timestamp
+        else:
+            assert built[order.position] < order.timestamp
+
+    assert len(built) == 50
+
+    path = tmp_path / 'orders.csv'
+    write_orders(orders, path)
+
+    assert load_orders(path) == orders
+
+
+def test_replay(market, ovl_collateral, alice, bob):
+    '''
+    Test that a replay mines the orders of a timestamp into a block, defers
+    orders on positions built in it to the next, and records their receipts
+    and the market at their blocks.
+    '''
+    market = brownie.OverlayV1UniswapV3MarketZeroLambdaShim.at(market)
+    collateral = brownie.OverlayV1OVLCollateral.at(ovl_collateral)
+
+    now = chain.time() + 600
+
+    orders = [
+        Order(now, 'build', alice.address, 'a', COLLATERAL, 1, True),
+        Order(now, 'build', bob.address, 'b', COLLATERAL, 2, False),
+        Order(now, 'unwind', bob.address, 'b'),
+        Order(now + 600, 'liquidate', alice.address, 'b'),
+        Order(now + 600, 'unwind', alice.address, 'a'),
+        Order(now + 600, 'unwind', alice.address, 'c'),
+    ]
+
+    replay = Replay(market, collateral)
+    columns = replay.run(orders)
+
+    assert replay.skipped == orders[-1:]
+
+    assert columns['action'] == ['build', 'build', 'unwind', 'liquidate',
+                                 'unwind']
+    assert columns['timestamp'] == [now] * 3 + [now + 600] * 2
+
+    blocks = columns['block']
+    assert blocks[0] == blocks[1] < blocks[2] < blocks[3] == blocks[4]
+
+    # b is unwound before the keeper gets to it
+    assert columns['status'] == [1, 1, 1, 0, 1]
+    assert all(gas > 0 for gas in columns['gas_used'])
+
+    assert columns['position_id'][:2] == [replay.ids['a'], replay.ids['b']]
+    assert collateral.balanceOf(alice, replay.ids['a']) == 0
+    assert collateral.balanceOf(bob, replay.ids['b']) == 0
+
+    for i, block in enumerate(blocks):
+        oi_long, oi_short, _, _ = market.oi(block_identifier=block)
+
+        assert columns['oi_long'][i] == oi_long
+        assert columns['oi_short'][i] == oi_short
+        assert columns['oi_cap'][i] == market.oiCap(block_identifier=block)
+        assert (columns['bid'][i], columns['ask'][i], columns['depth'][i]) \
+            == market.pricePointCurrent(block_identifier=block)
+
+    assert columns['oi_long'][1] > 0 and columns['oi_short'][1] > 0
+    assert columns['oi_short'][2] == 0
+    assert columns['oi_long'][4] == 0
+
+    assert chain.time() >= now + 600
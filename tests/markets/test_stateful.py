@@ -0,0 +1,174 @@
+import brownie
+from brownie import chain
+from brownie.exceptions import VirtualMachineError
+from brownie.test import state_machine, strategy
+
+MIN_COLLATERAL = 2e14  # clears the min collateral after fees at 100x
+MAX_COLLATERAL = 100e18  # keeps a run of builds under the OI cap
+MAX_LEVERAGE = 100
+
+# a run mines at most STEPS * MAX_MINE seconds, inside the mock feed window
+STEPS = 40
+MAX_MINE = 900
+
+
+class MarketStateMachine:
+    '''
+    Builds, unwinds and liquidates positions on one market and collateral
+    manager, moving time and disbursing fees in between. The chain carries
+    over from step to step and is only reverted between runs, so a run costs
+    one snapshot rather than one per example.
+
+    Invariants checked after every step:
+      - the ERC1155 shares held for a position add up to its oiShares
+      - position oiShares add up to the market's oiLongShares/oiShortShares
+      - OVL supply is held by the known accounts
+      - fees collected equal the build fees, the unwind fees and the fees
+        disbursed so far
+      - the manager holds its fees, liquidations and position costs
+    '''
+
+    st_trader = strategy('uint256', max_value=1)
+    st_collateral = strategy('uint256', min_value=MIN_COLLATERAL,
+                             max_value=MAX_COLLATERAL)
+    st_leverage = strategy('uint256', min_value=1, max_value=MAX_LEVERAGE)
+    st_is_long = strategy('bool')
+    st_pick = strategy('uint256', max_value=2**16)
+    st_percent = strategy('uint256', min_value=1, max_value=100)
+    st_seconds = strategy('uint256', min_value=1, max_value=MAX_MINE)
+
+    def __init__(cls, market, ovl_collateral, mothership, token, traders,
+                 fees, gov, start_time):
+        brownie.chain.mine(timestamp=start_time)
+
+        cls.market = market
+        cls.collateral = ovl_collateral
+        cls.mothership = mothership
+        cls.token = token
+        cls.traders = traders
+        cls.gov = gov
+
+        cls.holders = traders + [fees, gov, ovl_collateral]
+
+    def setup(self):
+        self.positions = set()
+
+        self.build_fees = 0
+        self.unwind_fees = 0
+        self.disbursed_fees = 0
+
+        self.fees = self.collateral.fees()
+
+    def rule_build(self, st_trader, st_collateral, st_leverage, st_is_long):
+        trader = self.traders[st_trader]
+
+        fee_rate = self.mothership.fee()
+
+        tx = self.collateral.build(self.market, st_collateral, st_leverage,
+                                   st_is_long, 0, {'from': trader})
+
+        self.positions.add(tx.events['Build']['positionId'])
+        self.build_fees += st_collateral * st_leverage * fee_rate // 10**18
+
+    def rule_unwind(self, st_pick, st_percent):
+        held = [
+            (t, pid) for pid in sorted(self.positions) for t in self.traders
+            if self.collateral.balanceOf(t, pid) > 0
+            and self.collateral.positions(pid)['oiShares'] > 0
+        ]
+        if not held:
+            return
+
+        trader, pid = held[st_pick % len(held)]
+        shares = max(
+            1, self.collateral.balanceOf(trader, pid) * st_percent // 100)
+
+        fees = self.collateral.fees()
+        self.collateral.unwind(pid, shares, {'from': trader})
+        self.unwind_fees += self.collateral.fees() - fees
+
+    def rule_liquidate(self, st_pick):
+        open_positions = [
+            pid for pid in sorted(self.positions)
+            if self.collateral.positions(pid)['oiShares'] > 0
+        ]
+        if not open_positions:
+            return
+
+        pid = open_positions[st_pick % len(open_positions)]
+
+        try:
+            self.collateral.liquidate(pid, self.gov, {'from': self.gov})
+        except VirtualMachineError as e:
+            assert e.revert_msg == 'OVLV1:!liquidatable'
+
+    def rule_mine(self, st_seconds):
+        chain.mine(timedelta=st_seconds)
+
+    def rule_update(self):
+        self.market.update({'from': self.gov})
+
+    def rule_disburse(self):
+        fees = self.collateral.fees()
+        owed = fees + self.collateral.liquidations()
+
+        if self.token.balanceOf(self.collateral) < owed:
+            with brownie.reverts():
+                self.collateral.disburse({'from': self.gov})
+            return
+
+        tx = self.collateral.disburse({'from': self.gov})
+
+        update = tx.events['Update']
+        assert update['feesCollected'] + update['feesBurned'] == fees
+
+        self.disbursed_fees += fees
+
+    def invariant_position_shares(self):
+        long_shares = short_shares = 0
+
+        for pid in self.positions:
+            pos = self.collateral.positions(pid)
+            oi_shares = pos['oiShares']
+
+            held = sum(self.collateral.balanceOf(t, pid)
+                       for t in self.traders)
+            assert held == oi_shares or oi_shares == 0
+
+            if pos['isLong']:
+                long_shares += oi_shares
+            else:
+                short_shares += oi_shares
+
+        assert self.market.oiLongShares() == long_shares
+        assert self.market.oiShortShares() == short_shares
+
+    def invariant_supply(self):
+        held = sum(self.token.balanceOf(h) for h in self.holders)
+        assert self.token.totalSupply() == held
+
+    def invariant_fees(self):
+        assert self.collateral.fees() + self.disbursed_fees \
+            == self.fees + self.build_fees + self.unwind_fees
+
+    def invariant_collateral_backing(self):
+        costs = sum(
+            self.collateral.positions(pid)['cost'] for pid in self.positions
+            if self.collateral.positions(pid)['oiShares'] > 0
+        )
+
+        books = self.collateral.fees() + self.collateral.liquidations() \
+            + costs
+
+        assert self.token.balanceOf(self.collateral) == books
+
+
+def test_market_state_machine(market, ovl_collateral, mothership, token,
+                              fees, gov, alice, bob, start_time):
+    '''
+    Runs the market state machine over many interaction sequences sharing
+    one chain per run.
+    '''
+    state_machine(MarketStateMachine, market, ovl_collateral, mothership,
+                  token, [alice, bob], fees, gov, start_time,
+                  settings={'max_examples': 25, 'stateful_step_count': STEPS})
@@ -0,0 +1,48 @@
+import brownie
+from brownie import chain
+from brownie.test import given, strategy
+
+from scripts.frame_feeds import reflect_exact
+from scripts.tick_math import get_quote_at_tick
+
+AMOUNT_IN = 10**18
+
+
+@given(tick=strategy('int24', min_value=-400000, max_value=400000))
+def test_quote_matches_chain(market, gov, tick):
+    '''
+    Test that the market prices a tick as get_quote_at_tick does, to the wei.
+    '''
+    market = brownie.OverlayV1UniswapV3MarketZeroLambdaShim.at(market)
+    market.setSpread(0, {'from': gov})
+
+    bid, ask, _ = market.readPricePoint['tuple']((tick, tick, 0))
+
+    price = get_quote_at_tick(tick, AMOUNT_IN, market.base(), market.quote())
+
+    assert bid == ask == price
+
+
+def test_reflect_exact_matches_chain(market, feed_infos):
+    '''
+    Test that exact reflections of the market feed are the bid and ask the
+    market reads at their timestamps.
+    '''
+    market = brownie.OverlayV1UniswapV3MarketZeroLambdaShim.at(market)
+    obs, shims, _ = feed_infos.market_info
+
+    reflected = reflect_exact({'observations': obs, 'shims': shims},
+                              AMOUNT_IN, market.base(), market.quote(),
+                              market.pbnj())
+
+    points = list(zip(reflected['timestamp'], reflected['bids'],
+                      reflected['asks']))
+
+    points = [p for p in points[::97] if p[0] > chain.time()]
+    assert points
+
+    for timestamp, bid, ask in points:
+        chain.mine(timestamp=timestamp)
+
+        price_point = market.fetchPricePoint()
+        assert market.readPricePoint['tuple'](price_point)[:2] == (bid, ask)
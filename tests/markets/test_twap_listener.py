@@ -0,0 +1,61 @@
+from brownie import UniswapV3Listener, chain, interface
+from scripts.twap_listener import PoolListener, seconds_agos, twap_ticks
+
+WINDOWS = [600, 1800, 3600]
+AMOUNT_IN = 10**18
+
+
+def test_twap_ticks_round_down():
+    '''
+    Test that TWAP ticks round to negative infinity like consult.
+    '''
+    assert seconds_agos(WINDOWS) == [0, 600, 1800, 3600]
+    assert twap_ticks([0, 7, -1200, 1800], [2, 600, 600]) == [-4, 2, -3]
+
+
+def test_listen_windows(market, gov):
+    '''
+    Test that a listener reads the TWAP of every window in one call, as
+    single window consults do.
+    '''
+    chain.mine(timedelta=600)
+
+    feed = interface.IUniswapV3OracleMock(market.marketFeed())
+    listener = gov.deploy(UniswapV3Listener, feed)
+
+    ticks = listener.see_ticks(WINDOWS)
+
+    assert len(ticks) == len(WINDOWS)
+    assert ticks[0] == listener.see_tick()
+
+    listened_ticks, quotes = listener.listen_windows(
+        WINDOWS, AMOUNT_IN, feed.token0())
+
+    assert listened_ticks == ticks
+    assert quotes[0] == listener.listen(AMOUNT_IN, feed.token0())
+
+
+def test_pool_listener_matches_chain(market, gov):
+    '''
+    Test that one batch of observes across pools gives the TWAP ticks and
+    quotes the listener contracts read.
+    '''
+    chain.mine(timedelta=600)
+
+    pools = [interface.IUniswapV3OracleMock(market.marketFeed()),
+             interface.IUniswapV3OracleMock(market.ovlFeed())]
+
+    listeners = [gov.deploy(UniswapV3Listener, pool) for pool in pools]
+
+    bases = [pool.token1() for pool in pools]
+    twaps = PoolListener(pools, WINDOWS, AMOUNT_IN, bases).listen()
+
+    assert len(twaps) == len(pools)
+
+    for pool, listener, base, twap in zip(pools, listeners, bases, twaps):
+        ticks, quotes = listener.listen_windows(WINDOWS, AMOUNT_IN, base)
+
+        assert twap.error is None
+        assert twap.pool == pool.address
+        assert twap.ticks == list(ticks)
+        assert twap.quotes == list(quotes)
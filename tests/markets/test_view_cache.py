@@ -0,0 +1,80 @@
+from brownie import chain
+from scripts.view_cache import ViewCache, freeze
+
+
+def test_freeze():
+    assert freeze([1, [2, 3], {'from': 'a'}]) == (1, (2, 3), (('from', 'a'),))
+
+
+def test_views_cached_within_block(market, mothership, ovl_collateral):
+    '''
+    Test that repeated views in a block are served from the cache and match
+    the contract, per arguments, and that a new block invalidates them.
+    '''
+    cache = ViewCache()
+    cached_market = cache.wrap(market)
+    cached_mothership = cache.wrap(mothership)
+    cached_collateral = cache.wrap(ovl_collateral)
+
+    for _ in range(3):
+        assert cached_market.oiCap() == market.oiCap()
+        assert cached_mothership.fee() == mothership.fee()
+        assert cached_collateral.marketInfo(market, 0) \
+            == ovl_collateral.marketInfo(market, 0)
+        assert cached_market.updated() == market.updated()
+
+    assert cache.stats()['misses'] == 4
+    assert cache.stats()['hits'] == 8
+
+    now = chain.time()
+    assert cached_market.epochs(now, 0) == market.epochs(now, 0)
+    assert cached_market.epochs(now, 1) == market.epochs(now, 1)
+    assert cache.stats()['misses'] == 6
+
+    chain.mine()
+
+    assert cached_market.oiCap() == market.oiCap()
+    assert cache.stats()['misses'] == 7
+    assert cache.stats()['entries'] == 1
+    assert cache.stats()['invalidations'] == 1
+
+
+def test_lru_eviction(market):
+    '''
+    Test that the least recently used view is evicted at maxsize.
+    '''
+    cache = ViewCache(maxsize=2)
+    cached_market = cache.wrap(market)
+
+    cached_market.oiCap()
+    cached_market.k()
+    cached_market.oiCap()
+    cached_market.lmbda()
+
+    assert cache.stats()['evictions'] == 1
+
+    cached_market.oiCap()
+    cached_market.k()
+
+    assert cache.stats()['hits'] == 2
+    assert cache.stats()['misses'] == 4
+
+
+def test_pushed_blocks(market):
+    '''
+    Test that with blocks pushed by a listener the cache holds its block
+    until the next is pushed.
+    '''
+    cache = ViewCache(poll=3600)
+    cached_market = cache.wrap(market)
+
+    cache.new_block(chain.height)
+    before = cached_market.compounded()
+
+    chain.mine(timedelta=1200)
+    market.update()
+
+    assert cached_market.compounded() == before
+
+    cache.new_block(chain.height)
+    assert cached_market.compounded() == market.compounded()
@@ -0,0 +1,115 @@
+import pytest
+from hypothesis import given, settings, strategies
+
+import scripts.fixed_point as fixed_point
+import scripts.fixed_point_arrays as arrays
+from scripts.fixed_point import (
+    E,
+    INVERSE_E,
+    ONE,
+    Revert,
+    div_down,
+    exp,
+    ln,
+    log,
+    mul_down,
+    mul_up,
+    pow,
+    pow_down,
+    pow_up,
+)
+
+PBNJ = 5730000000000000
+
+BASES = strategies.one_of(
+    strategies.integers(min_value=1, max_value=ONE),
+    strategies.integers(min_value=9 * 10**17, max_value=11 * 10**17),
+    strategies.integers(min_value=ONE, max_value=10**30),
+)
+EXPONENTS = strategies.integers(min_value=0, max_value=5 * ONE)
+
+
+def scalars(fn, *args):
+    '''
+    Output:
+      [list]: fn of each element of args, or the reason it reverts with
+    '''
+    out = []
+    for element in zip(*args):
+        try:
+            out.append(fn(*element))
+        except Revert as e:
+            out.append(('revert', e.reason))
+    return out
+
+
+def test_known_values():
+    assert exp(ONE) == 2718281828459045235
+    assert exp(0) == ONE
+    assert ln(ONE) == 0
+    assert log(ONE, E) == 0
+
+    assert pow_up(INVERSE_E, 0) == ONE
+    assert pow_up(ONE, 10**30) == ONE
+    assert pow_down(INVERSE_E, PBNJ) < pow(INVERSE_E, PBNJ) \
+        < pow_up(INVERSE_E, PBNJ)
+    assert pow(95 * 10**16, 3 * ONE) == 857375000000000000
+
+
+def test_signed_division_truncates():
+    '''
+    Test that negative logs round toward zero like solidity, not down like
+    python floor division.
+    '''
+    assert ln(ONE - 1) == -1
+    assert ln(95 * 10**16) == -51293294387550533
+    assert exp(-1) == ONE - 1
+
+
+def test_reverts():
+    cases = [
+        (lambda: mul_down(2**255, 2), None),
+        (lambda: mul_up(2**255, 2), None),
+        (lambda: div_down(ONE, 0), 'BAL#004'),
+        (lambda: div_down(2**255, ONE), None),
+        (lambda: pow(2**255, ONE), 'BAL#006'),
+        (lambda: pow(2 * ONE, 2**254), 'BAL#007'),
+        (lambda: pow(10**30, 100 * ONE), 'BAL#008'),
+        (lambda: pow(0, ONE), None),
+        (lambda: exp(131 * ONE), 'BAL#009'),
+        (lambda: ln(0), 'BAL#100'),
+    ]
+
+    for fn, reason in cases:
+        with pytest.raises(Revert) as e:
+            fn()
+        assert e.value.reason == reason
+
+
+@settings(max_examples=50)
+@given(
+    x=strategies.lists(BASES, min_size=1, max_size=64),
+    y=strategies.lists(EXPONENTS, min_size=1, max_size=64))
+def test_arrays_match_scalars(x, y):
+    x, y = x[:len(y)], y[:len(x)]
+
+    for name in ['pow_up', 'pow_down', 'mul_up', 'mul_down', 'div_up',
+                 'div_down']:
+        expected = scalars(getattr(fixed_point, name), x, y)
+        if any(isinstance(value, tuple) for value in expected):
+            continue
+        assert list(getattr(arrays, name)(x, y)) == expected, name
+
+    assert list(arrays.ln(x)) == scalars(ln, x)
+    assert list(arrays.exp([v - 41 * ONE for v in y])) \
+        == scalars(exp, [v - 41 * ONE for v in y])
+
+
+def test_arrays_revert():
+    with pytest.raises(Revert) as e:
+        arrays.pow_up([ONE, 2**255], [ONE, ONE])
+    assert e.value.reason == 'BAL#006'
+
+    with pytest.raises(Revert) as e:
+        arrays.ln([ONE, 0])
+    assert e.value.reason == 'BAL#100'
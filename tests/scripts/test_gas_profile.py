@@ -0,0 +1,56 @@
+from scripts.gas_profile import merge_gas_profiles
+
+
+def stats(*gas_used, failed=0):
+    '''
+    Gas profile entry as TxHistory records it for a sequence of calls, the
+    last `failed` of which reverted.
+    '''
+    succeeded = gas_used[:len(gas_used) - failed]
+    return {
+        'avg': sum(gas_used) // len(gas_used),
+        'high': max(gas_used),
+        'low': min(gas_used),
+        'count': len(gas_used),
+        'count_success': len(succeeded),
+        'avg_success': sum(succeeded) // len(succeeded) if succeeded else 0,
+    }
+
+
+def test_merge_gas_profiles():
+    '''
+    Test that merging the gas profiles of two workers gives the profile of
+    all their calls on one chain, and keeps functions only one worker
+    called.
+    '''
+    worker_0 = {
+        'OverlayV1OVLCollateral.build': stats(200000, 220000),
+        'OverlayV1OVLCollateral.unwind': stats(150000),
+    }
+    worker_1 = {
+        'OverlayV1OVLCollateral.build': stats(240000, 30000, failed=1),
+        'OverlayV1OVLCollateral.liquidate': stats(180000),
+    }
+
+    merged = merge_gas_profiles(worker_0, worker_1)
+
+    assert merged == {
+        'OverlayV1OVLCollateral.build': stats(200000, 220000, 240000, 30000,
+                                              failed=1),
+        'OverlayV1OVLCollateral.unwind': stats(150000),
+        'OverlayV1OVLCollateral.liquidate': stats(180000),
+    }
+
+
+def test_merge_gas_profiles_no_successes():
+    '''
+    Test that merging entries where every call reverted keeps a zero
+    success average.
+    '''
+    merged = merge_gas_profiles(
+        {'OverlayV1OVLCollateral.build': stats(30000, failed=1)},
+        {'OverlayV1OVLCollateral.build': stats(31000, failed=1)},
+    )
+
+    assert merged['OverlayV1OVLCollateral.build']['avg_success'] == 0
+    assert merged['OverlayV1OVLCollateral.build']['count'] == 2
@@ -0,0 +1,35 @@
+from scripts.gas_stacks import fold_trace
+
+
+def step(depth, jump_depth, fn, gas, gas_cost):
+    return {'depth': depth, 'jumpDepth': jump_depth, 'fn': fn, 'gas': gas,
+            'gasCost': gas_cost}
+
+
+def test_fold_trace_charges_calls_net_of_callee():
+    '''
+    Test that an external call is charged to its caller less the gas the
+    callee spent, and the callee's steps to the caller's stack extended by
+    the callee's functions.
+    '''
+    trace = [
+        step(0, 0, 'C.build', 1000, 3),
+        step(0, 1, 'C.inner', 997, 3),
+        step(0, 1, 'C.inner', 994, 700),
+        step(1, 0, 'M.enterOI', 600, 3),
+        step(1, 1, 'M.update', 597, 5),
+        step(1, 0, 'M.enterOI', 592, 0),
+        step(0, 1, 'C.inner', 550, 3),
+        step(0, 0, 'C.build', 547, 0),
+    ]
+
+    stacks = fold_trace(trace)
+
+    # the call at 994 spends 444 of which the callee spent 8
+    assert {path: gas for path, gas in stacks.items() if gas} == {
+        'C.build': 3,
+        'C.build;C.inner': 3 + (994 - 550 - 8) + 3,
+        'C.build;C.inner;M.enterOI': 3,
+        'C.build;C.inner;M.enterOI;M.update': 5,
+    }
+    assert sum(stacks.values()) == 1000 - 547
@@ -0,0 +1,72 @@
+from scripts.suite_profile import SuiteProfile, main, read_csv
+
+
+class Provider:
+    def make_request(self, method, params):
+        return {'result': method}
+
+
+def test_wrap_attributes_requests_to_running_spans():
+    '''
+    Test that a request is counted against its method and every test and
+    fixture running, and that a provider is wrapped once.
+    '''
+    profile = SuiteProfile()
+    provider = Provider()
+
+    profile.wrap(provider)
+    profile.wrap(provider)
+
+    provider.make_request('evm_snapshot', [])
+
+    with profile.span('test', 'test_a'):
+        with profile.span('fixture', 'market'):
+            provider.make_request('eth_sendTransaction', [])
+        assert provider.make_request('eth_call', []) == {'result': 'eth_call'}
+
+    rows = {(row['kind'], row['name']): row for row in profile.table()}
+
+    assert rows[('test', 'test_a')]['rpc_calls'] == 2
+    assert rows[('test', 'test_a')]['eth_call'] == 1
+    assert rows[('fixture', 'market')]['rpc_calls'] == 1
+    assert rows[('fixture', 'market')]['eth_sendTransaction'] == 1
+    assert rows[('rpc', 'evm_snapshot')]['count'] == 1
+    assert rows[('rpc', 'eth_call')]['count'] == 1
+
+    test = rows[('test', 'test_a')]
+    assert test['wall'] >= rows[('fixture', 'market')]['wall']
+    assert test['python'] + test['rpc'] >= test['wall'] * (1 - 1e-9)
+
+
+def test_merge_and_csv(tmp_path, capsys):
+    '''
+    Test that worker profiles merge by row, and the written report reads
+    back sorted by a column.
+    '''
+    worker = SuiteProfile()
+    provider = Provider()
+    worker.wrap(provider)
+
+    for name in ['test_a', 'test_b', 'test_a']:
+        with worker.span('test', name):
+            provider.make_request('evm_revert', [])
+
+    profile = SuiteProfile()
+    profile.merge(worker.dump())
+    profile.merge(worker.dump())
+
+    rows = {row['name']: row for row in profile.table('test')}
+    assert rows['test_a']['count'] == 4
+    assert rows['test_a']['evm_revert'] == 4
+    assert rows['test_b']['count'] == 2
+
+    path = tmp_path / 'profile.csv'
+    profile.write_csv(path)
+
+    assert sorted(row['name'] for row in read_csv(path)) == \
+        ['evm_revert', 'test_a', 'test_b']
+
+    main(path, 'count', 'test')
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[1].startswith('test_a')
+    assert lines[2].startswith('test_b')
@@ -0,0 +1,69 @@
+import pytest
+from hypothesis import given, settings, strategies
+
+from scripts.fixed_point import Revert
+from scripts.tick_math import (
+    MAX_SQRT_RATIO,
+    MAX_TICK,
+    MIN_SQRT_RATIO,
+    MIN_TICK,
+    TickPrices,
+    consult_tick,
+    get_quote_at_tick,
+    get_sqrt_ratio_at_tick,
+    mean_tick,
+    quotes_at_ticks,
+    sqrt_ratios_at_ticks,
+)
+
+AMOUNT_IN = 10**18
+
+TOKEN_A = '0x' + '11' * 20
+TOKEN_B = '0x' + '22' * 20
+
+TICKS = strategies.integers(min_value=MIN_TICK, max_value=MAX_TICK)
+
+
+def test_sqrt_ratio_known_values():
+    assert get_sqrt_ratio_at_tick(0) == 2**96
+    assert get_sqrt_ratio_at_tick(MIN_TICK) == MIN_SQRT_RATIO
+    assert get_sqrt_ratio_at_tick(MAX_TICK) == MAX_SQRT_RATIO
+    assert get_sqrt_ratio_at_tick(50) == 79426470787362580746886972461
+    assert get_sqrt_ratio_at_tick(-50) == 79030349367926598376800521322
+
+    for tick in [MIN_TICK - 1, MAX_TICK + 1]:
+        with pytest.raises(Revert) as e:
+            get_sqrt_ratio_at_tick(tick)
+        assert e.value.reason == 'T'
+
+
+def test_mean_ticks_round_like_solidity():
+    assert mean_tick(-7, 2) == -3
+    assert consult_tick(-7, 2) == -4
+    assert consult_tick(-8, 2) == mean_tick(-8, 2) == -4
+    assert consult_tick(7, 2) == mean_tick(7, 2) == 3
+
+
+@settings(max_examples=50)
+@given(ticks=strategies.lists(TICKS, min_size=1, max_size=64))
+def test_arrays_match_scalars(ticks):
+    assert list(sqrt_ratios_at_ticks(ticks)) \
+        == [get_sqrt_ratio_at_tick(t) for t in ticks]
+
+    for base, quote in [(TOKEN_A, TOKEN_B), (TOKEN_B, TOKEN_A)]:
+        assert list(quotes_at_ticks(ticks, AMOUNT_IN, base, quote)) \
+            == [get_quote_at_tick(t, AMOUNT_IN, base, quote) for t in ticks]
+
+
+def test_tick_prices_cache():
+    '''
+    Test that cached prices match quotes inside and outside the range.
+    '''
+    prices = TickPrices(-200100, -199900, AMOUNT_IN, TOKEN_A, TOKEN_B)
+
+    ticks = [-200100, -200000, -199900, -199899, 0, -300000]
+    expected = [get_quote_at_tick(t, AMOUNT_IN, TOKEN_A, TOKEN_B)
+                for t in ticks]
+
+    assert [prices.price(t) for t in ticks] == expected
+    assert list(prices.prices(ticks)) == expected